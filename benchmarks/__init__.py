@@ -0,0 +1,16 @@
+"""
+可复现的性能基准
+
+    python -m benchmarks --output benchmark_results.json
+
+对 examples/AnimationClip 中的每个片段测量 load_yaml（冷 / 热）、parse_anim、各曲线类型的单帧 play_frame、
+sample_range、事件分发以及离屏 Qt 下 SignalAnimationPlayer 的 tick 耗时，结果与运行环境一起写入 JSON，
+便于在不同版本之间对比。不需要网络；没有 qtpy 时跳过 Qt 相关的测量。
+"""
+import os
+import sys
+
+# 未安装本包时使用仓库中的 src/
+_src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
@@ -0,0 +1,57 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Optional, Sequence
+
+from . import _src_path  # noqa: F401  保证从仓库运行时能导入 src/ 中的包
+from .cases import CASES
+from .harness import environment
+
+_default_clips = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'AnimationClip')
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark parsing, loading, sampling and scheduling.')
+    parser.add_argument('--output', '-o', default='benchmark_results.json', help='JSON file to write')
+    parser.add_argument('--clips', default=_default_clips, help='directory of .anim files')
+    parser.add_argument('--case', action='append', choices=sorted(CASES),
+                        help='run only this case (can be given several times)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed rounds per measurement')
+    args = parser.parse_args(argv)
+
+    clips = sorted(glob.glob(os.path.join(args.clips, '*.anim')))
+    if not clips:
+        print(f"[Warning]No .anim files found in {args.clips}")
+        return 1
+    cases = args.case or list(CASES)
+
+    started = time.perf_counter()
+    results = []
+    for name in cases:
+        for path in clips:
+            for record in CASES[name](path, args.repeat):
+                results.append(record)
+                params = ', '.join(f"{k}={v}" for k, v in record['params'].items())
+                print(f"{record['case']:<15} {record['clip']:<32} {record['stats']['median'] * 1e6:>12.2f} us"
+                      f"  ({record['unit']}{'; ' + params if params else ''})")
+
+    report = {
+        'schema': 1,
+        'environment': environment(),
+        'clips': [os.path.basename(path) for path in clips],
+        'cases': cases,
+        'seconds': time.perf_counter() - started,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
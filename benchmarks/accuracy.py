@@ -0,0 +1,457 @@
+"""
+优化求值路径的精度与吞吐量回归测试（无界面、无需交互）
+
+    python -m benchmarks.accuracy --output accuracy_results.json   # 与入库的 accuracy_baseline.json 比较
+    python -m benchmarks.accuracy --update-baseline                 # 有意改变精度后更新基线
+
+对 examples/AnimationClip 与合成片段（见 synthetic_clip.py）中的每个 path，在 [0, stop_time] 的稠密时间网格
+（默认 4 * config.FPS，不与帧对齐）上把每种优化路径与高精度参考求值比较，按通道报告最大 / 平均绝对误差，
+并报告每种路径的吞吐量（采样点 / 秒）。
+
+参考求值：pure-Python 后端逐点求值，其中 Hermite（有理 Bézier）段不用牛顿法，而是纯二分求解参数 u 直到
+float64 不能再细分；SLERP / 欧拉角为闭式公式，直接使用 float64 的标量内核。
+
+比较的路径（MODES）：
+    numba / numpy      精确后端逐点求值（SamplingPlan.evaluate）
+    batch              SamplingPlan.evaluate_many 批量求值（evaluate_curve_many）
+    lut / lut2         一次 / 二次查找表（config.LUT_TOLERANCE）
+    baked / baked_nearest / baked_float32
+                       config.FPS 烘焙表：相邻帧混合 / 取最近帧 / float32 混合
+    frame_memo         共享帧缓存（时间量化到 1e-4 秒）
+
+每条路径都有误差上限（MODES）：精确路径与查找表为 atol + rtol * max|参考值|；烘焙表与帧缓存的上限由参考值的
+差分估计（见 _derivative_limits），距跳变一帧（帧缓存为一个量化步长）以内的采样点不参与比较。
+默认还与 benchmarks/accuracy_baseline.json 比较：任一 (片段, path, 路径, 通道) 的最大误差比基线大
+（超过 --slack 的相对余量）也算失败，--no-baseline 跳过。吞吐量只报告，不参与判断。
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from unity_animation_player import AnimationClip, config
+from unity_animation_player.backends import exact_backend, get_backend
+from unity_animation_player.cache_yaml import load_yaml
+from unity_animation_player.kwargs import type_kwargs
+from unity_animation_player.parsers.XCurves import MixedSegment
+from unity_animation_player.sampling_plan import SamplingPlan
+
+from . import synthetic_clip
+from .harness import environment, measure, quiet
+
+OVERSAMPLE = 4  # 时间网格密度：每秒 OVERSAMPLE * config.FPS 个采样点
+MEMO_QUANTUM = 1e-4
+MIN_TIME = 0.005  # 吞吐量测量中每轮的最短时间（秒）
+
+# 路径名 -> 误差上限。(atol, rtol) 为固定上限 atol + rtol * max|参考值|；
+# 字符串为按参考值的差分估计的上限（见 _derivative_limits），跳变附近的采样点不参与比较
+MODES: Dict[str, Union[Tuple[float, float], str]] = {
+    'numba': (1e-9, 1e-9),
+    'numpy': (1e-9, 1e-9),
+    'batch': (1e-9, 1e-9),
+    'lut': (config.LUT_TOLERANCE * 1.01, 1e-7),
+    'lut2': (config.LUT_TOLERANCE * 1.01, 1e-7),
+    'baked': 'blend',
+    'baked_nearest': 'nearest',
+    'baked_float32': 'blend_float32',
+    'frame_memo': 'memo',
+}
+# 网格上的差分会低估两个采样点之间的导数峰值，估计的上限乘以该系数
+DERIVATIVE_SAFETY = 2.0
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'accuracy_baseline.json')
+
+_default_clips = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'AnimationClip')
+_VECTOR_UNITS = ('x', 'y', 'z', 'w')
+
+
+def _exact_rational_bezier(params: Sequence[float], t: float) -> float:
+    """与 rational_bezier_evaluate 相同的曲线，二分求解 u 到 float64 精度（不依赖牛顿法的收敛）"""
+    x0, x1, y0, y1, x1_ctl, y1_ctl, x2_ctl, y2_ctl, w0, w1, w2, w3 = params
+
+    def weighted_x(u: float) -> float:
+        u1 = 1.0 - u
+        return (u1 * u1 * u1 * w0 * (x0 - t) + 3.0 * u * u1 * u1 * w1 * (x1_ctl - t)
+                + 3.0 * u * u * u1 * w2 * (x2_ctl - t) + u * u * u * w3 * (x1 - t))
+
+    lo, hi = 0.0, 1.0
+    if weighted_x(lo) >= 0.0:
+        hi = lo
+    elif weighted_x(hi) <= 0.0:
+        lo = hi
+    while True:
+        mid = 0.5 * (lo + hi)
+        if not lo < mid < hi:
+            break
+        if weighted_x(mid) < 0.0:
+            lo = mid
+        else:
+            hi = mid
+    u = lo if abs(weighted_x(lo)) <= abs(weighted_x(hi)) else hi
+
+    u1 = 1.0 - u
+    b0, b1, b2, b3 = u1 * u1 * u1 * w0, 3.0 * u * u1 * u1 * w1, 3.0 * u * u * u1 * w2, u * u * u * w3
+    denom = b0 + b1 + b2 + b3
+    if abs(denom) < 1e-15:
+        return y0
+    return (b0 * y0 + b1 * y1_ctl + b2 * y2_ctl + b3 * y1) / denom
+
+
+def _refine(value: Any) -> Any:
+    """把解析结果中的 Hermite 段替换为 _exact_rational_bezier，其余段（常量、SLERP、欧拉角）保持不变"""
+    if isinstance(value, Mapping):
+        return {k: _refine(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], (list, tuple, Mapping, MixedSegment)):
+        return type(value)(_refine(v) for v in value)
+    if isinstance(value, MixedSegment):
+        params = getattr(value._interp, 'params', None)
+        if params is not None:
+            x0, x1 = value.x_interval
+            return MixedSegment(x0, x1, lambda t, params=params: _exact_rational_bezier(params, t))
+    return value
+
+
+def _full_kwargs(kinds: Mapping[str, Any], path: str) -> Dict[str, Any]:
+    """输出 path 上全部通道的 kwargs：欧拉角 xyz、四元数 xyzw、位置 / 缩放的所有分量"""
+    kwargs: Dict[str, Any] = {'path': path, 'euler_unit': ('x', 'y', 'z'), 'rotation_unit': ('x', 'y', 'z', 'w')}
+    for kind, key in (('Position', 'position_unit'), ('Scale', 'scale_unit')):
+        if kind in kinds:
+            kwargs[key] = tuple(u for u in _VECTOR_UNITS if u in kinds[kind][0])
+    return type_kwargs(**kwargs)
+
+
+def _pointwise(evaluate: Callable[[float], Sequence[float]], ts: np.ndarray) -> Callable[[], np.ndarray]:
+    times = ts.tolist()
+    return lambda: np.array([evaluate(t) for t in times], dtype=np.float64).reshape(len(times), -1)
+
+
+def _time_grid(stop_time: float, oversample: int) -> np.ndarray:
+    n = max(int(math.ceil(stop_time * config.FPS * oversample)) + 1, 2)
+    return np.linspace(0.0, stop_time, n)
+
+
+class _ClipVariants:
+    """一个片段在各条优化路径下的版本，按需构建并记录构建耗时"""
+
+    def __init__(self, anim_json: Mapping[str, Any], source: str):
+        self.anim_json = anim_json
+        self.source = source
+        self.build_seconds: Dict[str, float] = {}
+        self._clips: Dict[str, AnimationClip] = {}
+
+    def _timed(self, mode: str, build: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = build()
+        self.build_seconds[mode] = self.build_seconds.get(mode, 0.0) + time.perf_counter() - start
+        return result
+
+    def clip(self, backend: str) -> AnimationClip:
+        clip = self._clips.get(backend)
+        if clip is None:
+            with quiet():
+                clip = self._timed(backend, lambda: AnimationClip.from_anim_dict(self.anim_json, self.source, backend))
+            self._clips[backend] = clip
+        return clip
+
+    def lut(self, mode: str, order: int) -> AnimationClip:
+        clip = self._clips.get(mode)
+        if clip is None:
+            exact = self.clip(exact_backend().name)
+            clip = self._timed(mode, lambda: exact.with_lut(config.LUT_TOLERANCE, order))
+            self._clips[mode] = clip
+        return clip
+
+
+def _samplers(variants: _ClipVariants, kwargs: Mapping[str, Any], ts: np.ndarray,
+              modes: Sequence[str]) -> Dict[str, Callable[[], np.ndarray]]:
+    """每条路径的求值函数：调用一次返回 (len(ts), width) 的数组"""
+    exact = variants.clip(exact_backend().name)
+    stop_time = float(ts[-1])
+    samplers = {}
+    for mode in modes:
+        if mode in ('numba', 'numpy'):
+            if not _backend_available(mode):
+                continue
+            samplers[mode] = _pointwise(variants.clip(mode).plan(kwargs).evaluate, ts)
+        elif mode == 'batch':
+            plan = exact.plan(kwargs)
+            samplers[mode] = lambda plan=plan: plan.evaluate_many(ts)
+        elif mode in ('lut', 'lut2'):
+            samplers[mode] = _pointwise(variants.lut(mode, 1 if mode == 'lut' else 2).plan(kwargs).evaluate, ts)
+        elif mode.startswith('baked'):
+            plan = exact.plan(kwargs)
+            dtype = np.float32 if mode == 'baked_float32' else np.float64
+            table = variants._timed(mode, lambda: exact.bake(plan, config.FPS, stop_time, dtype,
+                                                             blend=mode != 'baked_nearest'))
+            samplers[mode] = _pointwise(table.sample, ts)
+        elif mode == 'frame_memo':
+            clip = variants.clip(exact_backend().name)
+            plan = clip.plan(kwargs)
+            memo = clip.enable_frame_memo(maxsize=max(len(ts), 1), quantum=MEMO_QUANTUM)
+            samplers[mode] = _pointwise(lambda t: memo.lookup(plan, t), ts)
+    return samplers
+
+
+def _backend_available(name: str) -> bool:
+    try:
+        get_backend(name)
+    except ValueError:
+        return False
+    return True
+
+
+def _angular(delta: np.ndarray, names: Sequence[str]) -> np.ndarray:
+    """欧拉角相差 360 度是同一个朝向（如 180 与 -180），按角距离计算差值"""
+    for i, name in enumerate(names):
+        if name.startswith('euler['):
+            delta[..., i] = (delta[..., i] + 180.0) % 360.0 - 180.0
+    return delta
+
+
+def _derivative_limits(kind: str, reference: np.ndarray, ts: np.ndarray, names: Sequence[str],
+                       discontinuities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按参考值的差分估计每个通道的误差上限，返回 (上限, 参与比较的采样点掩码)
+
+    h 为 config.FPS 的帧间隔（memo 为 MEMO_QUANTUM）：
+        blend           相邻帧线性混合，h² / 8 · max|f''|
+        nearest         取最近帧，h / 2 · max|f'|
+        blend_float32   blend 加上 float32 表值与混合运算的舍入，2 · eps32 · max|f|
+        memo            时间取整到 quantum，h / 2 · max|f'|
+    距跳变（SamplingPlan.discontinuities）不超过 h 的采样点误差即为跳变本身，不参与比较；
+    跨越跳变的差分也不参与导数估计。
+    """
+    h = MEMO_QUANTUM if kind == 'memo' else 1.0 / config.FPS
+    if len(discontinuities):
+        distance = np.abs(ts[:, None] - discontinuities[None, :]).min(axis=1)
+    else:
+        distance = np.full(len(ts), np.inf)
+    include = distance > h
+    spacing = np.diff(ts)
+    slope = _angular(np.diff(reference, axis=0), names) / spacing[:, None]
+    # [t_i, t_i+1] 内没有跳变的差分才用于估计导数
+    slope_ok = (np.searchsorted(discontinuities, ts[1:], side='right')
+                == np.searchsorted(discontinuities, ts[:-1], side='left'))
+    curvature = np.diff(slope, axis=0) / (0.5 * (spacing[:-1] + spacing[1:]))[:, None]
+    curvature_ok = slope_ok[:-1] & slope_ok[1:]
+    d1 = np.abs(slope[slope_ok]).max(axis=0, initial=0.0)
+    d2 = np.abs(curvature[curvature_ok]).max(axis=0, initial=0.0)
+
+    scale = np.abs(reference).max(axis=0, initial=0.0)
+    if kind in ('nearest', 'memo'):
+        limit = h / 2.0 * d1
+    else:
+        limit = h * h / 8.0 * d2
+    limit = DERIVATIVE_SAFETY * limit + 1e-9 + 1e-9 * scale
+    if kind == 'blend_float32':
+        limit += 2.0 * float(np.finfo(np.float32).eps) * scale
+    return limit, include
+
+
+def _limits(tolerance: Union[Tuple[float, float], str], reference: np.ndarray, ts: np.ndarray,
+            names: Sequence[str], discontinuities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """MODES 中的一项对应的每通道上限与采样点掩码"""
+    if isinstance(tolerance, str):
+        return _derivative_limits(tolerance, reference, ts, names, discontinuities)
+    atol, rtol = tolerance
+    return atol + rtol * np.abs(reference).max(axis=0, initial=0.0), np.ones(len(ts), dtype=bool)
+
+
+def _channel_errors(values: np.ndarray, reference: np.ndarray, names: Sequence[str],
+                    limits: np.ndarray, include: np.ndarray) -> Tuple[Dict[str, Dict[str, float]], bool]:
+    errors = np.abs(_angular(values.astype(np.float64) - reference, names))[include]
+    channels = {}
+    ok = True
+    for i, name in enumerate(names):
+        column = errors[:, i]
+        channel = {'max': float(column.max(initial=0.0)), 'mean': float(column.mean()) if len(column) else 0.0,
+                   'tolerance': float(limits[i])}
+        channel['ok'] = bool(channel['max'] <= channel['tolerance'])  # NaN 也算失败
+        ok = ok and channel['ok']
+        channels[name] = channel
+    return channels, ok
+
+
+def check_clip(anim_path: str, modes: Sequence[str] = tuple(MODES), oversample: int = OVERSAMPLE,
+               repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    比较一个片段中每个 path 上的所有路径，返回记录列表
+
+    每条记录为 {'clip', 'path', 'mode', 'samples', 'excluded', 'channels': {通道: {'max', 'mean', 'tolerance', 'ok'}},
+    'max_error', 'mean_error', 'ok', 'samples_per_second', 'build_seconds'}；mode 为 'reference' 的记录只有吞吐量。
+    excluded 为跳变附近不参与比较的采样点数（见 _derivative_limits），误差只在其余采样点上统计。
+    build_seconds 为构建该路径数据（片段、查找表、烘焙表）的累计耗时，查找表按片段只构建一次
+    """
+    with quiet():
+        anim_json = load_yaml(anim_path)
+    variants = _ClipVariants(anim_json, anim_path)
+    reference_clip = variants.clip('python')
+    reference_anim = _refine(reference_clip.anim)
+    ts = _time_grid(reference_clip.stop_time, oversample)
+    clip_name = os.path.basename(anim_path)
+
+    records = []
+    for path in reference_clip.paths:
+        kwargs = _full_kwargs(reference_clip.anim[path], path)
+        reference_plan = SamplingPlan(reference_anim, kwargs, curve_wraps=reference_clip.curve_wraps)
+        if not reference_plan.width:
+            continue
+        names = reference_plan.channel_names
+        run_reference = _pointwise(reference_plan.evaluate, ts)
+        reference = run_reference()
+        stats = measure(run_reference, repeat=repeat, min_time=0.0)
+        records.append({'clip': clip_name, 'path': path, 'mode': 'reference', 'samples': len(ts),
+                        'samples_per_second': len(ts) / stats['median']})
+
+        discontinuities = variants.clip(exact_backend().name).plan(kwargs).discontinuities()
+        for mode, run in _samplers(variants, kwargs, ts, modes).items():
+            values = run()
+            limits, include = _limits(MODES[mode], reference, ts, names, discontinuities)
+            channels, ok = _channel_errors(values, reference, names, limits, include)
+            stats = measure(run, repeat=repeat, min_time=MIN_TIME)
+            records.append({
+                'clip': clip_name, 'path': path, 'mode': mode, 'samples': len(ts),
+                'excluded': int(len(ts) - include.sum()),
+                'channels': channels,
+                'max_error': max(channel['max'] for channel in channels.values()),
+                'mean_error': float(np.mean([channel['mean'] for channel in channels.values()])),
+                'ok': ok,
+                'samples_per_second': len(ts) / stats['median'],
+                'build_seconds': variants.build_seconds.get(mode, 0.0),
+            })
+    return records
+
+
+def compare_baseline(records: Sequence[Dict[str, Any]], baseline: Mapping[str, Any],
+                     slack: float = 0.01) -> List[Dict[str, Any]]:
+    """与基线报告比较每个通道的最大误差，返回变大的通道（基线中没有的记录不比较）"""
+    previous = {}
+    for record in baseline.get('results', ()):
+        for name, channel in record.get('channels', {}).items():
+            previous[(record['clip'], record['path'], record['mode'], name)] = channel['max']
+    regressions = []
+    for record in records:
+        for name, channel in record.get('channels', {}).items():
+            old = previous.get((record['clip'], record['path'], record['mode'], name))
+            if old is not None and not channel['max'] <= old * (1 + slack) + 1e-12:
+                regressions.append({'clip': record['clip'], 'path': record['path'], 'mode': record['mode'],
+                                    'channel': name, 'max': channel['max'], 'baseline': old})
+    return regressions
+
+
+def write_baseline(file_path: str, records: Sequence[Dict[str, Any]], settings: Mapping[str, Any]) -> None:
+    """只保存每个 (片段, path, 路径, 通道) 的最大误差，供 compare_baseline 使用（吞吐量与环境不入库）"""
+    results = [{'clip': record['clip'], 'path': record['path'], 'mode': record['mode'],
+                'channels': {name: {'max': channel['max']} for name, channel in record['channels'].items()}}
+               for record in records if 'channels' in record]
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump({'schema': 1, **settings, 'results': results}, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def _synthetic_clips(directory: str, keys: int) -> List[str]:
+    """写入两个合成片段：所有曲线类型与切线类型的混合，以及带 m_LoopTime 的短片段"""
+    return [synthetic_clip.write(os.path.join(directory, 'synthetic_mixed.anim'), keys=keys, paths=2, seed=0)[0],
+            synthetic_clip.write(os.path.join(directory, 'synthetic_loop.anim'), keys=max(keys // 4, 2),
+                                 seed=1, loop=True)[0]]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.accuracy',
+                                     description='Compare optimised sampling paths with a high-precision reference.')
+    parser.add_argument('--output', '-o', default='accuracy_results.json', help='JSON file to write')
+    parser.add_argument('--clips', action='append', help='directory of .anim files (default: examples/AnimationClip)')
+    parser.add_argument('--synthetic-keys', type=int, default=60,
+                        help='keys per curve of the generated synthetic clips (0 to skip them)')
+    parser.add_argument('--mode', action='append', choices=sorted(MODES),
+                        help='check only this path (can be given several times)')
+    parser.add_argument('--oversample', type=int, default=OVERSAMPLE, help='samples per frame at config.FPS')
+    parser.add_argument('--repeat', type=int, default=3, help='timed rounds per throughput measurement')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help='earlier report; fail when a channel error grows beyond it '
+                             '(default: the committed benchmarks/accuracy_baseline.json)')
+    parser.add_argument('--no-baseline', action='store_true', help='skip the baseline comparison')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write the per-channel maxima of this run to --baseline instead of comparing')
+    parser.add_argument('--slack', type=float, default=0.01, help='relative slack for --baseline')
+    args = parser.parse_args(argv)
+
+    clips = []
+    for directory in args.clips or [_default_clips]:
+        clips += sorted(glob.glob(os.path.join(directory, '*.anim')))
+    modes = args.mode or list(MODES)
+
+    started = time.perf_counter()
+    records = []
+    with tempfile.TemporaryDirectory(prefix='accuracy_') as directory:
+        if args.synthetic_keys > 0:
+            clips += _synthetic_clips(directory, args.synthetic_keys)
+        if not clips:
+            print(f"[Warning]No .anim files found in {args.clips}")
+            return 1
+        for anim_path in clips:
+            for record in check_clip(anim_path, modes, args.oversample, args.repeat):
+                records.append(record)
+                if record['mode'] == 'reference':
+                    continue
+                worst = max(record['channels'], key=lambda name: record['channels'][name]['max'])
+                print(f"{'ok' if record['ok'] else 'FAIL':<5}{record['clip']:<32} {record['path'][:24]:<25}"
+                      f"{record['mode']:<14} max {record['max_error']:9.2e} ({worst:<12}) "
+                      f"mean {record['mean_error']:9.2e}  {record['samples_per_second']:>12,.0f} samples/s")
+
+    failures = [record for record in records if record['mode'] != 'reference' and not record['ok']]
+    regressions = []
+    settings = {'fps': config.FPS, 'oversample': args.oversample, 'lut_tolerance': config.LUT_TOLERANCE}
+    if args.update_baseline:
+        write_baseline(args.baseline, records, settings)
+        print(f"Wrote baseline {args.baseline}")
+    elif args.baseline and not args.no_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        changed = {key: value for key, value in settings.items() if baseline.get(key, value) != value}
+        if changed:
+            print(f"[Warning]Baseline {args.baseline} was recorded with other settings, skipped: {changed}")
+        else:
+            regressions = compare_baseline(records, baseline, args.slack)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+    summary = {}
+    for record in records:
+        entry = summary.setdefault(record['mode'], {'max_error': 0.0, 'samples_per_second': []})
+        if 'max_error' in record:
+            entry['max_error'] = max(entry['max_error'], record['max_error'])
+        entry['samples_per_second'].append(record['samples_per_second'])
+    for mode, entry in summary.items():
+        entry['samples_per_second'] = float(np.median(entry['samples_per_second']))
+        print(f"{mode:<14} max error {entry['max_error']:9.2e}  median {entry['samples_per_second']:>12,.0f} samples/s")
+
+    report = {
+        'schema': 1,
+        'environment': environment(),
+        'clips': [os.path.basename(path) for path in clips],
+        'modes': modes,
+        'tolerances': {mode: MODES[mode] for mode in modes},
+        'lut_tolerance': config.LUT_TOLERANCE,
+        'fps': config.FPS,
+        'oversample': args.oversample,
+        'seconds': time.perf_counter() - started,
+        'summary': summary,
+        'failures': len(failures),
+        'regressions': regressions,
+        'results': records,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(records)} results to {args.output}: {len(failures)} failed, {len(regressions)} regressed")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
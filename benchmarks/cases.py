@@ -0,0 +1,249 @@
+"""
+基准测量项
+
+每个测量项接受 (片段路径, repeat)，返回若干条记录 {'case', 'clip', 'params', 'unit', 'stats'}；
+片段不包含该测量项需要的数据（如没有事件）时返回空列表。
+"""
+import copy
+import os
+import time
+from typing import Any, Callable, Dict, List, Mapping
+
+import numpy as np
+
+from unity_animation_player import AnimationClip, AnimationPlayer, config
+from unity_animation_player.cache_yaml import cache_file_path, load_yaml
+from unity_animation_player.parse_yaml import parse_anim
+from unity_animation_player.parsers.XCurves import M_XCURVESES
+from unity_animation_player.sampling_plan import evaluate_curve, evaluate_curve_many
+
+from .harness import measure, quiet
+
+FRAME_TIMES = 64  # play_frame 每次扫过的采样点数
+
+Record = Dict[str, Any]
+
+
+def _record(case: str, clip_path: str, stats: Dict[str, Any], unit: str = 'seconds per call', **params) -> Record:
+    return {'case': case, 'clip': os.path.basename(clip_path), 'params': params, 'unit': unit, 'stats': stats}
+
+
+def _frame_times(stop_time: float, count: int = FRAME_TIMES) -> List[float]:
+    return np.linspace(0.0, stop_time, count).tolist()
+
+
+def load_yaml_cold(path: str, repeat: int) -> List[Record]:
+    """没有 JSON 缓存时的 load_yaml：解析 YAML 并写入缓存"""
+    json_path = cache_file_path(path, '.json')
+
+    def drop_cache():
+        for file in (json_path, json_path + '.metadata'):
+            if os.path.exists(file):
+                os.remove(file)
+
+    with quiet():
+        stats = measure(lambda: load_yaml(path), setup=drop_cache, repeat=repeat)
+    return [_record('load_yaml_cold', path, stats)]
+
+
+def load_yaml_warm(path: str, repeat: int) -> List[Record]:
+    """JSON 缓存有效时的 load_yaml（包括计算源文件 SHA256）"""
+    with quiet():
+        load_yaml(path)
+        stats = measure(lambda: load_yaml(path), repeat=repeat)
+    return [_record('load_yaml_warm', path, stats)]
+
+
+def parse_anim_case(path: str, repeat: int) -> List[Record]:
+    """parse_anim：从 load_yaml 的字典构建所有插值器"""
+    with quiet():
+        anim_json = load_yaml(path)
+    stats = measure(lambda: parse_anim(anim_json), repeat=repeat)
+    return [_record('parse_anim', path, stats)]
+
+
+def _single_kind_clip(anim_json: Dict[str, Any], m_XCurves: str, path: str) -> AnimationClip:
+    """只保留一种曲线类型的片段，用于分别测量每种曲线的求值耗时"""
+    data = copy.deepcopy(anim_json)
+    clip = data['AnimationClip']
+    for name in M_XCURVESES:
+        if name != m_XCurves and name in clip:
+            clip[name] = []
+    return AnimationClip.from_anim_dict(data, source=path)
+
+
+def play_frame_per_channel(path: str, repeat: int) -> List[Record]:
+    """单帧 play_frame，按曲线类型（Rotation / Euler / Position / Scale / Float ...）分别测量"""
+    with quiet():
+        anim_json = load_yaml(path)
+    records = []
+    for m_XCurves in M_XCURVESES:
+        if not anim_json['AnimationClip'].get(m_XCurves):
+            continue
+        clip = _single_kind_clip(anim_json, m_XCurves, path)
+        player = AnimationPlayer(clip, wrap_mode='clamp')
+        curve_path = clip.paths[0]
+        times = _frame_times(player.stop_time)
+        play_frame = player.play_frame
+
+        def sweep():
+            for t in times:
+                play_frame(t, path=curve_path)
+
+        stats = measure(sweep, repeat=repeat, per_call=len(times))
+        records.append(_record('play_frame', path, stats, 'seconds per frame',
+                               channel=m_XCurves[2:-6], path=curve_path))
+    return records
+
+
+def sample_range_case(path: str, repeat: int) -> List[Record]:
+    """sample_range：以 1 / config.FPS 为间隔采样整段动画的第一个 path"""
+    with quiet():
+        player = AnimationPlayer(path)
+    curve_path = player.clip.paths[0] if player.clip.paths else 'general'
+    sample_rate = 1 / config.FPS
+    stats = measure(lambda: player.sample_range(sample_rate, path=curve_path), repeat=repeat)
+    return [_record('sample_range', path, stats, sample_rate=sample_rate, path=curve_path,
+                    samples=len(np.arange(0.0, player.stop_time, sample_rate)))]
+
+
+def event_dispatch(path: str, repeat: int) -> List[Record]:
+    """按 config.FPS 逐帧查询并同步调用已注册的事件回调（每个事件注册一个空回调）"""
+    with quiet():
+        player = AnimationPlayer(path)
+    events = player.events
+    if not len(events.timeline):
+        return []
+    for function_name in {payload['functionName'] for payload in player.clip.raw_events}:
+        player.register_event(function_name, lambda *args: None, ('data', 'floatParameter', 'intParameter'))
+    times = np.arange(0.0, player.stop_time + 1 / config.FPS, 1 / config.FPS).tolist()
+    spans = list(zip([-np.inf] + times[:-1], times))
+    dispatch = events.dispatch_between
+
+    def sweep():
+        fired = 0
+        for t_from, t_to in spans:
+            fired += len(dispatch(t_from, t_to, t_from == -np.inf))
+        return fired
+
+    fired = sweep()
+    stats = measure(sweep, repeat=repeat, per_call=len(spans))
+    return [_record('event_dispatch', path, stats, 'seconds per frame', frames=len(spans), events=fired)]
+
+
+def _clip_curves(clip: AnimationClip) -> List[Any]:
+    """片段中所有 (segments, time_nodes) 曲线，位置 / 缩放按分量展开"""
+    curves = []
+    for kinds in clip.anim.values():
+        for segments, time_nodes in kinds.values():
+            if isinstance(segments, Mapping):
+                curves += [(component, time_nodes) for component in segments.values()]
+            else:
+                curves.append((segments, time_nodes))
+    return curves
+
+
+def lut_vs_exact(path: str, repeat: int) -> List[Record]:
+    """
+    查找表与精确求值对比：片段中所有曲线逐帧求值（frame）与按 config.FPS 一次求出整段（batch）
+
+    查找表以 config.LUT_TOLERANCE / config.LUT_ORDER 构建，构建时间不计入
+    """
+    with quiet():
+        exact = AnimationClip.from_anim_dict(load_yaml(path), source=path)
+        lut = exact.with_lut(config.LUT_TOLERANCE, config.LUT_ORDER)
+    times = _frame_times(exact.stop_time)
+    batch_times = np.arange(0.0, exact.stop_time + 1 / config.FPS, 1 / config.FPS)
+    records = []
+    for backend, clip in (('exact', exact), ('lut', lut)):
+        curves = _clip_curves(clip)
+
+        def sweep():
+            for curve in curves:
+                for t in times:
+                    evaluate_curve(curve, t)
+
+        def batch():
+            for curve in curves:
+                evaluate_curve_many(curve, batch_times)
+
+        stats = measure(sweep, repeat=repeat, per_call=len(times) * len(curves))
+        records.append(_record('lut_vs_exact', path, stats, 'seconds per curve sample', backend=backend,
+                               mode='frame', curves=len(curves)))
+        stats = measure(batch, repeat=repeat, per_call=len(curves))
+        records.append(_record('lut_vs_exact', path, stats, 'seconds per curve', backend=backend,
+                               mode='batch', curves=len(curves), samples=len(batch_times)))
+    return records
+
+
+_qt_app = None
+
+
+def _qt_application():
+    """离屏平台上的 QApplication（进程内只创建一次）；没有 qtpy 时返回 None"""
+    global _qt_app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from qtpy.QtWidgets import QApplication
+    except ImportError:
+        return None
+    if _qt_app is None:
+        _qt_app = QApplication.instance() or QApplication([])
+    return _qt_app
+
+
+def signal_ticks(path: str, repeat: int) -> List[Record]:
+    """
+    SignalAnimationPlayer 的单个 tick（求值 + 发出信号），以合成的单调时间驱动，不依赖事件循环的调度抖动
+
+    每个 payload 格式（dict / tuple）分别测量
+    """
+    if _qt_application() is None:
+        return []
+    from qtpy.QtCore import QObject, Signal
+    from unity_animation_player import SignalAnimationPlayer
+
+    class Receiver(QObject):
+        frame = Signal(object)
+
+    receiver = Receiver()
+    received = []
+    receiver.frame.connect(received.append)
+    records = []
+    for payload in ('dict', 'tuple'):
+        with quiet():
+            player = SignalAnimationPlayer(receiver.frame, path, payload=payload, wrap_mode='loop')
+        player.parameters['path'] = player.clip.paths[0] if player.clip.paths else 'general'
+        interval_ns = round(1e9 / config.FPS)
+        ticks = max(1, round(player.stop_time * config.FPS))
+        player.play()
+        clock = [time.perf_counter_ns()]
+
+        def run():
+            tick = player._pyside_play_frame
+            now = clock[0]
+            for _ in range(ticks):
+                now += interval_ns
+                tick(now)
+            clock[0] = now
+            received.clear()
+
+        try:
+            stats = measure(run, repeat=repeat, per_call=ticks)
+        finally:
+            player.stop()
+        records.append(_record('signal_tick', path, stats, 'seconds per tick', payload=payload, ticks=ticks,
+                               fps=config.FPS))
+    return records
+
+
+CASES: Dict[str, Callable[[str, int], List[Record]]] = {
+    'load_yaml_cold': load_yaml_cold,
+    'load_yaml_warm': load_yaml_warm,
+    'parse_anim': parse_anim_case,
+    'play_frame': play_frame_per_channel,
+    'sample_range': sample_range_case,
+    'event_dispatch': event_dispatch,
+    'lut_vs_exact': lut_vs_exact,
+    'signal_tick': signal_ticks,
+}
@@ -0,0 +1,95 @@
+import contextlib
+import io
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+def measure(func: Callable[[], Any], setup: Optional[Callable[[], Any]] = None, repeat: int = 5,
+            min_time: float = 0.02, per_call: int = 1) -> Dict[str, Any]:
+    """
+    测量 func 的耗时，返回每次调用的秒数统计
+
+    func 先调用一次预热；之后每轮重复调用 number 次，number 自动增加到一轮至少 min_time 秒，共 repeat 轮。
+    给出 setup 时每次调用前都执行 setup（不计入耗时），number 固定为 1，用于冷启动等不能连续重复的测量。
+    per_call: func 一次调用内部完成的操作数（如一次扫过的帧数），结果按单个操作折算
+    """
+    def timed(number: int) -> float:
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        return (time.perf_counter_ns() - start) / 1e9
+
+    if setup is None:
+        func()
+        number = 1
+        while True:
+            elapsed = timed(number)
+            if elapsed >= min_time or number >= 1 << 20:
+                break
+            number *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+    else:
+        number = 1
+    samples = [timed(number) / number / per_call for _ in range(repeat)]
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat,
+        'per_call': per_call,
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """屏蔽包内的 [DEBUG] / [WARNING] 输出，避免终端写入混入测量"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=10,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _version(module: str) -> Optional[str]:
+    try:
+        return getattr(__import__(module), '__version__', None)
+    except ImportError:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """运行环境：解释器、平台、依赖版本、插值后端与 JIT 状态"""
+    import unity_animation_player as uap
+    with quiet():
+        jit = uap.wait_ready() and uap.jit_status()
+    return {
+        'package_version': uap.__version__,
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': _version('numpy'),
+        'numba': _version('numba'),
+        'yaml': _version('yaml'),
+        'qtpy': _version('qtpy'),
+        'backend': uap.describe_backend()['active'],
+        'jit_state': jit['state'],
+        'jit_warmup_seconds': jit['seconds'],
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
@@ -0,0 +1,384 @@
+"""
+合成大型 .anim 片段，用于测量解析器与求值器的扩展性
+
+    python -m benchmarks.synthetic_clip out/mocap.anim --keys 10000 --paths 1 --kinds Position,Rotation
+    python -m benchmarks.synthetic_clip out/rig.anim --keys 200 --paths 500 --events 2000 --check
+
+生成合法的 Unity AnimationClip YAML，每条曲线的关键帧数、路径数、切线类型的比例（linear / smooth / constant /
+weighted）、旋转（四元数）与欧拉角曲线以及事件数都可以控制；相同参数与 seed 总是生成相同的文件。
+
+每个 .anim 旁边写入 <name>.reference.json，其中的期望值不依赖本包的求值器，而是由生成参数直接得到：
+关键帧时间上的值等于关键帧值；linear 段中点为两端平均值；constant 段内为起点值；
+四元数段中点为两端之和的归一化；欧拉角曲线只绕 z 轴旋转，中点为两端角度的平均值。
+check() 用本包加载片段并与这些期望值比较。
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+TANGENTS = ('linear', 'smooth', 'constant', 'weighted')
+KINDS = ('Rotation', 'Euler', 'Position', 'Scale', 'Float')
+_M_XCURVES = {'Rotation': 'm_RotationCurves', 'Euler': 'm_EulerCurves', 'Position': 'm_PositionCurves',
+              'Scale': 'm_ScaleCurves', 'Float': 'm_FloatCurves'}
+_COMPONENTS = {'Rotation': 'xyzw', 'Euler': 'xyz', 'Position': 'xyz', 'Scale': 'xyz', 'Float': None}
+# 旋转曲线段返回的元组按分量名排序（见 parsers.XCurves.piecewise_slerp）
+_TUPLE_ORDER = {'Rotation': tuple(sorted('xyzw')), 'Euler': tuple('xyz')}
+_DEFAULT_WEIGHT = 0.33333334
+_EVENT_NAMES = ('OnStep', 'OnHit', 'OnSound')
+
+
+def _num(value: float) -> str:
+    """YAML 中的数值；repr 保证读回的 float 与写入的完全相同"""
+    if value == math.inf:
+        return 'Infinity'
+    if value == -math.inf:
+        return '-Infinity'
+    return repr(float(value))
+
+
+def _vector(values: Dict[str, float], components: str) -> str:
+    return '{' + ', '.join(f"{c}: {_num(values[c])}" for c in components) + '}'
+
+
+def _choose_tangents(rng: random.Random, segments: int, mix: Dict[str, float]) -> List[str]:
+    names = [name for name in TANGENTS if mix.get(name, 0) > 0]
+    if not names:
+        raise ValueError(f"tangent mix must give a positive weight to one of {TANGENTS}")
+    return rng.choices(names, weights=[mix[name] for name in names], k=segments)
+
+
+def _key_times(keys: int, fps: float) -> List[float]:
+    return [round(k / fps, 6) for k in range(keys)]
+
+
+def _hermite_keys(rng: random.Random, times: List[float], tangents: List[str], components: Optional[str],
+                  start: float, step: float) -> Tuple[List[Dict[str, Any]], Dict[Optional[str], List[List[float]]]]:
+    """
+    标量 / 向量 Hermite 曲线的关键帧与期望值
+
+    每个分量独立随机游走，切线类型按段共享：linear 的斜率为割线斜率，constant 的出斜率为 Infinity，
+    smooth 为随机斜率，weighted 为随机斜率与随机权重
+    """
+    names = tuple(components) if components else (None,)
+    n = len(times)
+    values = {c: [round(start + rng.uniform(-step, step), 4)] for c in names}
+    for c in names:
+        for _ in range(n - 1):
+            values[c].append(round(values[c][-1] + rng.uniform(-step, step), 4))
+
+    in_slope = {c: [0.0] * n for c in names}
+    out_slope = {c: [0.0] * n for c in names}
+    in_weight = {c: [_DEFAULT_WEIGHT] * n for c in names}
+    out_weight = {c: [_DEFAULT_WEIGHT] * n for c in names}
+    weighted_mode = [0] * n
+    expected: Dict[Optional[str], List[List[float]]] = {c: [] for c in names}
+
+    for k, tangent in enumerate(tangents):
+        x0, x1 = times[k], times[k + 1]
+        if tangent == 'weighted':
+            weighted_mode[k] |= 2
+            weighted_mode[k + 1] |= 1
+        for c in names:
+            y0, y1 = values[c][k], values[c][k + 1]
+            if tangent == 'linear':
+                slope = (y1 - y0) / (x1 - x0)
+                out_slope[c][k] = in_slope[c][k + 1] = slope
+                expected[c].append([(x0 + x1) / 2, (y0 + y1) / 2])
+            elif tangent == 'constant':
+                out_slope[c][k] = math.inf
+                in_slope[c][k + 1] = round(rng.uniform(-step, step) * 10, 4)
+                expected[c].append([x0 + (x1 - x0) / 4, y0])
+                expected[c].append([(x0 + x1) / 2, y0])
+            else:
+                out_slope[c][k] = round(rng.uniform(-step, step) * 10, 4)
+                in_slope[c][k + 1] = round(rng.uniform(-step, step) * 10, 4)
+                if tangent == 'weighted':
+                    out_weight[c][k] = round(rng.uniform(0.1, 0.9), 4)
+                    in_weight[c][k + 1] = round(rng.uniform(0.1, 0.9), 4)
+
+    for c in names:
+        # 关键帧时间上的值等于关键帧值；最后一段为 constant 时终点仍保持起点值，不作为期望
+        last = n if tangents[-1] != 'constant' else n - 1
+        expected[c].extend([times[k], values[c][k]] for k in range(last))
+        expected[c].sort()
+
+    keys = []
+    for k in range(n):
+        if components:
+            key = {
+                'value': _vector({c: values[c][k] for c in names}, components),
+                'inSlope': _vector({c: in_slope[c][k] for c in names}, components),
+                'outSlope': _vector({c: out_slope[c][k] for c in names}, components),
+                'inWeight': _vector({c: in_weight[c][k] for c in names}, components),
+                'outWeight': _vector({c: out_weight[c][k] for c in names}, components),
+            }
+        else:
+            key = {name: _num(series[None][k]) for name, series in
+                   (('value', values), ('inSlope', in_slope), ('outSlope', out_slope),
+                    ('inWeight', in_weight), ('outWeight', out_weight))}
+        key['weightedMode'] = weighted_mode[k]
+        keys.append(key)
+    return keys, expected
+
+
+def _rotation_keys(rng: random.Random, times: List[float]):
+    """四元数随机游走（相邻关键帧点积为正）；期望值为关键帧与两端之和归一化后的中点"""
+    n = len(times)
+    q = [rng.gauss(0, 1) for _ in range(4)]
+    quats = []
+    for _ in range(n):
+        norm = math.sqrt(sum(v * v for v in q))
+        q = [round(v / norm, 6) for v in q]
+        quats.append(q)
+        q = [v + rng.uniform(-0.05, 0.05) for v in q]
+    expected = {c: [] for c in 'xyzw'}
+    for k in range(n):
+        for i, c in enumerate('xyzw'):
+            expected[c].append([times[k], quats[k][i]])
+        if k + 1 < n:
+            mid = [a + b for a, b in zip(quats[k], quats[k + 1])]
+            norm = math.sqrt(sum(v * v for v in mid))
+            for i, c in enumerate('xyzw'):
+                expected[c].append([(times[k] + times[k + 1]) / 2, mid[i] / norm])
+    zero = _vector(dict.fromkeys('xyzw', 0.0), 'xyzw')
+    weight = _vector(dict.fromkeys('xyzw', _DEFAULT_WEIGHT), 'xyzw')
+    keys = [{'value': _vector(dict(zip('xyzw', quat)), 'xyzw'), 'inSlope': zero, 'outSlope': zero,
+             'inWeight': weight, 'outWeight': weight, 'weightedMode': 0} for quat in quats]
+    return keys, expected
+
+
+def _euler_keys(rng: random.Random, times: List[float]):
+    """
+    绕 z 轴的欧拉角随机游走，限制在 [-170, 170] 度内
+
+    本包的欧拉角与四元数互转只对单轴旋转严格可逆，因此只生成 z 轴旋转（UI 动画的常见情况）
+    """
+    n = len(times)
+    angles = [round(rng.uniform(-90, 90), 3)]
+    for _ in range(n - 1):
+        angles.append(round(min(170.0, max(-170.0, angles[-1] + rng.uniform(-30, 30))), 3))
+    expected = {'x': [], 'y': [], 'z': []}
+    for k in range(n):
+        points = [(times[k], angles[k])]
+        if k + 1 < n:
+            points.append(((times[k] + times[k + 1]) / 2, (angles[k] + angles[k + 1]) / 2))
+        for t, angle in points:
+            expected['x'].append([t, 0.0])
+            expected['y'].append([t, 0.0])
+            expected['z'].append([t, angle])
+    zero = _vector(dict.fromkeys('xyz', 0.0), 'xyz')
+    weight = _vector(dict.fromkeys('xyz', _DEFAULT_WEIGHT), 'xyz')
+    keys = [{'value': _vector({'x': 0.0, 'y': 0.0, 'z': angle}, 'xyz'), 'inSlope': zero, 'outSlope': zero,
+             'inWeight': weight, 'outWeight': weight, 'weightedMode': 0} for angle in angles]
+    return keys, expected
+
+
+def _write_curve(out: List[str], kind: str, path: str, times: List[float], keys: List[Dict[str, Any]]) -> None:
+    float_curve = kind == 'Float'
+    out.append('  - serializedVersion: 2\n    curve:\n' if float_curve else '  - curve:\n')
+    out.append('      serializedVersion: 2\n      m_Curve:\n')
+    for t, key in zip(times, keys):
+        out.append(f"      - serializedVersion: 3\n        time: {_num(t)}\n        value: {key['value']}\n"
+                   f"        inSlope: {key['inSlope']}\n        outSlope: {key['outSlope']}\n"
+                   f"        tangentMode: 0\n        weightedMode: {key['weightedMode']}\n"
+                   f"        inWeight: {key['inWeight']}\n        outWeight: {key['outWeight']}\n")
+    out.append('      m_PreInfinity: 2\n      m_PostInfinity: 2\n      m_RotationOrder: 4\n')
+    if float_curve:
+        out.append(f"    attribute: m_Alpha\n    path: {path}\n    classID: 225\n    script: {{fileID: 0}}\n")
+    else:
+        out.append(f"    path: {path}\n")
+
+
+def generate(keys: int = 200, paths: int = 1, events: int = 0, kinds: Sequence[str] = KINDS,
+             mix: Optional[Dict[str, float]] = None, fps: float = 60.0, seed: int = 0, loop: bool = False,
+             name: str = 'Synthetic') -> Tuple[str, Dict[str, Any]]:
+    """
+    生成 .anim 文本与期望值
+
+    keys: 每条曲线的关键帧数（>= 2），相邻关键帧间隔 1 / fps
+    paths: 动画路径数，第一个路径为空（解析后为 'general'），其余为 'Bone0001' ...
+    events: 事件数，时间在整段动画内均匀随机
+    kinds: 每个路径包含的曲线类型（Rotation / Euler / Position / Scale / Float）
+    mix: 切线类型的权重 {'linear': 1, 'smooth': 1, 'constant': 1, 'weighted': 1}（默认各占相同比例）
+    """
+    if keys < 2:
+        raise ValueError(f"keys must be at least 2, got {keys}")
+    unknown = set(kinds) - set(KINDS)
+    if unknown:
+        raise ValueError(f"kinds must be a subset of {KINDS}, got {sorted(unknown)}")
+    mix = dict.fromkeys(TANGENTS, 1.0) if mix is None else mix
+    rng = random.Random(seed)
+    times = _key_times(keys, fps)
+    stop_time = times[-1]
+
+    curves: Dict[str, List[str]] = {kind: [] for kind in KINDS}
+    reference_curves = []
+    for p in range(paths):
+        path = '' if p == 0 else f"Bone{p:04d}"
+        parsed_path = 'general' if p == 0 else path
+        for kind in kinds:
+            if kind == 'Rotation':
+                curve_keys, expected = _rotation_keys(rng, times)
+            elif kind == 'Euler':
+                curve_keys, expected = _euler_keys(rng, times)
+            else:
+                start, step = {'Position': (0.0, 5.0), 'Scale': (1.0, 0.05), 'Float': (0.5, 0.1)}[kind]
+                tangents = _choose_tangents(rng, keys - 1, mix)
+                curve_keys, expected = _hermite_keys(rng, times, tangents, _COMPONENTS[kind], start, step)
+            _write_curve(curves[kind], kind, path, times, curve_keys)
+            order = _TUPLE_ORDER.get(kind)
+            for component, samples in expected.items():
+                reference_curves.append({
+                    'path': parsed_path,
+                    'kind': kind,
+                    'component': component,
+                    # 旋转曲线段返回元组，index 为该分量在元组中的位置
+                    'index': order.index(component) if order else None,
+                    'samples': samples,
+                })
+
+    event_list = sorted((round(rng.uniform(0, stop_time), 6), i) for i in range(events))
+    out = ["%YAML 1.1\n%TAG !u! tag:unity3d.com,2011:\n--- !u!74 &7400000\nAnimationClip:\n",
+           f"  m_ObjectHideFlags: 0\n  m_Name: {name}\n  serializedVersion: 7\n  m_Legacy: 0\n"
+           "  m_Compressed: 0\n  m_UseHighQualityCurve: 1\n"]
+    for kind in ('Rotation', None, 'Euler', 'Position', 'Scale', 'Float'):
+        m_name = 'm_CompressedRotationCurves' if kind is None else _M_XCURVES[kind]
+        body = curves.get(kind) if kind else None
+        out.append(f"  {m_name}:{'' if body else ' []'}\n")
+        out.extend(body or ())
+    out.append(f"  m_PPtrCurves: []\n  m_SampleRate: {_num(fps)}\n  m_WrapMode: 0\n"
+               "  m_AnimationClipSettings:\n    serializedVersion: 2\n    m_StartTime: 0\n"
+               f"    m_StopTime: {_num(stop_time)}\n    m_LoopTime: {int(loop)}\n"
+               "  m_EditorCurves: []\n  m_EulerEditorCurves: []\n")
+    if event_list:
+        out.append("  m_Events:\n")
+        for t, i in event_list:
+            out.append(f"  - time: {_num(t)}\n    functionName: {_EVENT_NAMES[i % len(_EVENT_NAMES)]}\n"
+                       f"    data: event_{i}\n    objectReferenceParameter: {{fileID: 0}}\n"
+                       f"    floatParameter: {_num(i / 2)}\n    intParameter: {i}\n    messageOptions: 0\n")
+    else:
+        out.append("  m_Events: []\n")
+
+    reference = {
+        'schema': 1,
+        'options': {'keys': keys, 'paths': paths, 'events': events, 'kinds': list(kinds), 'mix': mix,
+                    'fps': fps, 'seed': seed, 'loop': loop},
+        'stop_time': stop_time,
+        'loop': loop,
+        'curves': reference_curves,
+        'events': [[t, _EVENT_NAMES[i % len(_EVENT_NAMES)], i] for t, i in event_list],
+    }
+    return ''.join(out), reference
+
+
+def reference_path_for(anim_path: str) -> str:
+    return os.path.splitext(anim_path)[0] + '.reference.json'
+
+
+def write(anim_path: str, **options) -> Tuple[str, str]:
+    """生成片段并写入 anim_path 与对应的 .reference.json，返回两个路径；options 见 generate()"""
+    text, reference = generate(**options)
+    directory = os.path.dirname(os.path.abspath(anim_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(anim_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    reference_path = reference_path_for(anim_path)
+    with open(reference_path, 'w', encoding='utf-8') as f:
+        json.dump(reference, f)
+    return anim_path, reference_path
+
+
+def check(anim_path: str, reference_path: Optional[str] = None, tolerance: float = 1e-5) -> Dict[str, Any]:
+    """
+    用本包加载 anim_path，与期望值比较
+
+    返回 {'ok', 'curves', 'samples', 'max_error', 'failures'}；failures 最多列出前 20 个超出 tolerance 的采样
+    """
+    import numpy as np
+    from unity_animation_player import AnimationClip, AnimationPlayer
+    from unity_animation_player.cache_yaml import load_yaml
+    from unity_animation_player.sampling_plan import evaluate_curve_many
+
+    with open(reference_path or reference_path_for(anim_path), encoding='utf-8') as f:
+        reference = json.load(f)
+    clip = AnimationClip.from_anim_dict(load_yaml(anim_path), source=anim_path)
+
+    failures = []
+    samples = 0
+    max_error = 0.0
+    for curve in reference['curves']:
+        segments, time_nodes = clip.anim[curve['path']][curve['kind']]
+        if curve['index'] is None and curve['component'] is not None:
+            segments = segments[curve['component']]
+        expected = np.array(curve['samples'], dtype=np.float64).reshape(-1, 2)
+        values = evaluate_curve_many((segments, time_nodes), expected[:, 0])
+        if curve['index'] is not None:
+            values = values[:, curve['index']]
+        errors = np.abs(values - expected[:, 1])
+        samples += len(errors)
+        if len(errors):
+            max_error = max(max_error, float(errors.max()))
+        for i in np.flatnonzero(errors > tolerance)[:max(0, 20 - len(failures))]:
+            failures.append({'path': curve['path'], 'kind': curve['kind'], 'component': curve['component'],
+                             'time': float(expected[i, 0]), 'expected': float(expected[i, 1]),
+                             'actual': float(values[i])})
+
+    if abs(clip.stop_time - reference['stop_time']) > tolerance:
+        failures.append({'stop_time': clip.stop_time, 'expected': reference['stop_time']})
+    timeline = AnimationPlayer(clip).events.timeline
+    actual_events = [[float(t), payload['functionName'], int(payload['intParameter'])]
+                     for t, payload in zip(timeline.times, timeline.payloads)]
+    if actual_events != reference['events']:
+        failures.append({'events': len(actual_events), 'expected': len(reference['events'])})
+    return {'ok': not failures, 'curves': len(reference['curves']), 'samples': samples, 'max_error': max_error,
+            'failures': failures}
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        if name not in TANGENTS:
+            raise argparse.ArgumentTypeError(f"tangent must be one of {TANGENTS}, got {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.synthetic_clip',
+                                     description='Write a synthetic Unity .anim file and its reference values.')
+    parser.add_argument('output', help='.anim file to write (the reference goes next to it)')
+    parser.add_argument('--keys', type=int, default=200, help='keys per curve')
+    parser.add_argument('--paths', type=int, default=1, help='number of animated paths')
+    parser.add_argument('--events', type=int, default=0, help='number of animation events')
+    parser.add_argument('--kinds', default=','.join(KINDS), help=f"comma-separated subset of {','.join(KINDS)}")
+    parser.add_argument('--mix', type=_parse_mix, default=None,
+                        help='tangent weights, e.g. linear=2,smooth=1,constant=1,weighted=1')
+    parser.add_argument('--fps', type=float, default=60.0, help='key rate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--loop', action='store_true', help='set m_LoopTime')
+    parser.add_argument('--check', action='store_true', help='load the clip and compare it with the reference')
+    parser.add_argument('--tolerance', type=float, default=1e-5,
+                        help='absolute tolerance for --check (the lut backend needs about LUT_TOLERANCE)')
+    args = parser.parse_args(argv)
+
+    kinds = [kind for kind in args.kinds.split(',') if kind]
+    anim_path, reference_path = write(args.output, keys=args.keys, paths=args.paths, events=args.events,
+                                      kinds=kinds, mix=args.mix, fps=args.fps, seed=args.seed, loop=args.loop)
+    print(f"Wrote {anim_path} ({os.path.getsize(anim_path) / 1e6:.1f} MB) and {reference_path}")
+    if args.check:
+        report = check(anim_path, reference_path, args.tolerance)
+        print(f"{'OK' if report['ok'] else 'FAIL'}: {report['samples']} samples in {report['curves']} curves, "
+              f"max error {report['max_error']:.3g}")
+        for failure in report['failures']:
+            print(f"  {failure}")
+        return 0 if report['ok'] else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
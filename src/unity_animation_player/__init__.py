@@ -1,25 +1,122 @@
 __version__ = "0.1.0"
 
-from .animation_player import AnimationPlayer
-from .signal_animation_player import SignalAnimationPlayer
-from .animation_events import AnimationEvents
-from .kwargs import PlayKwargsDict, type_kwargs
-from .numba_optimized.rational_bezier_interpolator import RationalBezierInterpolation
-from .numba_optimized.spherical_linear_interpolator import SphericalLinearInterpolation, EulerSphericalLinearInterpolation
+import importlib
+from typing import TYPE_CHECKING
+
 from . import config
+from .config import set_backend
+
+# 公开名称 -> 定义它的子模块；第一次访问时才导入（numpy / numba / yaml / qtpy 等依赖随之加载），
+# 只需要 type_kwargs 或事件类的进程不会加载插值器与 Qt
+_LAZY_ATTRS = {
+    "AnimationClip": "animation_clip",
+    "load_clip": "animation_clip",
+    "PlaybackState": "playback_state",
+    "SamplingPlan": "sampling_plan",
+    "BakedTable": "baking",
+    "LookupTableSegment": "lookup_table",
+    "FrameMemo": "frame_memo",
+    "AnimationPlayer": "animation_player",
+    "SignalAnimationPlayer": "signal_animation_player",
+    "SharedTicker": "shared_ticker",
+    "WorkerTicker": "worker_ticker",
+    "AsyncAnimationScheduler": "async_scheduler",
+    "AnimationEvents": "animation_events",
+    "EventTimeline": "animation_events",
+    "InlineDispatcher": "event_dispatch",
+    "ThreadPoolDispatcher": "event_dispatch",
+    "AsyncioDispatcher": "event_dispatch",
+    "make_dispatcher": "event_dispatch",
+    "PlayKwargsDict": "kwargs",
+    "type_kwargs": "kwargs",
+    "RationalBezierInterpolation": "numba_optimized.rational_bezier_interpolator",
+    "SphericalLinearInterpolation": "numba_optimized.spherical_linear_interpolator",
+    "EulerSphericalLinearInterpolation": "numba_optimized.spherical_linear_interpolator",
+    "warm_up": "jit_warmup",
+    "wait_ready": "jit_warmup",
+    "jit_status": "jit_warmup",
+    "Backend": "backends",
+    "register_backend": "backends",
+    "describe_backend": "backends",
+    "stats": "profiling",
+    "reset_stats": "profiling",
+    "set_profiling": "profiling",
+    "start_trace": "tracing",
+    "stop_trace": "tracing",
+}
+
+if TYPE_CHECKING:
+    from .animation_clip import AnimationClip, load_clip
+    from .playback_state import PlaybackState
+    from .sampling_plan import SamplingPlan
+    from .baking import BakedTable
+    from .lookup_table import LookupTableSegment
+    from .frame_memo import FrameMemo
+    from .animation_player import AnimationPlayer
+    from .signal_animation_player import SignalAnimationPlayer
+    from .shared_ticker import SharedTicker
+    from .worker_ticker import WorkerTicker
+    from .async_scheduler import AsyncAnimationScheduler
+    from .animation_events import AnimationEvents, EventTimeline
+    from .event_dispatch import InlineDispatcher, ThreadPoolDispatcher, AsyncioDispatcher, make_dispatcher
+    from .kwargs import PlayKwargsDict, type_kwargs
+    from .numba_optimized.rational_bezier_interpolator import RationalBezierInterpolation
+    from .numba_optimized.spherical_linear_interpolator import SphericalLinearInterpolation, EulerSphericalLinearInterpolation
+    from .jit_warmup import warm_up, wait_ready, jit_status
+    from .backends import Backend, register_backend, describe_backend
+    from .profiling import stats, reset_stats, set_profiling
+    from .tracing import start_trace, stop_trace
+
+
+if config.TRACE:
+    # UNITY_ANIMATION_PLAYER_TRACE 要求从导入包时开始记录；tracing 只依赖标准库，不影响导入耗时预算
+    from . import tracing  # noqa: F401
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # 之后的访问不再经过 __getattr__
+    return value
+
 
-if config.USE_JIT:
-    # Compile in advance
-    RationalBezierInterpolation(0, 1, 0, 1, 0, 0, 1, 1, 1, 1)(0.5)
-    SphericalLinearInterpolation(0, 1, 0, 1, 0, 0, 1, 1, 0, 1)(0.5)
-    EulerSphericalLinearInterpolation(0, 1, 0, 1, 0, 0, 0, 1)(0.5)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 
 __all__ = [
     "AnimationPlayer",
     "SignalAnimationPlayer",
+    "SharedTicker",
+    "WorkerTicker",
+    "AsyncAnimationScheduler",
     "AnimationEvents",
+    "EventTimeline",
+    "InlineDispatcher",
+    "ThreadPoolDispatcher",
+    "AsyncioDispatcher",
+    "make_dispatcher",
+    "AnimationClip",
+    "PlaybackState",
+    "load_clip",
+    "SamplingPlan",
+    "BakedTable",
+    "LookupTableSegment",
+    "FrameMemo",
     "PlayKwargsDict",
     "type_kwargs",
+    "wait_ready",
+    "jit_status",
+    "Backend",
+    "register_backend",
+    "describe_backend",
+    "set_backend",
+    "stats",
+    "reset_stats",
+    "set_profiling",
+    "start_trace",
+    "stop_trace",
     "config"
-]
\ No newline at end of file
+]
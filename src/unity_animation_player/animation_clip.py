@@ -0,0 +1,302 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from . import config, profiling, tracing
+from .backends import BackendLike, exact_backend, get_backend
+from .parse_yaml import parse_anim, parse_wrap_modes
+from .cache_yaml import load_yaml, _get_file_sha256
+from .baking import BakedTable, bake_plan, baked_cache_path, load_baked_table, save_baked_table
+from .sampling_plan import SamplingPlan, active_intervals, curve_wrap, next_active_time, plan_key
+from .lookup_table import build_lookup_tables
+from .frame_memo import FrameMemo
+from .animation_events import EventTimeline
+from .wrap_modes import CLAMP, ONCE, check_wrap_mode, resolve_wrap_mode
+
+
+def _freeze(value: Any) -> Any:
+    """递归地把解析结果转换为只读结构（dict -> MappingProxyType, list -> tuple, ndarray 只读）"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+        return value
+    return value
+
+
+class AnimationClip:
+    """
+    只读的动画片段资源
+
+    保存解析后的曲线、事件与时长等不可变数据，可以在多个播放器、多个线程之间安全共享。
+    每个播放器的可变状态（当前时间、事件游标、回调）保存在 PlaybackState 中。
+
+    属性:
+        source: 来源 .anim 文件路径（可能为 None）
+        stop_time: 动画结束时间
+        anim: {path: {curve_type: (segments, time_nodes)}} 只读映射
+        raw_events: m_Events 中的原始事件（只读）
+        event_timeline: 按时间排序的只读事件表（EventTimeline），所有播放器共享
+        lut_errors: 查找表模式下每条曲线在检查点上测得的最大误差（估计值，不是严格上界）
+                    {(path, curve_type, component): error}，精确模式为 None
+        backend: 构建曲线时使用的插值后端名称（见 backends.py），查找表模式为 'lut'
+        lut_settings: 查找表模式下的 (tolerance, order)，精确模式为 None
+        wrap_mode: 片段级播放方式（once / clamp / loop / ping_pong），默认为 once
+        loop_time: .anim 中的 m_LoopTime，wrap_mode='auto' 时据此选择 loop / once
+        curve_wraps: 每条曲线在关键帧区间外的映射方式 {path: {curve_type: (pre, post)}}，
+                     来自 m_PreInfinity / m_PostInfinity
+
+    片段内部只额外保存按 kwargs 缓存的 SamplingPlan、烘焙表以及可选的帧缓存 frame_memo，
+    它们同样可以被共享（frame_memo 内部自带锁）。
+    """
+
+    __slots__ = ('source', 'stop_time', 'anim', 'raw_events', 'event_timeline', 'lut_errors', 'lut_settings',
+                 'backend', 'wrap_mode', 'loop_time', 'curve_wraps', 'frame_memo', '_plans', '_baked', '_active')
+
+    def __init__(self, stop_time: float, anim: Dict[str, Any], raw_events: List[Dict[str, Any]],
+                 source: Optional[str] = None, wrap_mode: str = ONCE,
+                 curve_wraps: Optional[Dict[str, Dict[str, Tuple[str, str]]]] = None,
+                 backend: Optional[str] = None, loop_time: bool = False):
+        _set = object.__setattr__
+        _set(self, 'source', source)
+        _set(self, 'stop_time', stop_time)
+        _set(self, 'anim', _freeze(anim))
+        _set(self, 'loop_time', bool(loop_time))
+        _set(self, 'wrap_mode', resolve_wrap_mode(wrap_mode, self.loop_time))
+        _set(self, 'curve_wraps', _freeze(curve_wraps or {}))
+        raw_events = raw_events or []
+        _set(self, 'raw_events', _freeze(raw_events))
+        # 负载使用未冻结的原始字典，保证 play_frame 返回的事件仍是普通 dict
+        _set(self, 'event_timeline', EventTimeline.from_raw_events(raw_events))
+        _set(self, 'lut_errors', None)
+        _set(self, 'lut_settings', None)
+        _set(self, 'backend', backend)
+        _set(self, 'frame_memo', FrameMemo())
+        _set(self, '_plans', {})
+        _set(self, '_baked', {})
+        _set(self, '_active', None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(source={self.source!r}, stop_time={self.stop_time!r}, paths={self.paths!r})"
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        return tuple(self.anim.keys())
+
+    def _replace(self, **changes: Any) -> 'AnimationClip':
+        """复制当前片段并替换部分字段（缓存不会被继承）"""
+        clone = object.__new__(type(self))
+        for name in self.__slots__:
+            object.__setattr__(clone, name, changes[name] if name in changes else getattr(self, name))
+        object.__setattr__(clone, 'frame_memo', FrameMemo())
+        object.__setattr__(clone, '_plans', {})
+        object.__setattr__(clone, '_baked', {})
+        object.__setattr__(clone, '_active', None)
+        return clone
+
+    def with_lut(self, tolerance: float, order: int = 1) -> 'AnimationClip':
+        """
+        返回所有曲线都替换为查找表的新片段
+
+        每个 Bézier / SLERP / 欧拉角曲线段被自适应地重采样为分段线性（order=1）或分段二次（order=2）
+        多项式，使其在检查点上与精确插值的绝对误差不超过 tolerance；误差估计见返回片段的 lut_errors。
+        """
+        with profiling.timed('lut_build', self.source):
+            anim, errors = build_lookup_tables(self.anim, tolerance, order)
+        return self._replace(anim=_freeze(anim), lut_errors=MappingProxyType(errors),
+                             lut_settings=(float(tolerance), int(order)), backend='lut')
+
+    def with_wrap_modes(self, wrap_mode: Optional[str] = None,
+                        curve_wraps: Optional[Dict[str, Dict[str, Tuple[str, str]]]] = None) -> 'AnimationClip':
+        """
+        返回替换了播放方式的新片段
+
+        wrap_mode: 片段级播放方式，超出 [0, stop_time] 时如何映射时间；'auto' 按 m_LoopTime 选择 loop / once
+        curve_wraps: {path: {curve_type: (pre, post)}}，覆盖对应曲线的 m_PreInfinity / m_PostInfinity，
+                     未列出的曲线保持原样
+        """
+        changes: Dict[str, Any] = {}
+        if wrap_mode is not None:
+            changes['wrap_mode'] = resolve_wrap_mode(wrap_mode, self.loop_time)
+        if curve_wraps is not None:
+            merged = {path: dict(kinds) for path, kinds in self.curve_wraps.items()}
+            for path, kinds in curve_wraps.items():
+                for kind, (pre, post) in kinds.items():
+                    merged.setdefault(path, {})[kind] = (check_wrap_mode(pre), check_wrap_mode(post))
+            changes['curve_wraps'] = _freeze(merged)
+        return self._replace(**changes)
+
+    def enable_frame_memo(self, maxsize: int = 256, quantum: float = 1e-4) -> FrameMemo:
+        """
+        启用共享帧缓存：使用本片段、相同 kwargs、相同量化时间的播放器只计算一次
+
+        maxsize: LRU 最多保存的帧数
+        quantum: 时间量化步长（秒），求值在量化后的时间点上进行
+        """
+        self.frame_memo.configure(True, maxsize, quantum)
+        return self.frame_memo
+
+    def disable_frame_memo(self) -> None:
+        self.frame_memo.configure(False)
+
+    def plan(self, typed_kwargs: Mapping[str, Any]) -> SamplingPlan:
+        """返回 typed_kwargs（见 type_kwargs）对应的 SamplingPlan，相同参数只解析一次"""
+        key = plan_key(typed_kwargs)
+        if key is None:
+            return SamplingPlan(self.anim, typed_kwargs, curve_wraps=self.curve_wraps, source=self.source)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans.setdefault(key, SamplingPlan(self.anim, typed_kwargs, key, self.curve_wraps,
+                                                            self.source))
+        return plan
+
+    def next_change_time(self, t: float, plan: Optional[SamplingPlan] = None) -> float:
+        """
+        片段本地时间 t 之后（含 t）下一次有值变化或事件触发的时间，之后一直保持不变时返回 inf
+
+        plan: 只考虑该 SamplingPlan 中的通道；默认考虑片段中的所有曲线
+        变化区间由关键帧时间、常量段检测与段间跳变得到，见 sampling_plan.active_intervals。
+        """
+        if plan is None:
+            if self._active is None:
+                curves = []
+                for path, kinds in self.anim.items():
+                    wraps = self.curve_wraps.get(path, {})
+                    for kind, (segments, time_nodes) in kinds.items():
+                        modes = wraps.get(kind, (CLAMP, CLAMP))
+                        parts = segments.values() if isinstance(segments, Mapping) else (segments,)
+                        for part in parts:
+                            curve = (part, time_nodes)
+                            curves.append((curve, curve_wrap(curve, modes)))
+                object.__setattr__(self, '_active', active_intervals(curves))
+            change = next_active_time(self._active, t)
+        else:
+            change = plan.next_change_time(t)
+        times = self.event_timeline.times
+        index = np.searchsorted(times, t, side='left')
+        if index < len(times):
+            change = min(change, float(times[index]))
+        return change
+
+    def bake(self, plan: SamplingPlan, fps: float, stop_time: Optional[float] = None,
+             dtype=np.float64, blend: bool = True, cache: bool = False) -> BakedTable:
+        """
+        按固定帧率把 plan 烘焙为稠密表
+
+        相同 (plan, fps, stop_time, dtype) 在进程内只烘焙一次；cache=True 时还会读写
+        与片段 .json 缓存放在一起的 .npz 文件（以源文件 SHA256 校验）。
+        同一个源文件的不同片段（后端、查找表精度、曲线 wrap mode 不同）的 plan.key 相同，
+        因此缓存键还包含 _bake_variant()，避免互相读到对方的烘焙表。
+        """
+        stop_time = self.stop_time if stop_time is None else stop_time
+        dtype = np.dtype(dtype)
+        variant = self._bake_variant()
+        key = None if plan.key is None else (variant, plan.key, float(fps), float(stop_time), dtype.str)
+        table = self._baked.get(key) if key is not None else None
+        if table is not None:
+            return table.with_blend(blend)
+
+        file_path = (baked_cache_path(self.source, plan, fps, stop_time, dtype, variant)
+                     if cache and self.source else None)
+        source_sha256 = _get_file_sha256(self.source) if file_path else None
+        if source_sha256 is not None:
+            table = load_baked_table(plan, fps, file_path, source_sha256, blend)
+        if table is None:
+            table = bake_plan(plan, fps, stop_time, dtype, blend)
+            if source_sha256 is not None:
+                save_baked_table(table, file_path, source_sha256)
+        if key is not None:
+            self._baked.setdefault(key, table)
+        return table
+
+    def _bake_variant(self) -> Tuple:
+        """
+        决定曲线取值、但不在 plan.key 中的片段设置：后端、查找表 (tolerance, order) 与曲线的 (pre, post)
+
+        片段级 wrap_mode 只在查表之前映射播放时间，不改变烘焙表的内容，因此不包含在内。
+        """
+        wraps = tuple(sorted((path, kind, tuple(modes)) for path, kinds in self.curve_wraps.items()
+                             for kind, modes in kinds.items()))
+        return self.backend, self.lut_settings, wraps
+
+    @classmethod
+    def from_anim_dict(cls, anim_json: Mapping[str, Any], source: Optional[str] = None,
+                       backend: BackendLike = None, wrap_mode: str = ONCE) -> 'AnimationClip':
+        """
+        从 load_yaml 得到的字典构建片段
+
+        wrap_mode: 片段级播放方式，默认 once（与 m_LoopTime 无关）；'auto' 时 m_LoopTime 为 1 的片段使用 loop
+        backend: 插值后端名称或 Backend（见 backends.py），None 时使用 config.BACKEND；
+                 'lut' 用精确后端解析后替换为误差不超过 config.LUT_TOLERANCE 的查找表
+        """
+        backend = get_backend(backend)
+        lut = backend.lut
+        if lut:
+            backend = exact_backend()
+        with profiling.timed('parse', source):
+            stop_time, anim, events = parse_anim(anim_json, backend)
+            loop_time, curve_wraps = parse_wrap_modes(anim_json)
+        clip = cls(stop_time, anim, events, source, wrap_mode, curve_wraps, backend.name, loop_time)
+        return clip.with_lut(config.LUT_TOLERANCE, config.LUT_ORDER) if lut else clip
+
+
+def load_clip(path: str, lut_tolerance: Optional[float] = None, lut_order: int = 1,
+              backend: BackendLike = None) -> AnimationClip:
+    """
+    加载并缓存 .anim 文件对应的只读 AnimationClip
+
+    lut_tolerance: 给定时返回查找表近似模式的片段（见 AnimationClip.with_lut）
+    backend: 插值后端名称或 Backend（见 backends.py），None 时使用 config.BACKEND；
+             不同后端的片段分别缓存，切换后端不影响已加载的片段
+    """
+    backend = get_backend(backend)
+    if backend.lut:
+        if lut_tolerance is None:
+            lut_tolerance, lut_order = config.LUT_TOLERANCE, config.LUT_ORDER
+        backend = exact_backend()
+    if tracing.ENABLED:
+        with tracing.span('load_clip', 'load', path=path, backend=backend.name, lut_tolerance=lut_tolerance):
+            return _cached_clip(path, lut_tolerance, lut_order, backend.name)
+    return _cached_clip(path, lut_tolerance, lut_order, backend.name)
+
+
+def _cached_clip(path: str, lut_tolerance: Optional[float], lut_order: int, backend: str) -> AnimationClip:
+    if profiling.ENABLED:
+        return _load_clip_counted(path, lut_tolerance, lut_order, backend)
+    if lut_tolerance is not None:
+        return _load_lut_clip(path, lut_tolerance, lut_order, backend)
+    return _load_clip(path, backend)
+
+
+def _load_clip_counted(path: str, lut_tolerance: Optional[float], lut_order: int, backend: str) -> AnimationClip:
+    """load_clip 打开计数器时的分支：按 lru_cache 的命中数记录 clip_cache_hit / clip_cache_miss"""
+    cached = _load_clip if lut_tolerance is None else _load_lut_clip
+    hits = cached.cache_info().hits
+    start = profiling.clock()
+    if lut_tolerance is None:
+        clip = _load_clip(path, backend)
+    else:
+        clip = _load_lut_clip(path, lut_tolerance, lut_order, backend)
+    hit = cached.cache_info().hits > hits
+    profiling.record('clip_cache_hit' if hit else 'clip_cache_miss', profiling.clock() - start, path)
+    return clip
+
+
+@lru_cache(maxsize=64)
+def _load_clip(path: str, backend: str) -> AnimationClip:
+    return AnimationClip.from_anim_dict(load_yaml(path), source=path, backend=backend)
+
+
+@lru_cache(maxsize=16)
+def _load_lut_clip(path: str, lut_tolerance: float, lut_order: int, backend: str) -> AnimationClip:
+    return _load_clip(path, backend).with_lut(lut_tolerance, lut_order)
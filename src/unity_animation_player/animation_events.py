@@ -1,27 +1,313 @@
-import heapq
-from typing import Callable, List
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import profiling, tracing
+
+
+def _entry(payload: Mapping[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """事件表中保存的 (functionName, {参数名: 值})，所有播放器共享"""
+    return payload.get('functionName'), {k: v for k, v in payload.items() if k != 'functionName'}
+
+
+def _event(entry: Tuple[str, Dict[str, Any]]) -> List[Any]:
+    """返回给调用方的事件：[functionName, {参数名: 值}]，每次都是新的列表与字典，修改它们不会影响事件表"""
+    return [entry[0], dict(entry[1])]
+
+
+class HandlerRegistry(dict):
+    """
+    注册的回调 {functionName: (回调, 参数名元组)}
+
+    与普通 dict 用法相同；每次修改都会增加 version，AnimationEvents 在下一次分发前据此重新编译分发表，
+    因此直接修改 player.registered_events 与调用 register_event 的效果一样。
+    """
+
+    __slots__ = ('version',)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._changed()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._changed()
+        return result
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+class EventTimeline:
+    """
+    按时间排序的只读事件表
+
+    times 为排好序的 float64 数组（同一时间的事件保持 m_Events 中的先后顺序），
+    names / payloads 为与之对齐的 functionName 与参数表，entries 为预先构建好的
+    (functionName, {参数名: 值}) 输出元组。所有查询都是 searchsorted，
+    不修改任何状态，因此同一个片段的所有播放器可以共享同一张表（entries 中的字典不要修改）。
+    """
+
+    __slots__ = ('times', 'names', 'payloads', 'entries')
+
+    def __init__(self, times: Sequence[float] = (), payloads: Sequence[Mapping[str, Any]] = ()):
+        """
+        times: 事件时间
+        payloads: 与 times 对齐的事件内容（去掉 time 后的 m_Events 字典，包含 functionName）
+        """
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        order = np.argsort(times, kind='stable')
+        self.times = np.ascontiguousarray(times[order])
+        self.times.flags.writeable = False
+        self.payloads: Tuple[Dict[str, Any], ...] = tuple(dict(payloads[i]) for i in order)
+        self.names: Tuple[str, ...] = tuple(payload.get('functionName') for payload in self.payloads)
+        self.entries = tuple(_entry(payload) for payload in self.payloads)
+
+    @classmethod
+    def from_raw_events(cls, raw_events: Sequence[Mapping[str, Any]]) -> 'EventTimeline':
+        """由 m_Events 中的原始事件构建"""
+        return cls([raw_event['time'] for raw_event in raw_events],
+                   [{k: v for k, v in raw_event.items() if k != 'time'} for raw_event in raw_events])
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def inserted(self, time: float, payload: Mapping[str, Any]) -> 'EventTimeline':
+        """返回插入一个事件后的新表（同一时间的事件排在已有事件之后）"""
+        index = int(np.searchsorted(self.times, time, side='right'))
+        timeline = object.__new__(type(self))
+        timeline.times = np.insert(self.times, index, time)
+        timeline.times.flags.writeable = False
+        timeline.payloads = self.payloads[:index] + (dict(payload),) + self.payloads[index:]
+        timeline.names = self.names[:index] + (payload.get('functionName'),) + self.names[index:]
+        timeline.entries = self.entries[:index] + (_entry(payload),) + self.entries[index:]
+        return timeline
+
+    def index_range(self, t_from: float, t_to: float, include_start: bool = False) -> range:
+        """
+        时间从 t_from 走到 t_to 时经过的事件下标，按经过的先后顺序排列
+
+        t_to >= t_from 时为 (t_from, t_to] 内的事件（升序），否则为 [t_to, t_from) 内的事件（降序）；
+        include_start 为 True 时同时包含恰好位于 t_from 的事件（用于循环周期的起点或首帧）。
+        """
+        times = self.times
+        if t_to >= t_from:
+            lo = np.searchsorted(times, t_from, side='left' if include_start else 'right')
+            hi = np.searchsorted(times, t_to, side='right')
+            return range(int(lo), int(hi))
+        lo = np.searchsorted(times, t_to, side='left')
+        hi = np.searchsorted(times, t_from, side='right' if include_start else 'left')
+        return range(int(hi) - 1, int(lo) - 1, -1)
+
+    def events_for_times(self, times: Sequence[float],
+                         t_start: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        把事件分配到一组采样时间上，一次向量化 searchsorted，不涉及任何播放状态
+
+        第 i 个采样点对应区间 (times[i-1], times[i]]，第 0 个采样点对应 [t_start, times[0]]
+        （t_start 默认为 times[0]；传入 -np.inf 时与播放器首帧的行为一致）。
+        times 必须单调不减。
+
+        返回:
+            (sample_index, event_index)，两个等长的 intp 数组，按事件时间排序；
+            event_index 为本表中的下标（见 names / payloads / entries）
+        """
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        if len(times) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty.copy()
+        if np.any(np.diff(times) < 0):
+            raise ValueError("times must be sorted in non-decreasing order")
+        t_start = times[0] if t_start is None else t_start
+        lo = np.searchsorted(self.times, t_start, side='left')
+        hi = np.searchsorted(self.times, times[-1], side='right')
+        event_index = np.arange(lo, hi, dtype=np.intp)
+        sample_index = np.searchsorted(times, self.times[lo:hi], side='left').astype(np.intp)
+        return sample_index, event_index
+
+    def bind(self, registered: Mapping[str, Tuple[Callable, Tuple[str, ...]]]) -> Tuple[Optional[Tuple[Callable, tuple]], ...]:
+        """
+        把注册的回调编译为与事件一一对应的分发表
+
+        registered: {functionName: (回调, 参数名元组)}
+        返回: 每个事件的 (回调, 已取出的参数元组)，没有注册回调的事件为 None
+        """
+        bound = []
+        for name, payload in zip(self.names, self.payloads):
+            handler = registered.get(name)
+            if handler is None:
+                bound.append(None)
+            else:
+                function, arg_names = handler
+                bound.append((function, tuple(payload[arg] for arg in arg_names)))
+        return tuple(bound)
+
 
 class AnimationEvents:
-    def __init__(self, raw_events):
-        self.events = []
-        self._event_counter = 0  # 用于生成唯一的事件ID，避免heapq比较字典
-        for raw_event in raw_events:
-            self.add_event(raw_event['time'], {k: v for k, v in raw_event.items() if k != 'time'})
-        self.events_backup = self.events.copy()
-    
+    def __init__(self, raw_events=(), timeline: Optional[EventTimeline] = None,
+                 registered: Optional[Dict[str, Tuple[Callable, Tuple[str, ...]]]] = None,
+                 source: Optional[str] = None):
+        """
+        raw_events: m_Events 中的原始事件
+        timeline: 已构建好的共享事件表（见 AnimationClip.event_timeline），传入时直接引用，不复制
+        registered: 注册的回调 {functionName: (回调, 参数名元组)}，与 PlaybackState.registered_events 为同一对象；
+                    传入普通 dict 时复制为 HandlerRegistry
+        source: 所属片段的来源路径，用于按片段统计耗时（见 profiling.py）
+        """
+        self.source = source
+        self.timeline = timeline if timeline is not None else EventTimeline.from_raw_events(raw_events)
+        self.registered = registered if isinstance(registered, HandlerRegistry) else HandlerRegistry(registered or {})
+        self._bind()
+        # 回调的分发器（见 event_dispatch.py），None 表示在 play_frame 中同步调用
+        self.dispatcher = None
+        # get_events 的双向游标：[_lo, _hi) 之外的事件已经触发过
+        self._lo = 0
+        self._hi = len(self.timeline)
+
+    def _bind(self) -> None:
+        """按当前事件表与注册的回调重新编译分发表"""
+        self.bound = self.timeline.bind(self.registered)
+        self._bound_version = self.registered.version
+
+    def _current_bound(self) -> Tuple[Optional[Tuple[Callable, tuple]], ...]:
+        """分发表；registered 在上次编译之后被修改过时先重新编译"""
+        if self._bound_version != self.registered.version:
+            self._bind()
+        return self.bound
+
+    def register(self, function_name: str, function: Callable, args: Tuple[str, ...] = ()) -> None:
+        """注册回调并重新编译分发表，播放时只需按下标取出回调与参数"""
+        self.registered[function_name] = (function, tuple(args))
+        self._bind()
+
     def add_event(self, delay, *kwargs) -> None:
-        self._event_counter += 1
-        heapq.heappush(self.events, (delay, self._event_counter, kwargs))
-
-    def get_events(self, t: float, time_reverse=False) -> List[list]:
-        triggered_events = []
-        # 根据时间方向决定触发条件
-        condition = lambda event_time: event_time >= t if time_reverse else event_time <= t
-        
-        while self.events and condition(self.events[0][0]):
-            event = heapq.heappop(self.events)[2][0]  # 索引从1改为2，因为现在元组有3个元素
-            triggered_events.append([event['functionName'], {k: v for k, v in event.items() if k != 'functionName'}])
-        return triggered_events
-    
+        """动态添加事件；共享的事件表不会被修改，而是为当前播放器生成一张新表"""
+        index = int(np.searchsorted(self.timeline.times, delay, side='right'))
+        self.timeline = self.timeline.inserted(delay, kwargs[0])
+        self._bind()
+        # 插入位置之后的游标整体后移一位；落在两个游标之间的新事件视为尚未触发
+        if index < self._lo:
+            self._lo += 1
+        if index <= self._hi:
+            self._hi += 1
+
+    def events_between(self, t_prev: float, t_now: float, include_start: bool = False) -> List[List[Any]]:
+        """
+        返回时间从 t_prev 走到 t_now 时经过的事件，不修改任何状态
+
+        支持正向、反向播放与任意跳转；循环播放时按周期切分后逐段查询即可。
+        """
+        entries = self.timeline.entries
+        return [_event(entries[i]) for i in self.timeline.index_range(t_prev, t_now, include_start)]
+
+    def dispatch_between(self, t_prev: float, t_now: float, include_start: bool = False,
+                         out: Optional[list] = None) -> List[List[Any]]:
+        """
+        与 events_between 相同，同时按分发表调用已注册的回调；结果追加到 out（如给出）
+
+        设置了 dispatcher 时回调交给它执行（以本对象为 key，保证同一播放器的事件有序）
+        """
+        if profiling.ENABLED or tracing.ENABLED:
+            return self._dispatch_between_instrumented(t_prev, t_now, include_start, out)
+        out = [] if out is None else out
+        append = out.append
+        entries = self.timeline.entries
+        bound = self._current_bound()
+        dispatcher = self.dispatcher
+        for i in self.timeline.index_range(t_prev, t_now, include_start):
+            append(_event(entries[i]))
+            handler = bound[i]
+            if handler is not None:
+                if dispatcher is None:
+                    handler[0](*handler[1])
+                else:
+                    dispatcher.submit(self, handler[0], handler[1])
+        return out
+
+    def _dispatch_between_instrumented(self, t_prev: float, t_now: float, include_start: bool,
+                                       out: Optional[list]) -> List[List[Any]]:
+        """
+        与 dispatch_between 相同，打开计数器时分别记录事件查询（event_poll）与回调分发（event_dispatch）的耗时，
+        记录时间线时为每次同步调用的回调写入一个区间
+        """
+        out = [] if out is None else out
+        clock = profiling.clock
+        start = clock()
+        indices = self.timeline.index_range(t_prev, t_now, include_start)
+        polled = clock()
+        entries = self.timeline.entries
+        times = self.timeline.times
+        bound = self._current_bound()
+        dispatcher = self.dispatcher
+        trace = tracing.ENABLED
+        for i in indices:
+            out.append(_event(entries[i]))
+            handler = bound[i]
+            if handler is not None:
+                if dispatcher is not None:
+                    dispatcher.submit(self, handler[0], handler[1])
+                elif trace:
+                    called = clock()
+                    handler[0](*handler[1])
+                    tracing.complete(entries[i][0] or 'handler', 'event', called, clock(),
+                                     {'time': float(times[i]), 'source': self.source})
+                else:
+                    handler[0](*handler[1])
+        if profiling.ENABLED:
+            profiling.record('event_poll', polled - start, self.source)
+            if len(indices):
+                profiling.record('event_dispatch', clock() - polled, self.source, len(indices))
+        return out
+
+    def get_events(self, t: float, time_reverse=False) -> List[List[Any]]:
+        """
+        游标式查询：正向时返回尚未触发且时间 <= t 的事件，反向时返回尚未触发且时间 >= t 的事件
+
+        每个事件在 reset_events 之前只触发一次；正向从前端、反向从后端消耗，两个方向可以交替使用。
+        """
+        timeline = self.timeline
+        if time_reverse:
+            new_hi = max(int(np.searchsorted(timeline.times, t, side='left')), self._lo)
+            indices = range(self._hi - 1, new_hi - 1, -1)
+            self._hi = min(self._hi, new_hi)
+        else:
+            new_lo = min(int(np.searchsorted(timeline.times, t, side='right')), self._hi)
+            indices = range(self._lo, new_lo)
+            self._lo = max(self._lo, new_lo)
+        return [_event(timeline.entries[i]) for i in indices]
+
     def reset_events(self) -> None:
-        self.events = self.events_backup.copy()
\ No newline at end of file
+        """重置游标，O(1)"""
+        self._lo = 0
+        self._hi = len(self.timeline)
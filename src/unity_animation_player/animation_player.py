@@ -1,145 +1,231 @@
-from functools import lru_cache
 from typing import Callable, Dict, Any, Literal, Tuple, Union, Optional
 from dataclasses import asdict
 
 import numpy as np
 
-from .parse_yaml import parse_anim
-from .cache_yaml import load_yaml
-
+from . import config, tracing
 from .kwargs import type_kwargs
+from .animation_clip import AnimationClip, load_clip
 from .animation_events import AnimationEvents
+from .event_dispatch import InlineDispatcher
+from .playback_state import PlaybackState
+from .sampling_plan import SamplingPlan
+from .baking import BakedTable, bake_plan
+from .wrap_modes import CLAMP, ONCE, PING_PONG, WrapMode, clip_cycle, cycle_spans, resolve_wrap_mode
 from .numba_optimized.binary_search import binary_search_segment_index
-@lru_cache(maxsize=64)
-def load_anim(path: str) -> Tuple[Dict[str, Any], float]:
-    anim_json = load_yaml(path)
-    stop_time, anim, events = parse_anim(anim_json)
-    return stop_time, anim, events
-
-
-class AnimationPlayer:
-    def __init__(self, path: str, stop_time: Optional[float] = None):
-        self.stop_time, self.anim, raw_events = load_anim(path)
 
-        self.events = AnimationEvents(raw_events)
+def load_anim(path: str) -> Tuple[float, Dict[str, Any], Tuple[Dict[str, Any], ...]]:
+    clip = load_clip(path)
+    return clip.stop_time, clip.anim, clip.raw_events
 
-        self.registered_events = {}
 
-        if stop_time is not None:
-            self.stop_time = stop_time
+class AnimationPlayer:
+    def __init__(self, path: Union[str, AnimationClip], stop_time: Optional[float] = None,
+                 wrap_mode: Optional[WrapMode] = None):
+        """
+        path: .anim 文件路径，或已加载的 AnimationClip（多个播放器共享同一个片段时无需重复构建）
+        stop_time: 可选，覆盖动画结束时间
+        wrap_mode: 可选，超出 [0, stop_time] 时的播放方式（once / clamp / loop / ping_pong），
+                   默认使用片段的 wrap_mode（默认为 once）；'auto' 时 m_LoopTime 为 1 的片段使用 loop
+        """
+        self.clip = path if isinstance(path, AnimationClip) else load_clip(path)
+        self.state = PlaybackState(self.clip, stop_time, wrap_mode)
+
+    @property
+    def anim(self) -> Dict[str, Any]:
+        return self.clip.anim
+
+    @property
+    def stop_time(self) -> float:
+        return self.state.stop_time
+
+    @stop_time.setter
+    def stop_time(self, value: float) -> None:
+        self.state.stop_time = value
+
+    @property
+    def wrap_mode(self) -> str:
+        return self.state.wrap_mode
+
+    @wrap_mode.setter
+    def wrap_mode(self, value: WrapMode) -> None:
+        self.state.wrap_mode = resolve_wrap_mode(value, self.clip.loop_time)
+        self.state.time = None
+
+    @property
+    def events(self) -> AnimationEvents:
+        return self.state.events
+
+    @property
+    def dispatcher(self):
+        """事件回调的分发器，None 表示在 play_frame 中同步调用（见 event_dispatch.py）"""
+        return self.events.dispatcher
+
+    @dispatcher.setter
+    def dispatcher(self, value) -> None:
+        self.events.dispatcher = None if value is None or isinstance(value, InlineDispatcher) else value
+
+    @property
+    def registered_events(self) -> Dict[str, Tuple[Callable, Tuple[str, ...]]]:
+        """注册的回调 {functionName: (回调, 参数名元组)}；可以直接修改，下一次分发事件时生效"""
+        return self.state.registered_events
 
     def play_frame(self,
                    nowtime: float,
                    **kwargs: Union[str, bool, Tuple, float]) -> Tuple[Dict[str, Any], bool]:
         
+        start = tracing.clock() if tracing.ENABLED else 0
         typed_kwargs = type_kwargs(**kwargs)
+        plan, values, events = self._play(nowtime, typed_kwargs)
+        if plan is None:
+            dic, playable = {}, False
+        else:
+            dic, playable = plan.assemble(values), True
+            dic['events'] = events
+        if start:
+            tracing.complete('play_frame', 'frame', start, tracing.clock(),
+                             {'t': nowtime, 'source': self.clip.source, 'playable': playable})
+        return dic, playable
+
+    def _play(self, nowtime: float, typed_kwargs: Dict[str, Any]) -> Tuple[Optional[SamplingPlan], Optional[Tuple[float, ...]], Optional[list]]:
+        """
+        播放一帧并触发事件，返回 (plan, 展平的通道值, 事件列表)；不可播放时返回 (None, None, None)
+
+        play_frame 再用 plan.assemble 把通道值还原为字典，需要紧凑输出的调用方可以直接使用通道值。
+        """
+        if self.state.wrap_mode != ONCE:
+            return self._play_wrapped_frame(nowtime, typed_kwargs)
+        prev = self.state.time
 
         nowtime1 = nowtime
-        if typed_kwargs['time_reverse']:
-            nowtime = self.stop_time - nowtime
-        if nowtime1 <= self.stop_time and nowtime1 >= 0:
-            dic: Dict[str, Any] = {}
-            ani = self.anim[typed_kwargs['path']]
-            if 'Euler' in ani:
-                e, time_nodes = ani.get('Euler')
-
-                euler_unit = typed_kwargs['euler_unit']
-                # 欧拉角插值器返回 (ex, ey, ez) 元组
-                euler_result = self._get_seg_result(e, nowtime, time_nodes)
-                if isinstance(euler_unit, tuple):
-                    # 提取指定的分量
-                    unit_indices = {'x': 0, 'y': 1, 'z': 2}
-                    euler = tuple(euler_result[unit_indices[unit]] for unit in euler_unit)
-                else:
-                    # 返回全部分量或指定分量
-                    unit_index = {'x': 0, 'y': 1, 'z': 2}.get(euler_unit, None)
-                    euler = euler_result[unit_index] if unit_index is not None else euler_result
-                dic['euler'] = euler
-
-            if 'Rotation' in ani:
-                r, time_nodes = ani.get('Rotation')
-
-                rotation_unit = typed_kwargs['rotation_unit']
-                # 四元数插值器返回 (qx, qy, qz, qw) 元组
-                rotation_result = self._get_seg_result(r, nowtime, time_nodes)
-                if isinstance(rotation_unit, tuple):
-                    # 提取指定的分量
-                    unit_indices = {'x': 0, 'y': 1, 'z': 2, 'w': 3}
-                    rotation = tuple(rotation_result[unit_indices[unit]] for unit in rotation_unit)
-                else:
-                    # 返回全部分量或指定分量
-                    unit_index = {'x': 0, 'y': 1, 'z': 2, 'w': 3}.get(rotation_unit, None)
-                    rotation = rotation_result[unit_index] if unit_index is not None else rotation_result
-                dic['rotation'] = rotation
-
-            if 'Position' in ani:
-                p, time_nodes = ani.get('Position')
-
-                position_unit = typed_kwargs['position_unit']
-                position_reverse = typed_kwargs['position_reverse']
-                position_ratio = typed_kwargs['position_ratio']
-                
-                if isinstance(position_unit, tuple):
-
-                    position_values = []
-                    for i, unit in enumerate(position_unit):
-
-                        reverse_val = position_reverse[i] if isinstance(position_reverse, tuple) else position_reverse
-                        ratio_val = position_ratio[i] if isinstance(position_ratio, tuple) else position_ratio
-                        pos_val = self._get_seg_result(p[unit], nowtime, time_nodes) * ratio_val
-                        pos_val = -pos_val if reverse_val else pos_val
-                        position_values.append(pos_val)
-                    dic['position'] = tuple(position_values)
-                else:
-
-                    reverse_val = position_reverse if isinstance(position_reverse, bool) else position_reverse[0]
-                    ratio_val = position_ratio if isinstance(position_ratio, (int, float)) else position_ratio[0]
-                    pos_val = self._get_seg_result(p[position_unit], nowtime, time_nodes) * ratio_val
-                    pos_val = -pos_val if reverse_val else pos_val
-                    dic['position'] = pos_val
-
-            if 'Scale' in ani:
-                s, time_nodes = ani.get('Scale')
-                
-                scale_unit = typed_kwargs['scale_unit']
-                scale_reverse = typed_kwargs['scale_reverse']
-                scale_ratio = typed_kwargs['scale_ratio']
-                
-                if isinstance(scale_unit, tuple):
-                    scale_values = []
-                    for i, unit in enumerate(scale_unit):
-                        reverse_val = scale_reverse[i] if isinstance(scale_reverse, tuple) else scale_reverse
-                        ratio_val = scale_ratio[i] if isinstance(scale_ratio, tuple) else scale_ratio
-                        val = self._get_seg_result(s[unit], nowtime, time_nodes) * ratio_val
-                        val = -val if reverse_val else val
-                        scale_values.append(val)
-                    dic['scale'] = tuple(scale_values)
-                else:
-                    reverse_val = scale_reverse if isinstance(scale_reverse, bool) else scale_reverse[0]
-                    ratio_val = scale_ratio if isinstance(scale_ratio, (int, float)) else scale_ratio[0]
-                    val = self._get_seg_result(s[scale_unit], nowtime, time_nodes) * ratio_val
-                    val = -val if reverse_val else val
-                    dic['scale'] = val
-
-            if 'Float' in ani:
-                f, time_nodes = ani.get('Float')
-                if isinstance(f, list):
-                    float_val = self._get_seg_result(f, nowtime, time_nodes)
-                    dic['float'] = float_val.item() if isinstance(float_val, np.ndarray) else float_val
+        nowtime = self._sample_time(nowtime1, typed_kwargs)
+        if nowtime is not None:
+            plan = self.clip.plan(typed_kwargs)
+            values = self._evaluate(plan, nowtime)
+
+            # 事件按上一帧到当前帧经过的时间区间查询，前进、后退与拖动进度都无需重置
+            if prev is None:
+                spans = [self._first_span(nowtime, typed_kwargs)]
             else:
-                float_val = 0.0
-
-            events = self.events.get_events(nowtime, time_reverse=typed_kwargs['event_time_reverse'])
-            for event in events:
-                regstered_event = self.registered_events.get(event[0], (lambda: None, ()))
-                parameters = [event[1][arg] for arg in regstered_event[1]]
-                regstered_event[0](*parameters)
-            dic['events'] = events
+                prev_time = self.stop_time - prev if typed_kwargs['time_reverse'] else prev
+                spans = [(prev_time, nowtime, False)]
+            events = self._fire_events(spans)
+            self.state.time = nowtime1
 
-            return dic, True
+            return plan, values, events
         else:
+            self.state.time = None
             self.events.reset_events()
-            return {}, False
+            return None, None, None
+
+    def _sample_time(self, nowtime: float, typed_kwargs: Dict[str, Any]) -> Optional[float]:
+        """播放时间 nowtime 对应的片段本地采样时间（已处理 wrap mode 与 time_reverse），once 模式下超出片段时为 None"""
+        stop_time = self.stop_time
+        wrap_mode = self.state.wrap_mode
+        if wrap_mode != ONCE:
+            _, nowtime = clip_cycle(nowtime, stop_time, wrap_mode)
+        elif not 0 <= nowtime <= stop_time:
+            return None
+        return stop_time - nowtime if typed_kwargs['time_reverse'] else nowtime
+
+    def _play_wrapped_frame(self, nowtime: float, typed_kwargs: Dict[str, Any]) -> Tuple[SamplingPlan, Tuple[float, ...], list]:
+        """
+        clamp / loop / ping_pong 模式下播放一帧，任何时间都有效
+
+        时间先映射到周期内的本地时间（O(1)）；事件不消耗事件堆，而是按上一帧到当前帧
+        经过的本地时间区间查询，跨越周期边界时逐个周期切分，因此循环任意多次都无需重置。
+        """
+        stop_time = self.stop_time
+        wrap_mode = self.state.wrap_mode
+        reverse = typed_kwargs['time_reverse']
+        sample_time = self._sample_time(nowtime, typed_kwargs)
+
+        plan = self.clip.plan(typed_kwargs)
+        values = self._evaluate(plan, sample_time)
+
+        prev = self.state.time
+        if prev is None:
+            spans = [self._first_span(sample_time, typed_kwargs)]
+        else:
+            spans = cycle_spans(prev, nowtime, stop_time, wrap_mode)
+            if reverse:
+                spans = [(stop_time - a, stop_time - b, include_start) for a, b, include_start in spans]
+        events = self._fire_events(spans)
+
+        self.state.time = nowtime
+        return plan, values, events
+
+    @staticmethod
+    def _first_span(sample_time: float, typed_kwargs: Dict[str, Any]) -> Tuple[float, float, bool]:
+        """第一帧的事件区间：从播放方向的起点到当前时间（含端点）"""
+        start = np.inf if typed_kwargs['event_time_reverse'] else -np.inf
+        return start, sample_time, True
+
+    def _fire_events(self, spans) -> list:
+        """查询并触发 spans（[(t_from, t_to, include_start), ...]）内的事件，返回事件列表"""
+        events = []
+        dispatch = self.events.dispatch_between
+        for t_from, t_to, include_start in spans:
+            dispatch(t_from, t_to, include_start, events)
+        return events
+
+    def next_change_time(self, t: float, **kwargs: Union[str, bool, Tuple, float]) -> float:
+        """
+        播放器时间 t 之后（含 t）下一次输出变化或事件触发的时间，用于在保持段中暂停定时器
+
+        考虑 wrap_mode 与本播放器动态添加的事件；倒放方向（time_reverse、ping_pong 的回程）
+        保守地返回 t。once 模式下最晚返回 stop_time，以便播放到结尾；之后永远不变时返回 inf。
+        """
+        typed_kwargs = type_kwargs(**kwargs)
+        stop_time = self.stop_time
+        wrap_mode = self.state.wrap_mode
+        if typed_kwargs['time_reverse']:
+            return t
+        if wrap_mode == ONCE:
+            if t < 0 or t > stop_time:
+                return t
+            return min(self._next_local_change(t, typed_kwargs), stop_time)
+        if wrap_mode == CLAMP:
+            if t < 0:
+                return 0.0
+            if t >= stop_time:
+                return np.inf
+            return self._next_local_change(t, typed_kwargs)
+
+        cycle, local = clip_cycle(t, stop_time, wrap_mode)
+        if wrap_mode == PING_PONG and cycle % 2:
+            return t
+        change = self._next_local_change(local, typed_kwargs)
+        if change <= stop_time:
+            return t + (change - local)
+        return (cycle + 1) * stop_time  # 本周期内不再变化，在下一个周期开始时重新检查
+
+    def _next_local_change(self, t: float, typed_kwargs: Dict[str, Any]) -> float:
+        change = self.clip.plan(typed_kwargs).next_change_time(t)
+        times = self.events.timeline.times
+        index = np.searchsorted(times, t, side='left')
+        if index < len(times):
+            change = min(change, float(times[index]))
+        return change
+
+    def _evaluate(self, plan: SamplingPlan, t: float) -> Tuple[float, ...]:
+        """计算 plan 在时间 t 的展平通道值；已烘焙时直接查表，批量推进或启用帧缓存时与其他播放器共享结果"""
+        baked = self.state.baked
+        if baked is not None and baked.plan is plan:
+            return baked.sample(t)
+        batch = self.state.batch
+        if batch is not None and plan.key is not None:
+            values = batch.get((plan, t))
+            if values is None:
+                values = batch[(plan, t)] = self._evaluate_shared(plan, t)
+            return values
+        return self._evaluate_shared(plan, t)
+
+    def _evaluate_shared(self, plan: SamplingPlan, t: float) -> Tuple[float, ...]:
+        memo = self.clip.frame_memo
+        if memo.enabled and plan.key is not None:
+            return memo.lookup(plan, t)
+        return plan.evaluate(t)
 
     def _get_seg_result(self, segments: Any, t: float, time_nodes: Optional[np.ndarray] = None) -> float:
         """Binary search to find segmented interpolation result using Numba acceleration"""
@@ -194,8 +280,49 @@ class AnimationPlayer:
         sample_points = {t: self.play_frame(t, **kwargs)[0] for t in np.arange(t_start, t_end, sample_rate)}
         return sample_points
     
+    def events_for_times(self, times, t_start: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        离线查询：返回 (sample_index, event_index)，表示第 event_index 个事件落在第 sample_index 个采样区间内
+
+        不修改播放状态、不触发回调；事件内容见 self.events.timeline.entries[event_index]。
+        区间定义见 EventTimeline.events_for_times。
+        """
+        return self.events.timeline.events_for_times(times, t_start)
+
+    def bake(self, fps: Optional[float] = None, dtype=np.float64, blend: bool = True, cache: bool = False,
+             **kwargs: Union[str, bool, Tuple, float]) -> BakedTable:
+        """
+        以固定帧率烘焙当前 kwargs 对应的输出，之后使用相同 kwargs 调用 play_frame 时直接查表
+
+        fps: 帧率，默认 config.FPS
+        dtype: 表的数据类型，可用 np.float32 减半内存
+        blend: 是否在相邻两帧之间线性混合（否则取最近帧）
+        cache: 是否把烘焙表缓存到磁盘（与片段的 .json 缓存放在一起）
+        """
+        plan = self.clip.plan(type_kwargs(**kwargs))
+        table = self.clip.bake(plan, config.FPS if fps is None else fps, self.stop_time, dtype, blend, cache)
+        self.state.baked = table
+        return table
+
+    def unbake(self) -> None:
+        """恢复逐帧精确求值"""
+        self.state.baked = None
+
+    def play_baked_frame(self, frame_index: Union[int, float]) -> Tuple[Dict[str, Any], bool]:
+        """
+        按帧索引播放烘焙表（小数索引在 blend=True 时混合相邻两帧），参数与 bake() 时相同
+
+        帧按片段时间索引，不受 time_reverse 影响
+        """
+        baked = self.state.baked
+        if baked is None:
+            raise RuntimeError("play_baked_frame() requires bake() to be called first")
+        kwargs = dict(baked.plan.key) if baked.plan.key is not None else {'path': baked.plan.path}
+        return self.play_frame(baked.frame_time(frame_index), **kwargs)
+
     def add_event(self, delay, *kwargs):
         self.events.add_event(delay, *kwargs)
 
     def register_event(self, function_name: str, function: Callable, args: Tuple[Literal['data', 'floatParameter', 'intParameter', 'messageOptions'], ...] = ()):
-        self.registered_events[function_name] = (function, args)
\ No newline at end of file
+        """注册事件回调；参数在注册时就从事件表中取出，播放时直接调用"""
+        self.events.register(function_name, function, args)
\ No newline at end of file
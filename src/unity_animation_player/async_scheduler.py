@@ -0,0 +1,230 @@
+import asyncio
+import math
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
+
+from . import config
+from .animation_player import AnimationPlayer
+from .kwargs import type_kwargs
+from .wrap_modes import ONCE
+
+
+class _Entry:
+    """调度器中的一个播放器及其播放参数"""
+
+    __slots__ = ('player', 'typed_kwargs', 'anchor_t', 'speed', 'start_tick', 'wake_tick', 'callback', 'queue', 'done',
+                 'dropped')
+
+    def __init__(self, player: AnimationPlayer, typed_kwargs: Dict[str, Any], anchor_t: float, speed: float,
+                 callback: Optional[Callable[[Dict[str, Any]], Any]], queue: Optional[asyncio.Queue],
+                 done: asyncio.Future):
+        self.player = player
+        self.typed_kwargs = typed_kwargs
+        self.anchor_t = anchor_t
+        self.speed = speed
+        self.start_tick: Optional[int] = None  # 加入后的第一个 tick 作为 t = anchor_t 的时刻
+        self.wake_tick: float = 0  # 处于保持段时下一次需要求值的 tick（inf 表示不再变化）
+        self.callback = callback
+        self.queue = queue
+        self.done = done
+        self.dropped = 0  # 异步迭代器消费太慢时被覆盖的帧数
+
+
+class AsyncAnimationScheduler:
+    """
+    不依赖 Qt 的 asyncio 动画调度器
+
+    以固定帧率驱动任意多个 AnimationPlayer：第 n 个 tick 的截止时间为 start + n / fps，
+    由 loop.time() 计算而不是累加 sleep，因此不会漂移；醒来过晚时直接跳到当前帧并计入 skipped_frames。
+    同一个 tick 内的所有播放器一起求值，片段、参数与时间都相同的播放器只计算一次曲线。
+
+    每个播放器的帧可以通过回调（add）或异步迭代器（frames）获取；
+    帧为 play_frame 的输出字典，另外包含 'time' 键（播放器时间）。
+    once 模式的播放器播放到结尾后自动移除：越过结尾的 tick 播放的是结尾那一帧（'time' 为 stop_time，倒放时为 0），
+    因此 tick 间隔不整除片段时长时，结尾的事件与最终值也会送达。
+
+    播放器处于保持段（值不变且没有事件，见 AnimationPlayer.next_change_time）时不会产生帧，
+    所有播放器都在保持段时调度器直接休眠到最早的变化时刻，而不是空转。
+    """
+
+    def __init__(self, fps: Optional[float] = None):
+        self.fps = config.FPS if fps is None else fps
+        self.interval = 1 / self.fps
+        self._entries: Dict[AnimationPlayer, _Entry] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None  # 休眠时有播放器加入或移除则提前唤醒
+        self._tick = 0
+        self.ticks = 0
+        self.late_ticks = 0
+        self.skipped_frames = 0
+
+    def add(self, player: AnimationPlayer, callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+            t: float = 0.0, speed: float = 1.0, **kwargs: Union[str, bool, tuple, float]) -> asyncio.Future:
+        """
+        开始播放 player，每帧以输出字典调用 callback（可以是普通函数或协程函数）
+
+        t: 起始时间；speed: 播放速度（负数为倒放）；kwargs: play_frame 的参数
+        返回: 播放结束（或被 remove）时完成的 Future
+        """
+        return self._add(player, callback, None, t, speed, kwargs).done
+
+    async def frames(self, player: AnimationPlayer, t: float = 0.0, speed: float = 1.0, maxsize: int = 1,
+                     **kwargs: Union[str, bool, tuple, float]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        以异步迭代器的形式播放 player，播放结束时迭代结束
+
+        maxsize: 缓冲的帧数，消费者跟不上时丢弃最旧的帧（默认只保留最新一帧）
+        """
+        entry = self._add(player, None, asyncio.Queue(maxsize), t, speed, kwargs)
+        try:
+            while True:
+                frame = await entry.queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.remove(player)
+
+    def _add(self, player: AnimationPlayer, callback, queue, t: float, speed: float, kwargs) -> _Entry:
+        self.remove(player)
+        player.state.time = None
+        entry = _Entry(player, type_kwargs(**kwargs), t, speed, callback, queue,
+                       asyncio.get_running_loop().create_future())
+        self._entries[player] = entry
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        elif self._wakeup is not None:
+            self._wakeup.set()
+        return entry
+
+    def remove(self, player: AnimationPlayer) -> None:
+        """停止播放 player"""
+        entry = self._entries.pop(player, None)
+        if entry is not None:
+            self._finish(entry)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def _finish(self, entry: _Entry) -> None:
+        if entry.queue is not None:
+            self._put(entry, None)
+        if not entry.done.done():
+            entry.done.set_result(entry.player)
+
+    def _put(self, entry: _Entry, frame: Optional[Dict[str, Any]]) -> None:
+        queue = entry.queue
+        if queue.full():
+            queue.get_nowait()
+            entry.dropped += 1
+        queue.put_nowait(frame)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def join(self) -> None:
+        """等待所有播放器播放结束"""
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+
+    def stop(self) -> None:
+        """移除所有播放器并停止调度"""
+        for player in tuple(self._entries):
+            self.remove(player)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self._tick = 0
+        self._wakeup = asyncio.Event()
+        while self._entries:
+            self.ticks += 1
+            await self._step(self._tick)
+            if not self._entries:
+                break
+
+            # 下一个截止时间按 tick 序号计算，所有播放器都在保持段时休眠到最早的唤醒 tick；
+            # 醒来过晚时跳过错过的帧
+            now = loop.time()
+            target = max(self._tick + 1, min(entry.wake_tick for entry in self._entries.values()))
+            due = math.floor((now - start) / self.interval)
+            if due > target:
+                self.late_ticks += 1
+                self.skipped_frames += due - target
+                target = due
+            self._wakeup.clear()
+            if target == math.inf:
+                await self._wakeup.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), max(start + target * self.interval - loop.time(), 0.0))
+                except asyncio.TimeoutError:
+                    pass
+            if self._wakeup.is_set():
+                # 提前唤醒：从当前时刻对应的 tick 继续
+                target = min(target, max(self._tick + 1, math.ceil((loop.time() - start) / self.interval)))
+            self._tick = int(target)
+
+    async def _step(self, tick: int) -> None:
+        """推进一个 tick：所有播放器共享同一个 batch 缓存"""
+        batch: Dict[Any, Any] = {}
+        pending = []
+        ended = []  # 本 tick 播放了终点帧的条目，回调完成后再结束
+        for entry in tuple(self._entries.values()):
+            if entry.start_tick is None:
+                entry.start_tick = tick
+            elif tick < entry.wake_tick:
+                continue
+            step = self.interval * entry.speed
+            t = entry.anchor_t + (tick - entry.start_tick) * step
+            player = entry.player
+            state = player.state
+            # once 模式下越过终点的 tick 先播放终点帧再结束，tick 间隔不整除片段时长时终点的事件与最终值也不会丢失
+            # （与 SignalAnimationPlayer._advance_clock 相同）
+            ending = False
+            if state.wrap_mode == ONCE and state.time is not None and step != 0:
+                end = player.stop_time if step > 0 else 0
+                if (t - end) * step > 0 and state.time != end:
+                    t, ending = end, True
+            state.batch = batch
+            try:
+                plan, values, events = player._play(t, entry.typed_kwargs)
+            finally:
+                state.batch = None
+            if plan is None or ending:
+                self._entries.pop(player, None)
+            if plan is None:
+                self._finish(entry)
+                continue
+            frame = plan.assemble(values)
+            frame['events'] = events
+            frame['time'] = t
+            if step > 0:
+                # 只有本帧已经处于保持段时才休眠，下一帧才进入保持段时先播放保持段起点的值
+                next_t = t + step
+                change = player.next_change_time(t, **entry.typed_kwargs)
+                if change > next_t:
+                    entry.wake_tick = (math.inf if change == math.inf
+                                       else entry.start_tick + math.floor((change - entry.anchor_t) / step))
+            if entry.queue is not None:
+                self._put(entry, frame)
+            elif entry.callback is not None:
+                result = entry.callback(frame)
+                if asyncio.iscoroutine(result):
+                    pending.append(result)
+            if ending:
+                ended.append(entry)
+        if pending:
+            await asyncio.gather(*pending)
+        for entry in ended:
+            self._finish(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'players': len(self._entries),
+            'fps': self.fps,
+            'ticks': self.ticks,
+            'late_ticks': self.late_ticks,
+            'skipped_frames': self.skipped_frames,
+        }
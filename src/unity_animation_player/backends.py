@@ -0,0 +1,211 @@
+"""
+插值后端注册表
+
+同一条曲线可以由不同的内核求值，后端决定插值器使用哪一组内核：
+
+    numba:  numba 编译的精确内核（默认，需要安装 numba 且 config.USE_JIT 为 True）
+    numpy:  math 标量内核 + NumPy 向量化批量内核（见 numpy_backend.py），结果与 numba 在浮点误差内一致
+    python: 只用 math 的纯 Python 内核，批量求值逐点循环（PyPy 等没有 numba 的环境）
+    lut:    用精确内核解析后再整体替换为查找表（见 AnimationClip.with_lut），
+            误差上限为 config.LUT_TOLERANCE
+
+进程级的后端由 config.BACKEND 决定（环境变量 UNITY_ANIMATION_PLAYER_BACKEND 或 config.set_backend()），
+None 时自动选择：有 numba 时为 numba，否则为 numpy。单个片段可以在构建时另外指定
+（load_clip(path, backend=...) / AnimationClip.from_anim_dict(..., backend=...)）。
+"""
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+
+from . import config
+
+BackendLike = Union[str, 'Backend', None]
+
+
+class Backend:
+    """
+    一组插值内核
+
+    kernels 为 {名称: 函数}，首次访问时由 loader 加载，键为：
+    rational_bezier_evaluate(_many)、slerp_evaluate(_many)、axis_angle_evaluate(_many)、
+    euler_to_quaternion、quaternion_to_euler、euler_to_quaternion_many、quaternion_to_euler_many，
+    以及 params（把插值器工厂生成的 float64 参数数组转换为内核接受的形式）。
+    """
+
+    __slots__ = ('name', 'description', 'uses_numba', 'lut', '_loader', '_available', '_kernels')
+
+    def __init__(self, name: str, description: str, loader: Callable[[], Dict[str, Callable]],
+                 available: Callable[[], bool] = lambda: True, uses_numba: bool = False, lut: bool = False):
+        self.name = name
+        self.description = description
+        self.uses_numba = uses_numba
+        self.lut = lut  # True 时片段构建完成后替换为查找表
+        self._loader = loader
+        self._available = available
+        self._kernels: Optional[Dict[str, Callable]] = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+    @property
+    def available(self) -> bool:
+        return self._available()
+
+    @property
+    def kernels(self) -> Dict[str, Callable]:
+        if self._kernels is None:
+            self._kernels = self._loader()
+        return self._kernels
+
+
+_registry: Dict[str, Backend] = {}
+_warned = set()
+
+
+def register_backend(backend: Backend) -> Backend:
+    """注册（或替换）一个后端，之后可以通过名称选择"""
+    _registry[backend.name] = backend
+    return backend
+
+
+def backend_names():
+    return tuple(_registry)
+
+
+def _as_python_floats(params: np.ndarray) -> tuple:
+    return tuple(params.tolist())  # Python float 上的标量运算比 np.float64 快
+
+
+def _jit_available() -> bool:
+    from .numba_optimized import JIT_ENABLED
+    return JIT_ENABLED
+
+
+def _load_numba() -> Dict[str, Callable]:
+    from .numba_optimized import rational_bezier_interpolator as rb, spherical_linear_interpolator as sl
+    return {
+        'params': lambda params: params,
+        'rational_bezier_evaluate': rb.rational_bezier_evaluate,
+        'rational_bezier_evaluate_many': rb.rational_bezier_evaluate_many,
+        'slerp_evaluate': sl.slerp_evaluate,
+        'slerp_evaluate_many': sl.slerp_evaluate_many,
+        'axis_angle_evaluate': sl.axis_angle_evaluate,
+        'axis_angle_evaluate_many': sl.axis_angle_evaluate_many,
+        'euler_to_quaternion': sl._euler_to_quaternion,
+        'quaternion_to_euler': sl._quaternion_to_euler,
+        'euler_to_quaternion_many': sl.euler_to_quaternion_many,
+        'quaternion_to_euler_many': sl.quaternion_to_euler_many,
+    }
+
+
+def _load_numpy() -> Dict[str, Callable]:
+    from . import numpy_backend as nb
+    return {
+        'params': _as_python_floats,
+        'rational_bezier_evaluate': nb.rational_bezier_evaluate,
+        'rational_bezier_evaluate_many': nb.rational_bezier_evaluate_many,
+        'slerp_evaluate': nb.slerp_evaluate,
+        'slerp_evaluate_many': nb.slerp_evaluate_many,
+        'axis_angle_evaluate': nb.axis_angle_evaluate,
+        'axis_angle_evaluate_many': nb.axis_angle_evaluate_many,
+        'euler_to_quaternion': nb._euler_to_quaternion,
+        'quaternion_to_euler': nb._quaternion_to_euler,
+        'euler_to_quaternion_many': nb.euler_to_quaternion_many,
+        'quaternion_to_euler_many': nb.quaternion_to_euler_many,
+    }
+
+
+def _looped(kernel: Callable, width: int) -> Callable:
+    """把标量内核包装为逐点循环的批量版本"""
+    def many(params, ts):
+        out = np.array([kernel(params, t) for t in ts.tolist()], dtype=np.float64)
+        return out.reshape(len(ts), width) if width else out
+    return many
+
+
+def _looped_rows(convert: Callable, width: int) -> Callable:
+    def many(rows):
+        return np.array([convert(*row) for row in rows.tolist()], dtype=np.float64).reshape(len(rows), width)
+    return many
+
+
+def _load_python() -> Dict[str, Callable]:
+    from . import numpy_backend as nb
+    return {
+        'params': _as_python_floats,
+        'rational_bezier_evaluate': nb.rational_bezier_evaluate,
+        'rational_bezier_evaluate_many': _looped(nb.rational_bezier_evaluate, 0),
+        'slerp_evaluate': nb.slerp_evaluate,
+        'slerp_evaluate_many': _looped(nb.slerp_evaluate, 4),
+        'axis_angle_evaluate': nb.axis_angle_evaluate,
+        'axis_angle_evaluate_many': _looped(nb.axis_angle_evaluate, 4),
+        'euler_to_quaternion': nb._euler_to_quaternion,
+        'quaternion_to_euler': nb._quaternion_to_euler,
+        'euler_to_quaternion_many': _looped_rows(nb._euler_to_quaternion, 4),
+        'quaternion_to_euler_many': _looped_rows(nb._quaternion_to_euler, 3),
+    }
+
+
+def _load_exact() -> Dict[str, Callable]:
+    return exact_backend().kernels
+
+
+register_backend(Backend('numba', 'numba-compiled exact kernels', _load_numba, _jit_available, uses_numba=True))
+register_backend(Backend('numpy', 'math scalar kernels with vectorised NumPy batch evaluation', _load_numpy))
+register_backend(Backend('python', 'pure-Python math kernels, batches evaluated point by point', _load_python))
+register_backend(Backend('lut', 'lookup tables built from the exact kernels (config.LUT_TOLERANCE)', _load_exact,
+                         lut=True))
+
+
+def exact_backend() -> Backend:
+    """自动选择的精确后端：有 numba 时为 numba，否则为 numpy"""
+    return _registry['numba' if _jit_available() else 'numpy']
+
+
+def get_backend(name: BackendLike = None) -> Backend:
+    """
+    按名称返回后端
+
+    name 为 None 时使用 config.BACKEND（仍为 None 时自动选择）；显式给出的名称未注册或不可用时抛出 ValueError，
+    config.BACKEND 中的名称无效时打印警告并改为自动选择。
+    """
+    if isinstance(name, Backend):
+        return name
+    if name is None:
+        name = config.BACKEND
+        if name is None:
+            return exact_backend()
+        backend = _registry.get(name)
+        if backend is None or not backend.available:
+            if name not in _warned:
+                _warned.add(name)
+                reason = 'is not available' if backend is not None else 'is unknown'
+                print(f"[Warning]Backend {name!r} {reason}, falling back to {exact_backend().name!r}")
+            return exact_backend()
+        return backend
+    backend = _registry.get(name)
+    if backend is None:
+        raise ValueError(f"backend must be one of {backend_names()}, got {name!r}")
+    if not backend.available:
+        raise ValueError(f"backend {name!r} is not available (numba is not installed or config.USE_JIT is False)")
+    return backend
+
+
+def describe_backend() -> Dict[str, Any]:
+    """
+    当前进程使用的后端
+
+    active: 实际使用的后端名称；requested: config.BACKEND；source: 'env'（环境变量）/ 'set_backend' / 'auto'；
+    jit: numba 内核是否可用；available: {名称: 是否可用}；lut_tolerance / lut_order: lut 后端的查找表参数
+    """
+    active = get_backend()
+    return {
+        'active': active.name,
+        'description': active.description,
+        'requested': config.BACKEND,
+        'source': config.BACKEND_SOURCE,
+        'jit': _jit_available(),
+        'available': {name: backend.available for name, backend in _registry.items()},
+        'lut_tolerance': config.LUT_TOLERANCE,
+        'lut_order': config.LUT_ORDER,
+    }
@@ -0,0 +1,172 @@
+import hashlib
+import math
+import os
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .sampling_plan import SamplingPlan
+from .cache_yaml import cache_file_path
+
+
+class BakedTable:
+    """
+    固定帧率的烘焙表
+
+    times 形状为 (n_frames,)，第 i 帧位于 i / fps（最后一帧截断到 stop_time）；
+    values 形状为 (n_frames, plan.width)，列顺序与 plan.layout 一致。
+    采样只需一次整数索引（blend=True 时在相邻两帧之间线性混合），与曲线复杂度无关。
+    steps[i] 记录第 i 帧与第 i+1 帧之间的跳变时间（没有则为 NaN），混合时不会跨越跳变。
+    欧拉角通道（angular 中的列）按最短弧混合，跨过 ±180 度时不会经过 0。
+    """
+
+    __slots__ = ('plan', 'fps', 'times', 'values', 'steps', 'blend', 'angular')
+
+    def __init__(self, plan: SamplingPlan, fps: float, times: np.ndarray, values: np.ndarray,
+                 steps: Optional[np.ndarray] = None, blend: bool = True):
+        self.plan = plan
+        self.fps = float(fps)
+        self.times = times
+        self.values = values
+        self.steps = np.full(max(len(times) - 1, 0), np.nan) if steps is None else steps
+        self.blend = blend
+        columns = []
+        offset = 0
+        for field in plan.fields:
+            if field.kind == 'Euler':
+                columns.extend(range(offset, offset + field.width))
+            offset += field.width
+        self.angular = np.array(columns, dtype=np.intp) if columns else None
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(fps={self.fps!r}, n_frames={self.n_frames}, "
+                f"channels={self.plan.width}, dtype={self.values.dtype}, blend={self.blend})")
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def with_blend(self, blend: bool) -> 'BakedTable':
+        """共享同一份数据、只改变混合方式的新表"""
+        if blend == self.blend:
+            return self
+        return BakedTable(self.plan, self.fps, self.times, self.values, self.steps, blend)
+
+    def frame_time(self, frame_index: Union[int, float]) -> float:
+        """帧索引对应的时间"""
+        last = self.n_frames - 1
+        if frame_index <= 0:
+            return float(self.times[0])
+        if frame_index >= last:
+            return float(self.times[last])
+        i0 = int(frame_index)
+        t0 = float(self.times[i0])
+        frac = frame_index - i0
+        return t0 if frac == 0 else t0 + (float(self.times[i0 + 1]) - t0) * frac
+
+    def frame(self, frame_index: Union[int, float]) -> Tuple[float, ...]:
+        """按帧索引取值；小数索引在 blend=True 时线性混合相邻两帧，否则取最近帧"""
+        last = self.n_frames - 1
+        if frame_index <= 0:
+            return tuple(self.values[0].tolist())
+        if frame_index >= last:
+            return tuple(self.values[last].tolist())
+        i0 = int(frame_index)
+        frac = frame_index - i0
+        if frac == 0:
+            return tuple(self.values[i0].tolist())
+        if not self.blend:
+            return tuple(self.values[i0 + 1 if frac >= 0.5 else i0].tolist())
+        step = self.steps[i0]
+        if step == step:
+            # 区间内有跳变：跳变前保持上一帧，跳变后取下一帧
+            return tuple(self.values[i0 if self.frame_time(frame_index) < step else i0 + 1].tolist())
+        v0 = self.values[i0]
+        delta = self.values[i0 + 1] - v0
+        angular = self.angular
+        if angular is None:
+            return tuple((v0 + delta * frac).tolist())
+        delta[angular] = (delta[angular] + 180.0) % 360.0 - 180.0
+        out = v0 + delta * frac
+        angles = out[angular]
+        out[angular] = np.where(angles > 180.0, angles - 360.0, np.where(angles < -180.0, angles + 360.0, angles))
+        return tuple(out.tolist())
+
+    def sample(self, t: float) -> Tuple[float, ...]:
+        """按时间取值，O(1)"""
+        fi = t * self.fps
+        last = self.n_frames - 1
+        if fi <= 0 or last == 0:
+            return self.frame(0)
+        i0 = int(fi)
+        if i0 >= last:
+            return self.frame(last)
+        # 最后一段可能比 1/fps 短，用实际帧时间计算混合系数
+        t0 = self.times[i0]
+        frac = (t - t0) / (self.times[i0 + 1] - t0)
+        return self.frame(i0 + min(max(frac, 0.0), 1.0))
+
+
+def bake_plan(plan: SamplingPlan, fps: float, stop_time: float,
+              dtype=np.float64, blend: bool = True) -> BakedTable:
+    """以 fps 帧率在 [0, stop_time] 上对 plan 完整求值一次，生成烘焙表"""
+    if fps <= 0:
+        raise ValueError(f"fps must be positive, got {fps}")
+    n_intervals = max(int(math.ceil(stop_time * fps - 1e-9)), 0)
+    times = np.minimum(np.arange(n_intervals + 1, dtype=np.float64) / fps, stop_time)
+    values = np.empty((len(times), plan.width), dtype=dtype)
+    for i, t in enumerate(times):
+        values[i] = plan.evaluate(float(t))
+
+    steps = np.full(max(len(times) - 1, 0), np.nan)
+    for k in plan.discontinuities():
+        i = int(np.searchsorted(times, k, side='left')) - 1
+        if 0 <= i < len(steps) and steps[i] != steps[i]:
+            steps[i] = k
+    for array in (times, values, steps):
+        array.flags.writeable = False
+    return BakedTable(plan, fps, times, values, steps, blend)
+
+
+def baked_cache_path(source: str, plan: SamplingPlan, fps: float, stop_time: float, dtype,
+                     variant: Tuple = ()) -> Optional[str]:
+    """
+    烘焙表在磁盘缓存中的路径（与片段的 .json 缓存放在一起）；plan 不可哈希时返回 None
+
+    variant: 影响取值但不在 plan.key 中的片段设置（见 AnimationClip._bake_variant），一并计入文件名
+    """
+    if plan.key is None:
+        return None
+    digest = hashlib.sha256(repr((variant, plan.key, float(fps), float(stop_time),
+                                  np.dtype(dtype).str)).encode('utf-8'))
+    return cache_file_path(source, f'.baked-{digest.hexdigest()[:16]}.npz')
+
+
+def save_baked_table(table: BakedTable, file_path: str, source_sha256: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            np.savez(f, times=table.times, values=table.values, steps=table.steps, sha256=np.array(source_sha256))
+    except OSError as e:
+        print(f"[Warning]Failed to save baked table: {e}")
+
+
+def load_baked_table(plan: SamplingPlan, fps: float, file_path: str, source_sha256: str,
+                     blend: bool = True) -> Optional[BakedTable]:
+    """读取磁盘上的烘焙表；文件不存在、损坏或源文件已改变时返回 None"""
+    try:
+        with np.load(file_path) as data:
+            if str(data['sha256']) != source_sha256:
+                return None
+            times, values, steps = data['times'], data['values'], data['steps']
+    except (OSError, KeyError, ValueError):
+        return None
+    if values.ndim != 2 or values.shape != (len(times), plan.width) or len(steps) != max(len(times) - 1, 0):
+        return None
+    for array in (times, values, steps):
+        array.flags.writeable = False
+    return BakedTable(plan, fps, times, values, steps, blend)
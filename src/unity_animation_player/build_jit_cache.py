@@ -0,0 +1,35 @@
+"""
+预先编译所有 numba 内核并写入磁盘缓存
+
+    UNITY_ANIMATION_PLAYER_JIT_CACHE_DIR=/path/to/cache python -m unity_animation_player.build_jit_cache
+
+部署时（例如构建容器镜像时）运行一次，之后的进程直接从缓存加载，无需重新编译。
+"""
+import sys
+import time
+
+
+def main() -> int:
+    # 导入插值器时已按 config.JIT_WARMUP 预编译过一次，这里再确保所有内核都已编译并写入缓存
+    from . import config
+    from .jit_warmup import compile_kernels, jit_status
+
+    if not config.USE_JIT:
+        print("[Warning]config.USE_JIT is False, nothing to compile")
+        return 1
+    try:
+        from numba.core import config as numba_config
+    except ImportError:
+        print("[Warning]numba is not installed, nothing to compile")
+        return 1
+
+    start = time.perf_counter()
+    compile_kernels()
+    seconds = time.perf_counter() - start + (jit_status()['seconds'] or 0.0)
+    print(f"Compiled numba kernels in {seconds:.2f}s")
+    print(f"Cache directory: {numba_config.CACHE_DIR or 'next to the package sources (__pycache__)'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,8 @@ import json
 import tempfile
 import hashlib
 import re
-import yaml
+
+from . import profiling, tracing
 
 # Deleted:yaml = YAML()
 # Deleted:yaml.preserve_quotes = True
@@ -23,6 +24,12 @@ temp_folder_path = os.path.join(tempfile.gettempdir(), 'unity_animation_player_p
 os.makedirs(temp_folder_path, exist_ok=True)
 
 
+def cache_file_path(path: str, suffix: str) -> str:
+    """缓存目录中与源文件 path 对应的文件路径，suffix 如 '.json'（绝对路径也会放在缓存目录下）"""
+    relative = os.path.splitdrive(path)[1].lstrip('\\/')
+    return os.path.join(temp_folder_path, relative.rsplit('.', 1)[0] + suffix)
+
+
 def _get_file_sha256(file_path):
     sha256_hash = hashlib.sha256()
     try:
@@ -54,7 +61,16 @@ def _load_cache_metadata(json_path):
 
 
 def load_yaml(path: str, cache=True):
-    json_path = os.path.join(temp_folder_path, path.rsplit('.', 1)[0] + '.json')
+    if tracing.ENABLED:
+        with tracing.span('load_yaml', 'load', path=path):
+            return _load_yaml(path, cache)
+    return _load_yaml(path, cache)
+
+
+def _load_yaml(path: str, cache=True):
+    json_path = cache_file_path(path, '.json')
+    # 计数器打开时按缓存命中 / 未命中分别计时，未命中时 yaml_load 单独记录 PyYAML 的解析耗时
+    start = profiling.clock() if profiling.ENABLED else 0
 
     source_sha256 = _get_file_sha256(path)
     if source_sha256 is None:
@@ -71,6 +87,8 @@ def load_yaml(path: str, cache=True):
             with open(json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             print(f"[DEBUG]Loaded cached data for: {path}")
+            if start:
+                profiling.record('cache_hit', profiling.clock() - start, path)
             return data
         else:
             # Cache is invalid
@@ -78,7 +96,8 @@ def load_yaml(path: str, cache=True):
             raise FileNotFoundError("Cache needs regeneration")
 
     except (FileNotFoundError, json.JSONDecodeError):
-        # regenerate
+        # regenerate（只有重新解析 .anim 时才需要 PyYAML）
+        import yaml
         with open(path, 'r', encoding='utf-8') as y:
             content = y.read()
             # 移除 %TAG 指令行
@@ -86,7 +105,10 @@ def load_yaml(path: str, cache=True):
             # 将 "--- !u!XX &YYY" 替换为 "--- &YYY"
             content = re.sub(r'^--- !u!\d+ (&?\S*)', r'--- \1', content, flags=re.MULTILINE)
 
+            parse_start = profiling.clock() if start else 0
             data = yaml.load(content, Loader=yaml.CLoader)
+            if parse_start:
+                profiling.record('yaml_load', profiling.clock() - parse_start, path)
 
         if cache:
             os.makedirs(os.path.dirname(json_path), exist_ok=True)
@@ -98,4 +120,7 @@ def load_yaml(path: str, cache=True):
             _save_cache_metadata(json_path, source_sha256)
             print(f"[DEBUG]Cached data regenerated for: {path}")
 
-        return json.loads(json.dumps(data))
\ No newline at end of file
+        data = json.loads(json.dumps(data))
+        if start:
+            profiling.record('cache_miss', profiling.clock() - start, path)
+        return data
\ No newline at end of file
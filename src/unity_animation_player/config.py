@@ -1,2 +1,41 @@
+import os
+
 USE_JIT = True
-FPS = 60
\ No newline at end of file
+# 导入时如何预编译 numba 插值器：'eager' 立即编译，'lazy' 第一次使用时编译，'background' 在后台线程中编译（见 jit_warmup.py）
+# 包导入前无法修改本文件中的值，可以用环境变量 UNITY_ANIMATION_PLAYER_JIT_WARMUP 指定
+JIT_WARMUP = os.environ.get('UNITY_ANIMATION_PLAYER_JIT_WARMUP', 'eager')
+# numba 内核的磁盘缓存目录，None 时使用 numba 的默认位置（源码旁的 __pycache__）；同样需要在导入前通过环境变量指定
+JIT_CACHE_DIR = os.environ.get('UNITY_ANIMATION_PLAYER_JIT_CACHE_DIR')
+FPS = 60
+# SignalAnimationPlayer 默认共用一个进程级 QTimer（见 shared_ticker.py），False 时每个播放器各自创建 QTimer
+SHARED_TICKER = True
+# True 时 SignalAnimationPlayer 在后台线程中求值，只把算好的帧排队交给 GUI 线程（见 worker_ticker.py）
+WORKER_THREAD = False
+# 工作线程的一个 tick 中，同一个 SamplingPlan 至少有这么多个不同采样时间时才改用 SamplingPlan.evaluate_many 批量求值
+# （批量求值在 *_many 内核中不持有 GIL，但每条曲线有固定的数组开销，时间太少时不如逐个求值）
+WORKER_BATCH_MIN = int(os.environ.get('UNITY_ANIMATION_PLAYER_WORKER_BATCH_MIN', 16))
+# 插值后端：'numba' / 'numpy' / 'python' / 'lut'，None 时自动选择（有 numba 时为 numba，否则为 numpy），见 backends.py
+# 可以用环境变量 UNITY_ANIMATION_PLAYER_BACKEND 指定，或在运行时调用 set_backend()
+BACKEND = os.environ.get('UNITY_ANIMATION_PLAYER_BACKEND') or None
+BACKEND_SOURCE = 'env' if BACKEND else 'auto'
+# lut 后端的查找表误差上限与多项式阶数（见 AnimationClip.with_lut）
+LUT_TOLERANCE = float(os.environ.get('UNITY_ANIMATION_PLAYER_LUT_TOLERANCE', 1e-4))
+LUT_ORDER = 1
+# 按阶段统计耗时的计数器（见 profiling.py），默认关闭；运行时用 set_profiling() 切换
+PROFILE = os.environ.get('UNITY_ANIMATION_PLAYER_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+# 给定文件路径时，导入后立即开始记录 Chrome trace 时间线并在进程退出时写入（见 tracing.py），None 表示不记录
+TRACE = os.environ.get('UNITY_ANIMATION_PLAYER_TRACE') or None
+
+
+def set_backend(name=None) -> None:
+    """
+    设置进程级的插值后端，之后加载的片段使用该后端（已加载的片段不受影响）
+
+    name: 'numba' / 'numpy' / 'python' / 'lut' 或 backends.register_backend 注册的名称，None 表示自动选择
+    """
+    global BACKEND, BACKEND_SOURCE
+    if name is not None:
+        from .backends import get_backend
+        get_backend(name)  # 名称未注册或不可用时抛出 ValueError
+    BACKEND = name
+    BACKEND_SOURCE = 'auto' if name is None else 'set_backend'
@@ -0,0 +1,221 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Hashable, Literal, Optional, Set, Tuple
+
+from . import tracing
+
+Overflow = Literal['block', 'drop']
+
+
+class InlineDispatcher:
+    """在 play_frame 内同步调用回调（默认行为）"""
+
+    policy = 'inline'
+
+    def submit(self, key: Hashable, function: Callable, args: Tuple) -> bool:
+        function(*args)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {'policy': self.policy}
+
+
+class _BoundedDispatcher:
+    """
+    有界异步分发器的公共部分：排队计数、背压与统计
+
+    maxsize: 同时排队（尚未执行完）的回调上限
+    overflow: 队列已满时的处理方式，'block' 阻塞调用方直到有空位，'drop' 丢弃新的回调
+    """
+
+    policy = ''
+
+    def __init__(self, maxsize: int = 1024, overflow: Overflow = 'block'):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if overflow not in ('block', 'drop'):
+            raise ValueError(f"overflow must be 'block' or 'drop', got {overflow!r}")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._cond = threading.Condition()
+        self._closed = False
+        self.pending = 0
+        self.max_pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+    def _can_block(self) -> bool:
+        return True
+
+    def _acquire(self) -> bool:
+        """占用一个排队名额；返回 False 表示回调被丢弃（调用方需持有 _cond）"""
+        if self._closed:
+            raise RuntimeError(f"{type(self).__name__} is closed")
+        if self.pending >= self.maxsize:
+            if self.overflow == 'drop' or not self._can_block():
+                self.dropped += 1
+                return False
+            self.blocked += 1
+            self._cond.wait_for(lambda: self.pending < self.maxsize or self._closed)
+            if self._closed:
+                raise RuntimeError(f"{type(self).__name__} is closed")
+        self.pending += 1
+        self.submitted += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        return True
+
+    def _release(self) -> None:
+        """撤销一次 _acquire（回调没能交给执行方时），唤醒等待名额或 flush 的线程"""
+        with self._cond:
+            self.pending -= 1
+            self.submitted -= 1
+            self._cond.notify_all()
+
+    def _run(self, function: Callable, args: Tuple) -> None:
+        start = tracing.clock() if tracing.ENABLED else 0
+        try:
+            function(*args)
+        except Exception as e:
+            with self._cond:
+                self.errors += 1
+                self.last_error = e
+            print(f"[Warning]Event handler {getattr(function, '__name__', function)!r} failed: {e!r}")
+        finally:
+            if start:
+                tracing.complete(getattr(function, '__name__', 'handler'), 'event', start, tracing.clock(),
+                                 {'dispatcher': self.policy})
+            with self._cond:
+                self.pending -= 1
+                self.completed += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已提交的回调执行完毕，超时返回 False"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.pending == 0, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'policy': self.policy,
+                'pending': self.pending,
+                'max_pending': self.max_pending,
+                'maxsize': self.maxsize,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'dropped': self.dropped,
+                'blocked': self.blocked,
+                'errors': self.errors,
+            }
+
+
+class ThreadPoolDispatcher(_BoundedDispatcher):
+    """
+    由线程池执行回调
+
+    同一个 key（每个播放器的 AnimationEvents）的回调串行、按提交顺序执行，
+    不同播放器之间并行，因此慢回调不会阻塞动画帧，也不会打乱单个播放器的事件顺序。
+    """
+
+    policy = 'thread'
+
+    def __init__(self, max_workers: int = 2, maxsize: int = 1024, overflow: Overflow = 'block'):
+        super().__init__(maxsize, overflow)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='AnimationEvents')
+        self._queues: Dict[Hashable, Deque[Tuple[Callable, Tuple]]] = {}
+        self._running: Set[Hashable] = set()
+
+    def submit(self, key: Hashable, function: Callable, args: Tuple) -> bool:
+        with self._cond:
+            if not self._acquire():
+                return False
+            self._queues.setdefault(key, deque()).append((function, args))
+            schedule = key not in self._running
+            if schedule:
+                self._running.add(key)
+        if schedule:
+            self._executor.submit(self._drain, key)
+        return True
+
+    def _drain(self, key: Hashable) -> None:
+        while True:
+            with self._cond:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    self._running.discard(key)
+                    return
+                function, args = queue.popleft()
+            self._run(function, args)
+
+    def close(self, wait: bool = True) -> None:
+        """停止接收新回调；wait 为 True 时等待已排队的回调执行完"""
+        if wait:
+            self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._executor.shutdown(wait=wait)
+
+
+class AsyncioDispatcher(_BoundedDispatcher):
+    """
+    通过 loop.call_soon_threadsafe 把回调交给 asyncio 事件循环执行
+
+    事件循环按提交顺序执行回调，因此单个播放器的事件保持有序。
+    在事件循环所在线程中提交时不能阻塞等待（否则死锁），队列满时总是丢弃。
+    事件循环已关闭时 submit 抛出 RuntimeError，占用的名额会先归还，flush 不会因此一直等待。
+    """
+
+    policy = 'asyncio'
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, maxsize: int = 1024,
+                 overflow: Overflow = 'block'):
+        """loop: 目标事件循环，默认为当前正在运行的事件循环"""
+        super().__init__(maxsize, overflow)
+        self.loop = loop if loop is not None else asyncio.get_running_loop()
+
+    def _can_block(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is not self.loop
+        except RuntimeError:
+            return True
+
+    def submit(self, key: Hashable, function: Callable, args: Tuple) -> bool:
+        with self._cond:
+            if not self._acquire():
+                return False
+        try:
+            self.loop.call_soon_threadsafe(self._run, function, args)
+        except RuntimeError:
+            self._release()
+            raise
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def make_dispatcher(policy: Literal['inline', 'thread', 'asyncio'] = 'inline', **options: Any):
+    """按策略名创建分发器，options 传给对应的构造函数"""
+    if policy == 'inline':
+        return InlineDispatcher()
+    if policy == 'thread':
+        return ThreadPoolDispatcher(**options)
+    if policy == 'asyncio':
+        return AsyncioDispatcher(**options)
+    raise ValueError(f"Unknown dispatch policy: {policy!r}")
@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from .sampling_plan import SamplingPlan
+
+
+class FrameMemo:
+    """
+    按 (plan, 量化时间) 缓存帧值的有界 LRU
+
+    同一个 AnimationClip 的所有播放器共享一个 FrameMemo，默认关闭。启用后，
+    时间 t 先量化为 round(t / quantum)，同一量化时间、同一 SamplingPlan 的帧只计算一次，
+    并且总是在量化后的时间点上求值，因此结果与调用顺序无关。
+    """
+
+    __slots__ = ('enabled', 'maxsize', 'quantum', 'hits', 'misses', '_cache', '_lock')
+
+    def __init__(self, maxsize: int = 256, quantum: float = 1e-4):
+        self.enabled = False
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[Tuple[SamplingPlan, int], Tuple[float, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, maxsize: int = None, quantum: float = None) -> None:
+        with self._lock:
+            if maxsize is not None:
+                if maxsize <= 0:
+                    raise ValueError(f"maxsize must be positive, got {maxsize}")
+                self.maxsize = maxsize
+            if quantum is not None:
+                if quantum <= 0:
+                    raise ValueError(f"quantum must be positive, got {quantum}")
+                self.quantum = quantum
+            self.enabled = enabled
+            self._cache.clear()
+
+    def lookup(self, plan: SamplingPlan, t: float) -> Tuple[float, ...]:
+        """返回 plan 在量化时间上的帧值，未命中时计算并写入缓存"""
+        step = round(t / self.quantum)
+        key = (plan, step)
+        with self._lock:
+            values = self._cache.get(key)
+            if values is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return values
+            self.misses += 1
+
+        values = plan.evaluate(step * self.quantum)
+
+        with self._lock:
+            self._cache[key] = values
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return values
+
+    def clear(self) -> None:
+        """清空缓存与计数器"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._cache),
+                'maxsize': self.maxsize,
+                'quantum': self.quantum,
+            }
@@ -0,0 +1,79 @@
+"""
+检查导入耗时预算（可在 CI 中运行，超出预算时退出码为 1）
+
+    python -m unity_animation_player.import_budget [--scale 2.0]
+
+每一项在新的解释器中以 python -X importtime 执行一条导入语句，统计该语句额外导入的模块耗时
+（减去空解释器启动时已经导入的模块），并检查不应加载的重量级依赖是否被导入。
+机器较慢时可以用 --scale 按比例放宽时间预算；禁止导入的模块不受影响。
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_HEAVY = ('numpy', 'numba', 'yaml', 'qtpy', 'PySide6')
+
+# (导入语句, 预算毫秒, 不应导入的顶层模块)
+IMPORT_BUDGETS: Tuple[Tuple[str, float, Tuple[str, ...]], ...] = (
+    ("import unity_animation_player", 50.0, _HEAVY),
+    ("from unity_animation_player import type_kwargs", 50.0, _HEAVY),
+    ("from unity_animation_player import AnimationEvents, EventTimeline", 250.0,
+     ('numba', 'yaml', 'qtpy', 'PySide6')),
+)
+
+
+def _importtime(statement: str) -> Dict[str, int]:
+    """在新的解释器中执行 statement，返回 {顶层导入的模块名: 累计耗时（微秒）}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit() and not name.startswith('  '):  # 只统计顶层导入，嵌套导入已计入其中
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def measure(statement: str, baseline: Optional[Dict[str, int]] = None) -> Tuple[float, List[str]]:
+    """
+    返回 (statement 额外导入的耗时（毫秒）, 新导入的所有模块名)
+
+    baseline: 空解释器的导入记录，默认现场测量
+    """
+    baseline = _importtime('pass') if baseline is None else baseline
+    modules = _importtime(statement)
+    added = {name: us for name, us in modules.items() if name not in baseline}
+    return sum(added.values()) / 1000, sorted(added)
+
+
+def _loaded(statement: str) -> List[str]:
+    """statement 执行后 sys.modules 中的所有顶层模块"""
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sorted({{m.partition('.')[0] for m in sys.modules}})))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every time budget by this factor')
+    args = parser.parse_args(argv)
+
+    baseline = _importtime('pass')
+    failed = False
+    for statement, budget_ms, forbidden in IMPORT_BUDGETS:
+        budget_ms *= args.scale
+        # 取多次测量的最小值，减少磁盘缓存与调度带来的噪声
+        elapsed_ms = min(measure(statement, baseline)[0] for _ in range(3))
+        heavy = sorted(set(forbidden) & set(_loaded(statement)))
+        ok = elapsed_ms <= budget_ms and not heavy
+        failed |= not ok
+        print(f"[{'OK' if ok else 'FAIL'}] {statement}: {elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)"
+              + (f", imported {', '.join(heavy)}" if heavy else ""))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
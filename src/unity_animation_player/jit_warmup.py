@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import Any, Dict, Literal, Optional
+
+from . import config, tracing
+
+WarmupPolicy = Literal['eager', 'lazy', 'background']
+WARMUP_POLICIES = ('eager', 'lazy', 'background')
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_state = 'cold'  # cold / compiling / ready / disabled / failed
+_policy: Optional[str] = None
+_seconds: Optional[float] = None
+_error: Optional[BaseException] = None
+
+
+def _numba_available() -> bool:
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _jit_used() -> bool:
+    """进程级后端（见 backends.py）是否使用 numba 内核；numpy / python 后端不需要预编译"""
+    if not config.USE_JIT or not _numba_available():
+        return False
+    from .backends import get_backend
+    backend = get_backend()
+    return backend.uses_numba or backend.lut
+
+
+def compile_kernels() -> None:
+    """以播放时使用的参数类型调用一次所有 numba 内核，触发编译（启用磁盘缓存时从缓存加载）"""
+    import numpy as np
+    from .numba_optimized import (RationalBezierInterpolation, SphericalLinearInterpolation,
+                                  EulerSphericalLinearInterpolation, rational_bezier_params,
+                                  rational_bezier_evaluate_many, slerp_evaluate_many, axis_angle_evaluate_many,
+                                  euler_to_quaternion_many, quaternion_to_euler_many,
+                                  binary_search_segment_index, segment_index_many, lookup_table_evaluate,
+                                  lookup_table_evaluate_scalar, lookup_table_evaluate3, lookup_table_evaluate4,
+                                  lookup_table_evaluate_many)
+    ts = np.linspace(0.0, 1.0, 4)
+    RationalBezierInterpolation(0, 1, 0, 1, 0, 0, 1, 1, 1, 1, backend='numba')(0.5)
+    SphericalLinearInterpolation(0, 1, 0, 1, 0, 0, 1, 1, 0, 1, backend='numba')(0.5)
+    SphericalLinearInterpolation(0, 0, 0, 1, 0, 0, 0, -1, backend='numba')(0.5)  # 轴角模式
+    EulerSphericalLinearInterpolation(0, 1, 0, 1, 0, 0, 0, 1, backend='numba')(0.5)
+    rational_bezier_evaluate_many(rational_bezier_params(0, 1, 0, 1, 0, 0), ts)
+    slerp_evaluate_many(np.array([0, 0, 0, 1, 0, 0, 1, 0, 0, 1], dtype=np.float64), ts)
+    axis_angle_evaluate_many(np.array([0, 0, 1, 0, 360, 0, 1], dtype=np.float64), ts)
+    quaternion_to_euler_many(euler_to_quaternion_many(np.zeros((2, 3))))
+    EulerSphericalLinearInterpolation(0, 0, 0, 0, 0, 360, 0, 1, backend='numba').many(ts)
+    binary_search_segment_index(ts, 0.5)
+    segment_index_many(ts, ts)
+    lookup_table_evaluate(ts, np.zeros((3, 2, 1)), 0.5)
+    lookup_table_evaluate_scalar(ts, np.zeros((3, 2, 1)), 0.5)
+    lookup_table_evaluate3(ts, np.zeros((3, 2, 3)), 0.5)
+    lookup_table_evaluate4(ts, np.zeros((3, 2, 4)), 0.5)
+    lookup_table_evaluate_many(ts, np.zeros((3, 2, 1)), ts)
+
+
+def _compile() -> None:
+    """编译所有内核并更新状态"""
+    global _state, _seconds, _error
+    start = time.perf_counter()
+    try:
+        with tracing.span('jit_warmup', 'jit', policy=_policy):
+            compile_kernels()
+    except Exception as e:
+        _state, _error = 'failed', e
+        print(f"[Warning]JIT warm-up failed: {e!r}")
+    else:
+        _state = 'ready'
+    finally:
+        _seconds = time.perf_counter() - start
+        _ready.set()
+
+
+def warm_up(policy: Optional[WarmupPolicy] = None) -> None:
+    """
+    按策略预编译插值器（第一次导入 numba_optimized 时以 config.JIT_WARMUP 调用一次）
+
+    eager: 立即在当前线程编译（导入变慢，之后首帧无卡顿）
+    lazy: 不预编译，每种插值器在第一次使用时由 numba 编译
+    background: 在后台线程中编译，需要时用 wait_ready() 等待
+    """
+    global _state, _policy, _thread
+    policy = config.JIT_WARMUP if policy is None else policy
+    if policy not in WARMUP_POLICIES:
+        raise ValueError(f"JIT warm-up policy must be one of {WARMUP_POLICIES}, got {policy!r}")
+    with _lock:
+        _policy = policy
+        if not _jit_used():
+            _state = 'disabled'
+            _ready.set()
+            return
+        if _state != 'cold' or policy == 'lazy':
+            return
+        _state = 'compiling'
+        if policy == 'background':
+            _thread = threading.Thread(target=_compile, name='JitWarmup', daemon=True)
+            _thread.start()
+            return
+    _compile()
+
+
+def wait_ready(timeout: Optional[float] = None) -> bool:
+    """
+    等待预编译完成，超时返回 False
+
+    lazy 策略下尚未编译时在当前线程立即编译；未启用 JIT 时直接返回 True
+    """
+    global _state
+    with _lock:
+        compile_now = _state == 'cold'
+        if compile_now:
+            if not _jit_used():
+                _state = 'disabled'
+                _ready.set()
+                return True
+            _state = 'compiling'
+    if compile_now:
+        _compile()
+    return _ready.wait(timeout)
+
+
+def jit_status() -> Dict[str, Any]:
+    """
+    预编译状态
+
+    policy: 使用的策略；state: cold（尚未编译）/ compiling / ready / disabled（未启用 JIT、没有 numba 或后端不使用 numba）/ failed；
+    seconds: 编译耗时
+    """
+    return {
+        'use_jit': config.USE_JIT,
+        'numba': _numba_available(),
+        'policy': _policy,
+        'state': _state,
+        'ready': _ready.is_set(),
+        'seconds': _seconds,
+        'error': _error,
+    }
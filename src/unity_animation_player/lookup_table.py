@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .numba_optimized.lookup_table import (lookup_table_evaluate, lookup_table_evaluate_scalar,
+                                           lookup_table_evaluate3, lookup_table_evaluate4,
+                                           lookup_table_evaluate_many)
+
+# 每段用于估计误差的内部检查点数；满足容差的段再用 _VERIFY_POINTS 个点复核
+_CHECK_POINTS = 8
+_VERIFY_POINTS = 32
+# 最大二分深度，防止在不连续处（如欧拉角 ±180° 跳变）无限细分
+_MAX_DEPTH = 24
+
+
+def _evaluate_tuple(breaks: np.ndarray, coeffs: np.ndarray, t: float) -> tuple:
+    return tuple(lookup_table_evaluate(breaks, coeffs, t).tolist())
+
+
+class LookupTableSegment:
+    """
+    用分段线性 / 二次多项式近似一个曲线段，接口与 MixedSegment 相同
+
+    单点求值按分量数选用直接返回 float / 元组的内核，不分配数组；一组时间用 evaluate_many 一次算完。
+    内核使用构造时传入的数组本身（numba 对只读数组的参数类型检查明显更慢），对外只暴露它们的只读视图。
+
+    属性:
+        breaks, coeffs: 见 lookup_table_evaluate（只读视图）
+        order: 1 为分段线性，2 为分段二次
+        vector: 原曲线段是否返回元组（旋转、欧拉角）
+        estimated_error: 误差估计，即拟合时在每个小段的内部检查点（_CHECK_POINTS 与 _VERIFY_POINTS 个）上测得的最大绝对误差；
+                         不是严格上界，检查点之间的真实误差可能略大
+                         （段内存在跳变时，例如欧拉角的 ±180° 翻转，会细分到 2^-24 段长并反映在此）
+    """
+
+    __slots__ = ('x', 'x_interval', 'breaks', 'coeffs', 'order', 'vector', 'estimated_error',
+                 '_breaks', '_coeffs', '_evaluate')
+
+    def __init__(self, x_start: float, x_end: float, breaks: np.ndarray, coeffs: np.ndarray,
+                 order: int, vector: bool, estimated_error: float):
+        self.x = np.array([x_start, x_end], dtype=float)
+        self.x_interval = (x_start, x_end)
+        self._breaks = breaks
+        self._coeffs = coeffs
+        self.breaks = breaks.view()
+        self.coeffs = coeffs.view()
+        self.breaks.flags.writeable = False
+        self.coeffs.flags.writeable = False
+        self.order = order
+        self.vector = vector
+        self.estimated_error = estimated_error
+        width = coeffs.shape[2]
+        if not vector:
+            self._evaluate = lookup_table_evaluate_scalar
+        elif width == 3:
+            self._evaluate = lookup_table_evaluate3
+        elif width == 4:
+            self._evaluate = lookup_table_evaluate4
+        else:
+            self._evaluate = _evaluate_tuple
+
+    def __call__(self, x: float) -> Any:
+        return self._evaluate(self._breaks, self._coeffs, x)
+
+    def evaluate_many(self, xs: np.ndarray) -> np.ndarray:
+        """按一组时间求值，返回形状 (n,)（标量）或 (n, k)（元组）的数组，与逐点调用的结果相同"""
+        out = lookup_table_evaluate_many(self._breaks, self._coeffs, np.asarray(xs, dtype=np.float64).reshape(-1))
+        return out if self.vector else out[:, 0]
+
+    def covers(self, x):
+        a, b = self.x_interval
+        return (x >= a) & (x <= b)
+
+    @property
+    def n_pieces(self) -> int:
+        return len(self.breaks) - 1
+
+
+def _sample(func: Callable, t: float) -> np.ndarray:
+    return np.atleast_1d(np.asarray(func(t), dtype=np.float64))
+
+
+def _fit_piece(func: Callable, a: float, b: float, order: int) -> np.ndarray:
+    """用端点（二次时再加中点）的精确值确定一段多项式系数，形状 (order+1, k)"""
+    y0 = _sample(func, a)
+    y1 = _sample(func, b)
+    if order == 1:
+        return np.stack((y0, y1 - y0))
+    ym = _sample(func, 0.5 * (a + b))
+    c2 = 2.0 * (y1 - 2.0 * ym + y0)
+    return np.stack((y0, y1 - y0 - c2, c2))
+
+
+def _piece_error(func: Callable, coeffs: np.ndarray, a: float, b: float, n_points: int) -> float:
+    """在 n_points 个内部点上比较近似值与精确值，返回最大绝对误差"""
+    error = 0.0
+    for j in range(n_points):
+        u = (2 * j + 1) / (2.0 * n_points)
+        approx = coeffs[-1]
+        for c in coeffs[-2::-1]:
+            approx = approx * u + c
+        exact = _sample(func, a + (b - a) * u)
+        error = max(error, float(np.max(np.abs(approx - exact))))
+    return error
+
+
+def fit_lookup_table(func: Callable, x_start: float, x_end: float,
+                     tolerance: float, order: int = 1) -> LookupTableSegment:
+    """
+    在 [x_start, x_end] 上自适应地二分，直到每段在检查点上的误差不超过 tolerance
+
+    误差只在检查点上测量，结果的 estimated_error 是估计值而不是严格上界
+
+    参数:
+        func: 精确的曲线段（返回标量或元组）
+        tolerance: 允许的最大绝对误差
+        order: 1 为分段线性，2 为分段二次
+    """
+    if order not in (1, 2):
+        raise ValueError(f"order must be 1 or 2, got {order}")
+    if tolerance <= 0:
+        raise ValueError(f"tolerance must be positive, got {tolerance}")
+
+    vector = isinstance(func(x_start), tuple)
+    pieces: List[Tuple[float, np.ndarray, float]] = []
+    pending = [(float(x_start), float(x_end), 0)]
+    while pending:
+        a, b, depth = pending.pop()
+        coeffs = _fit_piece(func, a, b, order)
+        error = _piece_error(func, coeffs, a, b, _CHECK_POINTS) if b > a else 0.0
+        if error <= tolerance and b > a:
+            error = max(error, _piece_error(func, coeffs, a, b, _VERIFY_POINTS))
+        if error > tolerance and depth < _MAX_DEPTH:
+            m = 0.5 * (a + b)
+            pending.append((m, b, depth + 1))
+            pending.append((a, m, depth + 1))
+        else:
+            pieces.append((a, coeffs, error))
+
+    breaks = np.array([piece[0] for piece in pieces] + [float(x_end)], dtype=np.float64)
+    coeffs = np.ascontiguousarray(np.stack([piece[1] for piece in pieces]))
+    estimated_error = max(piece[2] for piece in pieces)
+    return LookupTableSegment(x_start, x_end, breaks, coeffs, order, vector, estimated_error)
+
+
+def _lut_segments(segments, tolerance: float, order: int) -> Tuple[List[LookupTableSegment], float]:
+    lut = [fit_lookup_table(segment, segment.x_interval[0], segment.x_interval[1], tolerance, order)
+           for segment in segments]
+    return lut, max((segment.estimated_error for segment in lut), default=0.0)
+
+
+def build_lookup_tables(anim: Mapping[str, Any], tolerance: float,
+                        order: int = 1) -> Tuple[Dict[str, Any], Dict[Tuple[str, str, Optional[str]], float]]:
+    """
+    把片段中所有曲线替换为查找表
+
+    返回:
+        (新的 anim 字典, {(path, curve_type, component): 最大误差})，标量曲线的 component 为 None
+    """
+    new_anim: Dict[str, Any] = {}
+    errors: Dict[Tuple[str, str, Optional[str]], float] = {}
+    for path, curves in anim.items():
+        new_curves = {}
+        for kind, (segments, time_nodes) in curves.items():
+            if isinstance(segments, Mapping):
+                components = {}
+                for comp, comp_segments in segments.items():
+                    components[comp], errors[(path, kind, comp)] = _lut_segments(comp_segments, tolerance, order)
+                new_curves[kind] = (components, time_nodes)
+            else:
+                lut, errors[(path, kind, None)] = _lut_segments(segments, tolerance, order)
+                new_curves[kind] = (lut, time_nodes)
+        new_anim[path] = new_curves
+    return new_anim, errors
@@ -1,10 +1,37 @@
-from .binary_search import binary_search_segment_index
-from .rational_bezier_interpolator import RationalBezierInterpolation
-from .spherical_linear_interpolator import SphericalLinearInterpolation, EulerSphericalLinearInterpolation
+from ._jit import JIT_ENABLED
+from .binary_search import binary_search_segment_index, segment_index_many
+from .rational_bezier_interpolator import (RationalBezierInterpolation, rational_bezier_params,
+                                           rational_bezier_evaluate, rational_bezier_evaluate_many)
+from .spherical_linear_interpolator import (SphericalLinearInterpolation, EulerSphericalLinearInterpolation,
+                                            slerp_evaluate, slerp_evaluate_many,
+                                            axis_angle_evaluate, axis_angle_evaluate_many,
+                                            euler_to_quaternion_many, quaternion_to_euler_many)
+from .lookup_table import (lookup_table_evaluate, lookup_table_evaluate_scalar, lookup_table_evaluate3,
+                           lookup_table_evaluate4, lookup_table_evaluate_many)
+from ..jit_warmup import warm_up
+
+# 第一次用到插值器时按 config.JIT_WARMUP 预编译（导入顶层包本身不会加载 numba）
+warm_up()
 
 __all__ = [
+    "JIT_ENABLED",
     "binary_search_segment_index",
+    "segment_index_many",
     "RationalBezierInterpolation",
+    "rational_bezier_params",
+    "rational_bezier_evaluate",
+    "rational_bezier_evaluate_many",
     "SphericalLinearInterpolation",
     "EulerSphericalLinearInterpolation",
+    "slerp_evaluate",
+    "slerp_evaluate_many",
+    "axis_angle_evaluate",
+    "axis_angle_evaluate_many",
+    "euler_to_quaternion_many",
+    "quaternion_to_euler_many",
+    "lookup_table_evaluate",
+    "lookup_table_evaluate_scalar",
+    "lookup_table_evaluate3",
+    "lookup_table_evaluate4",
+    "lookup_table_evaluate_many",
 ]
@@ -0,0 +1,23 @@
+from ..config import USE_JIT, JIT_CACHE_DIR
+
+# numba 可用且 config.USE_JIT 为 True 时为 True；否则 njit 为不做任何事的装饰器，内核以普通 Python 函数存在
+JIT_ENABLED = False
+if USE_JIT:
+    try:
+        from numba import njit
+        JIT_ENABLED = True
+    except ImportError:
+        pass
+
+if JIT_ENABLED and JIT_CACHE_DIR:
+    # numba 在装饰时确定缓存目录，必须在定义任何内核之前设置
+    from numba.core import config as _numba_config
+    _numba_config.CACHE_DIR = JIT_CACHE_DIR
+
+if not JIT_ENABLED:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        def decorator(f):
+            return f
+        return decorator
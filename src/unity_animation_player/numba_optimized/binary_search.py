@@ -1,13 +1,6 @@
 import numpy as np
-from ..config import USE_JIT
 
-if USE_JIT:
-    try:
-        from numba import njit, float64, int64
-    except ImportError:
-        njit = lambda *args, **kwargs: lambda f: f
-else:
-    njit = lambda *args, **kwargs: lambda f: f
+from ._jit import JIT_ENABLED, njit
 
 
 @njit(cache=True)
@@ -53,4 +46,18 @@ def binary_search_segment_index(time_nodes: np.array, t: float) -> int:
     elif idx >= n - 1:
         return n - 2
     else:
-        return idx
\ No newline at end of file
+        return idx
+
+
+@njit(cache=True, nogil=True)
+def segment_index_many(time_nodes: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """对一组时间调用 binary_search_segment_index，返回 int64 数组"""
+    out = np.empty(len(ts), dtype=np.int64)
+    for i in range(len(ts)):
+        out[i] = binary_search_segment_index(time_nodes, ts[i])
+    return out
+
+
+if not JIT_ENABLED:
+    # 没有 numba 时使用 bisect / np.searchsorted 实现（见 numpy_backend.py）
+    from ..numpy_backend import binary_search_segment_index, segment_index_many
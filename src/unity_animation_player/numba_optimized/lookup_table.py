@@ -0,0 +1,102 @@
+from typing import Tuple
+
+import numpy as np
+
+from ._jit import JIT_ENABLED, njit
+
+
+@njit(cache=True)
+def _lookup_table_locate(breaks: np.ndarray, t: float) -> Tuple[int, float]:
+    """返回 t 所在段的下标与段内局部参数 u ∈ [0, 1]，超出范围时取端点"""
+    n = len(breaks) - 1
+    i = np.searchsorted(breaks, t, side='right') - 1
+    if i < 0:
+        i = 0
+    elif i > n - 1:
+        i = n - 1
+
+    a = breaks[i]
+    b = breaks[i + 1]
+    u = (t - a) / (b - a) if b > a else 0.0
+    if u < 0.0:
+        u = 0.0
+    elif u > 1.0:
+        u = 1.0
+    return i, u
+
+
+@njit(cache=True)
+def _lookup_table_horner(coeffs: np.ndarray, i: int, u: float, j: int) -> float:
+    """第 i 段第 j 个分量在 u 处的值"""
+    order = coeffs.shape[1] - 1
+    value = coeffs[i, order, j]
+    for m in range(order - 1, -1, -1):
+        value = value * u + coeffs[i, m, j]
+    return value
+
+
+@njit(cache=True)
+def lookup_table_evaluate(breaks: np.ndarray, coeffs: np.ndarray, t: float) -> np.ndarray:
+    """
+    分段多项式查找表求值
+
+    参数:
+        breaks: 分段边界，形状 (p+1,)，已排序
+        coeffs: 每段的多项式系数，形状 (p, order+1, k)，
+                第 i 段在局部参数 u = (t - breaks[i]) / (breaks[i+1] - breaks[i]) 上
+                y(u) = coeffs[i, 0] + coeffs[i, 1] * u + coeffs[i, 2] * u^2 ...
+        t: 查询时间，超出 [breaks[0], breaks[-1]] 时取端点值
+
+    返回:
+        形状 (k,) 的数组
+    """
+    i, u = _lookup_table_locate(breaks, t)
+    k = coeffs.shape[2]
+    out = np.empty(k)
+    for j in range(k):
+        out[j] = _lookup_table_horner(coeffs, i, u, j)
+    return out
+
+
+@njit(cache=True)
+def lookup_table_evaluate_scalar(breaks: np.ndarray, coeffs: np.ndarray, t: float) -> float:
+    """k == 1 的 lookup_table_evaluate，直接返回 float，不分配数组"""
+    i, u = _lookup_table_locate(breaks, t)
+    return _lookup_table_horner(coeffs, i, u, 0)
+
+
+@njit(cache=True)
+def lookup_table_evaluate3(breaks: np.ndarray, coeffs: np.ndarray, t: float) -> Tuple[float, float, float]:
+    """k == 3（欧拉角）的 lookup_table_evaluate，返回元组"""
+    i, u = _lookup_table_locate(breaks, t)
+    return (_lookup_table_horner(coeffs, i, u, 0), _lookup_table_horner(coeffs, i, u, 1),
+            _lookup_table_horner(coeffs, i, u, 2))
+
+
+@njit(cache=True)
+def lookup_table_evaluate4(breaks: np.ndarray, coeffs: np.ndarray, t: float) -> Tuple[float, float, float, float]:
+    """k == 4（四元数）的 lookup_table_evaluate，返回元组"""
+    i, u = _lookup_table_locate(breaks, t)
+    return (_lookup_table_horner(coeffs, i, u, 0), _lookup_table_horner(coeffs, i, u, 1),
+            _lookup_table_horner(coeffs, i, u, 2), _lookup_table_horner(coeffs, i, u, 3))
+
+
+@njit(cache=True, nogil=True)
+def lookup_table_evaluate_many(breaks: np.ndarray, coeffs: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """
+    按一组时间求值，返回形状 (n, k) 的数组
+
+    与逐点调用 lookup_table_evaluate 的结果相同
+    """
+    k = coeffs.shape[2]
+    out = np.empty((len(ts), k))
+    for n in range(len(ts)):
+        i, u = _lookup_table_locate(breaks, ts[n])
+        for j in range(k):
+            out[n, j] = _lookup_table_horner(coeffs, i, u, j)
+    return out
+
+
+if not JIT_ENABLED:
+    # 没有 numba 时一组时间改用 NumPy 数组运算（见 numpy_backend.py）
+    from ..numpy_backend import lookup_table_evaluate_many
@@ -1,33 +1,12 @@
-from ..config import USE_JIT
 import numpy as np
 
-if USE_JIT:
-    try:
-        from numba import njit, float64
-        from numba.experimental import jitclass
-    except:
-        def njit(*args, **kwargs):
-            if len(args) == 1 and callable(args[0]) and not kwargs:
-                return args[0]
-            def decorator(f):
-                return f
-            return decorator
-        jitclass = lambda spec: lambda cls: cls
-        float64 = float
-else:
-    def njit(*args, **kwargs):
-        if len(args) == 1 and callable(args[0]) and not kwargs:
-            return args[0]
-        def decorator(f):
-            return f
-        return decorator
-    jitclass = lambda spec: lambda cls: cls
-    float64 = float
+from ._jit import JIT_ENABLED, njit
+from ..backends import BackendLike, get_backend
 
 
 # ==================== 工具函数 ====================
 
-@njit
+@njit(cache=True)
 def _clamp(value: float, min_val: float, max_val: float) -> float:
     """限制值在指定范围内"""
     if value < min_val:
@@ -37,7 +16,7 @@ def _clamp(value: float, min_val: float, max_val: float) -> float:
     return value
 
 
-@njit
+@njit(cache=True)
 def _axis_angle_to_quaternion(axis_x: float, axis_y: float, axis_z: float, angle_deg: float) -> tuple:
     """
     轴角（度）转四元数
@@ -68,7 +47,7 @@ def _axis_angle_to_quaternion(axis_x: float, axis_y: float, axis_z: float, angle
     return (x, y, z, w)
 
 
-@njit
+@njit(cache=True)
 def _quaternion_to_axis_angle(x: float, y: float, z: float, w: float) -> tuple:
     """
     四元数转轴角（度）
@@ -106,7 +85,7 @@ def _quaternion_to_axis_angle(x: float, y: float, z: float, w: float) -> tuple:
     return (axis_x, axis_y, axis_z, angle_deg)
 
 
-@njit
+@njit(cache=True)
 def _euler_to_quaternion(euler_x: float, euler_y: float, euler_z: float) -> tuple:
     """
     将欧拉角（度）转换为四元数
@@ -138,7 +117,7 @@ def _euler_to_quaternion(euler_x: float, euler_y: float, euler_z: float) -> tupl
     return (x, y, z, w)
 
 
-@njit
+@njit(cache=True)
 def _quaternion_to_euler(x: float, y: float, z: float, w: float) -> tuple:
     """
     将四元数转换为欧拉角（度）
@@ -179,13 +158,13 @@ def _quaternion_to_euler(x: float, y: float, z: float, w: float) -> tuple:
     return (euler_x, euler_y, euler_z)
 
 
-@njit
+@njit(cache=True)
 def _normalize_angle(angle: float) -> float:
     """将角度规范化到 [-180, 180] 范围"""
     return np.mod(angle + 180.0, 360.0) - 180.0
 
 
-@njit
+@njit(cache=True)
 def _detect_full_rotation(x0: float, y0: float, z0: float, w0: float,
                           x1: float, y1: float, z1: float, w1: float) -> bool:
     """
@@ -209,198 +188,182 @@ def _detect_full_rotation(x0: float, y0: float, z0: float, w0: float,
 
 # ==================== 四元数 SLERP 插值器 ====================
 
-# 定义 SLERP 类的字段类型规范
-spec_quaternion_slerp = [
-    ('x0', float64),
-    ('y0', float64),
-    ('z0', float64),
-    ('w0', float64),
-    ('x1', float64),
-    ('y1', float64),
-    ('z1', float64),
-    ('w1', float64),
-    ('t0', float64),
-    ('t1', float64),
-]
-
-# 定义轴角插值器的字段类型规范
-spec_axis_angle = [
-    ('axis_x', float64),
-    ('axis_y', float64),
-    ('axis_z', float64),
-    ('angle_start', float64),
-    ('angle_total', float64),
-    ('t0', float64),
-    ('t1', float64),
-]
-
-
-@jitclass(spec_quaternion_slerp)
-class _SphericalLinearInterpolator:
+# 参数数组的布局：
+# slerp_evaluate:      [x0, y0, z0, w0, x1, y1, z1, w1, t0, t1]
+# axis_angle_evaluate: [axis_x, axis_y, axis_z, angle_start, angle_total, t0, t1]
+
+
+@njit(cache=True)
+def slerp_evaluate(params: np.ndarray, t: float) -> tuple:
     """
-    球面线性插值器核心（Numba JIT 编译版本）
-    
-    用于在两个四元数之间进行球面线性插值（SLERP）。
-    这是一个内部类，外部使用 SphericalLinearInterpolation 工厂函数
+    计算给定 t 值对应的插值四元数（SLERP），可缓存到磁盘的 numba 内核
+
+    球面线性插值公式：
+    q(t) = q0 * sin((1-t)*θ) / sin(θ) + q1 * sin(t*θ) / sin(θ)
+
+    参数:
+        params: [x0, y0, z0, w0, x1, y1, z1, w1, t0, t1]
+        t: 可以是归一化参数 [0, 1] 或实际时间值（t0 != t1 时自动归一化）
+
+    返回:
+        (x, y, z, w) 四元数分量
     """
-    
-    def __init__(self, x0: float, y0: float, z0: float, w0: float,
-                 x1: float, y1: float, z1: float, w1: float,
-                 t0: float = 0.0, t1: float = 1.0):
-        # 保存起始和结束四元数
-        self.x0 = x0
-        self.y0 = y0
-        self.z0 = z0
-        self.w0 = w0
-        self.x1 = x1
-        self.y1 = y1
-        self.z1 = z1
-        self.w1 = w1
-        # 保存时间范围，支持自动归一化
-        self.t0 = t0
-        self.t1 = t1
-    
-    def evaluate(self, t: float) -> tuple:
-        """
-        计算给定 t 值对应的插值四元数
-        
-        参数:
-            t: 可以是归一化参数 [0, 1] 或实际时间值（如果设置了 t0, t1）
-        
-        返回:
-            (x, y, z, w) 四元数分量
-        """
-        # 如果设置了时间范围，自动归一化
-        if self.t1 != self.t0:
-            t_normalized = (t - self.t0) / (self.t1 - self.t0)
-            t_normalized = _clamp(t_normalized, 0.0, 1.0)
-        else:
-            t_normalized = t
-        
-        return self._slerp_core(t_normalized)
-    
-    def _slerp_core(self, t: float) -> tuple:
-        """
-        SLERP 核心计算
-        
-        球面线性插值公式：
-        q(t) = q0 * sin((1-t)*θ) / sin(θ) + q1 * sin(t*θ) / sin(θ)
-        """
-        x0 = self.x0
-        y0 = self.y0
-        z0 = self.z0
-        w0 = self.w0
-        x1 = self.x1
-        y1 = self.y1
-        z1 = self.z1
-        w1 = self.w1
-        
-        # 计算点积（夹角的余弦值）
-        dot = x0*x1 + y0*y1 + z0*z1 + w0*w1
-        
-        # 如果点积为负，翻转其中一个四元数以选择最短路径
-        if dot < 0.0:
-            x1 = -x1
-            y1 = -y1
-            z1 = -z1
-            w1 = -w1
-            dot = -dot
-        
-        # 限制点积范围，防止数值误差导致的问题
-        if dot > 1.0:
-            dot = 1.0
-        elif dot < -1.0:
-            dot = -1.0
-        
-        # 计算夹角
-        theta_0 = np.arccos(dot)
-        sin_theta_0 = np.sin(theta_0)
-        
-        # 如果夹角非常小，使用线性插值避免除以零
-        if abs(sin_theta_0) < 1e-6:
-            # 线性插值
-            x = x0 + t * (x1 - x0)
-            y = y0 + t * (y1 - y0)
-            z = z0 + t * (z1 - z0)
-            w = w0 + t * (w1 - w0)
-            
-            # 归一化
-            length = np.sqrt(x*x + y*y + z*z + w*w)
-            if length > 1e-15:
-                x /= length
-                y /= length
-                z /= length
-                w /= length
-            
-            return (x, y, z, w)
-        
-        # 计算插值系数
-        sin_theta_t = np.sin(t * theta_0)
-        sin_theta_1_t = np.sin((1.0 - t) * theta_0)
-        
-        s0 = sin_theta_1_t / sin_theta_0
-        s1 = sin_theta_t / sin_theta_0
-        
-        # 计算插值后的四元数
-        x = s0 * x0 + s1 * x1
-        y = s0 * y0 + s1 * y1
-        z = s0 * z0 + s1 * z1
-        w = s0 * w0 + s1 * w1
-        
+    x0 = params[0]
+    y0 = params[1]
+    z0 = params[2]
+    w0 = params[3]
+    x1 = params[4]
+    y1 = params[5]
+    z1 = params[6]
+    w1 = params[7]
+    t0 = params[8]
+    t1 = params[9]
+
+    # 如果设置了时间范围，自动归一化
+    if t1 != t0:
+        t = _clamp((t - t0) / (t1 - t0), 0.0, 1.0)
+
+    # 计算点积（夹角的余弦值）
+    dot = x0*x1 + y0*y1 + z0*z1 + w0*w1
+
+    # 如果点积为负，翻转其中一个四元数以选择最短路径
+    if dot < 0.0:
+        x1 = -x1
+        y1 = -y1
+        z1 = -z1
+        w1 = -w1
+        dot = -dot
+
+    # 限制点积范围，防止数值误差导致的问题
+    if dot > 1.0:
+        dot = 1.0
+    elif dot < -1.0:
+        dot = -1.0
+
+    # 计算夹角
+    theta_0 = np.arccos(dot)
+    sin_theta_0 = np.sin(theta_0)
+
+    # 如果夹角非常小，使用线性插值避免除以零
+    if abs(sin_theta_0) < 1e-6:
+        # 线性插值
+        x = x0 + t * (x1 - x0)
+        y = y0 + t * (y1 - y0)
+        z = z0 + t * (z1 - z0)
+        w = w0 + t * (w1 - w0)
+
+        # 归一化
+        length = np.sqrt(x*x + y*y + z*z + w*w)
+        if length > 1e-15:
+            x /= length
+            y /= length
+            z /= length
+            w /= length
+
         return (x, y, z, w)
 
+    # 计算插值系数
+    sin_theta_t = np.sin(t * theta_0)
+    sin_theta_1_t = np.sin((1.0 - t) * theta_0)
+
+    s0 = sin_theta_1_t / sin_theta_0
+    s1 = sin_theta_t / sin_theta_0
 
-@jitclass(spec_axis_angle)
-class _AxisAngleInterpolator:
+    # 计算插值后的四元数
+    x = s0 * x0 + s1 * x1
+    y = s0 * y0 + s1 * y1
+    z = s0 * z0 + s1 * z1
+    w = s0 * w0 + s1 * w1
+
+    return (x, y, z, w)
+
+
+@njit(cache=True)
+def axis_angle_evaluate(params: np.ndarray, t: float) -> tuple:
     """
-    轴角插值器（Numba JIT 编译版本）
-    
-    用于绕固定轴进行角度插值，解决 SLERP 无法处理 360° 完整旋转的问题。
-    所有字段必须在 spec 中预先定义。
+    绕固定轴进行角度插值，解决 SLERP 无法处理 360° 完整旋转的问题
+
+    参数:
+        params: [axis_x, axis_y, axis_z, angle_start, angle_total, t0, t1]
+        t: 可以是归一化参数 [0, 1] 或实际时间值（t0 != t1 时自动归一化）
+
+    返回:
+        (x, y, z, w) 四元数分量
     """
-    
-    def __init__(self, axis_x: float, axis_y: float, axis_z: float, 
-                 angle_start: float, angle_total: float,
-                 t0: float = 0.0, t1: float = 1.0):
-        # 保存轴向量
-        self.axis_x = axis_x
-        self.axis_y = axis_y
-        self.axis_z = axis_z
-        # 保存角度信息
-        self.angle_start = angle_start
-        self.angle_total = angle_total
-        # 保存时间范围
-        self.t0 = t0
-        self.t1 = t1
-    
-    def evaluate(self, t: float) -> tuple:
-        """
-        计算给定 t 值对应的插值四元数
-        
-        参数:
-            t: 可以是归一化参数 [0, 1] 或实际时间值（如果设置了 t0, t1）
-        
-        返回:
-            (x, y, z, w) 四元数分量
-        """
-        # 如果设置了时间范围，自动归一化
-        if self.t1 != self.t0:
-            t_normalized = (t - self.t0) / (self.t1 - self.t0)
-            t_normalized = _clamp(t_normalized, 0.0, 1.0)
-        else:
-            t_normalized = t
-        
-        # 计算当前角度
-        current_angle = self.angle_start + self.angle_total * t_normalized
-        
-        # 生成对应的四元数
-        return _axis_angle_to_quaternion(self.axis_x, self.axis_y, self.axis_z, current_angle)
+    t0 = params[5]
+    t1 = params[6]
+    # 如果设置了时间范围，自动归一化
+    if t1 != t0:
+        t = _clamp((t - t0) / (t1 - t0), 0.0, 1.0)
+
+    # 计算当前角度
+    current_angle = params[3] + params[4] * t
+
+    # 生成对应的四元数
+    return _axis_angle_to_quaternion(params[0], params[1], params[2], current_angle)
+
+
+@njit(cache=True, nogil=True)
+def slerp_evaluate_many(params: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """对一组时间批量求 SLERP，返回形状 (len(ts), 4) 的数组"""
+    out = np.empty((len(ts), 4), dtype=np.float64)
+    for i in range(len(ts)):
+        x, y, z, w = slerp_evaluate(params, ts[i])
+        out[i, 0] = x
+        out[i, 1] = y
+        out[i, 2] = z
+        out[i, 3] = w
+    return out
+
+
+@njit(cache=True, nogil=True)
+def axis_angle_evaluate_many(params: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """对一组时间批量求轴角插值，返回形状 (len(ts), 4) 的数组"""
+    out = np.empty((len(ts), 4), dtype=np.float64)
+    for i in range(len(ts)):
+        x, y, z, w = axis_angle_evaluate(params, ts[i])
+        out[i, 0] = x
+        out[i, 1] = y
+        out[i, 2] = z
+        out[i, 3] = w
+    return out
+
+
+@njit(cache=True, nogil=True)
+def euler_to_quaternion_many(euler: np.ndarray) -> np.ndarray:
+    """形状 (n, 3) 的欧拉角（度）转四元数，返回形状 (n, 4) 的数组"""
+    out = np.empty((len(euler), 4), dtype=np.float64)
+    for i in range(len(euler)):
+        x, y, z, w = _euler_to_quaternion(euler[i, 0], euler[i, 1], euler[i, 2])
+        out[i, 0] = x
+        out[i, 1] = y
+        out[i, 2] = z
+        out[i, 3] = w
+    return out
+
+
+@njit(cache=True, nogil=True)
+def quaternion_to_euler_many(q: np.ndarray) -> np.ndarray:
+    """形状 (n, 4) 的四元数转欧拉角（度），返回形状 (n, 3) 的数组"""
+    out = np.empty((len(q), 3), dtype=np.float64)
+    for i in range(len(q)):
+        x, y, z = _quaternion_to_euler(q[i, 0], q[i, 1], q[i, 2], q[i, 3])
+        out[i, 0] = x
+        out[i, 1] = y
+        out[i, 2] = z
+    return out
+
+
+if not JIT_ENABLED:
+    # 没有 numba 时工具函数改用 math 实现；插值器的求值内核由后端决定（见 backends.py）
+    from ..numpy_backend import (_clamp, _axis_angle_to_quaternion, _quaternion_to_axis_angle,
+                                 _euler_to_quaternion, _quaternion_to_euler, _normalize_angle, _detect_full_rotation)
 
 
 def SphericalLinearInterpolation(x0: float, y0: float, z0: float, w0: float,
                                  x1: float, y1: float, z1: float, w1: float,
                                  t0: float = 0.0, t1: float = 1.0, 
-                                 force_axis_angle: bool = False):
+                                 force_axis_angle: bool = False, backend: BackendLike = None):
     """
     球面线性插值器工厂函数
     
@@ -412,11 +375,13 @@ def SphericalLinearInterpolation(x0: float, y0: float, z0: float, w0: float,
         x1, y1, z1, w1: 结束四元数的四个分量
         t0, t1: 时间范围（可选），如果提供则自动进行时间归一化
         force_axis_angle: 强制使用轴角插值模式
+        backend: 后端名称或 Backend（见 backends.py），None 时使用 config.BACKEND
     
     返回:
         一个可调用对象，接受 t 参数并返回插值后的四元数 (x, y, z, w)
         - 如果提供了 t0, t1：t 可以是实际时间值，会自动归一化
         - 如果未提供 t0, t1：t 应该是归一化参数 [0, 1]
+        其 many 属性接受一组时间并返回形状 (n, 4) 的数组
     
     示例:
         >>> # 普通 SLERP 插值
@@ -438,7 +403,7 @@ def SphericalLinearInterpolation(x0: float, y0: float, z0: float, w0: float,
             # 如果角度接近360，保留完整旋转
             if abs(angle_total) < 0.1:
                 angle_total = 360.0
-            interpolator = _AxisAngleInterpolator(axis_x, axis_y, axis_z, 0.0, angle_total, t0, t1)
+            params = np.array([axis_x, axis_y, axis_z, 0.0, angle_total, t0, t1], dtype=np.float64)
         else:
             # 一般情况，提取轴角
             axis_x, axis_y, axis_z, angle_0 = _quaternion_to_axis_angle(x0, y0, z0, w0)
@@ -446,15 +411,21 @@ def SphericalLinearInterpolation(x0: float, y0: float, z0: float, w0: float,
             angle_diff = angle_1 - angle_0
             if abs(angle_diff) < 0.1 and abs(angle_1) > 180.0:
                 angle_diff = 360.0
-            interpolator = _AxisAngleInterpolator(axis_x, axis_y, axis_z, angle_0, angle_diff, t0, t1)
+            params = np.array([axis_x, axis_y, axis_z, angle_0, angle_diff, t0, t1], dtype=np.float64)
+        kind = 'axis_angle'
     else:
         # 使用 SLERP 插值器
-        interpolator = _SphericalLinearInterpolator(x0, y0, z0, w0, x1, y1, z1, w1, t0, t1)
+        params = np.array([x0, y0, z0, w0, x1, y1, z1, w1, t0, t1], dtype=np.float64)
+        kind = 'slerp'
+    kernels = get_backend(backend).kernels
+    params = kernels['params'](params)
+    kernel, kernel_many = kernels[kind + '_evaluate'], kernels[kind + '_evaluate_many']
     
     # 返回一个包装函数
     def slerp(t):
-        return interpolator.evaluate(t)
+        return kernel(params, t)
     
+    slerp.many = lambda ts: kernel_many(params, ts)
     return slerp
 
 
@@ -470,8 +441,15 @@ class _EulerSphericalLinearInterpolator:
 
     def __init__(self, euler_x0: float, euler_y0: float, euler_z0: float,
                  euler_x1: float, euler_y1: float, euler_z1: float,
-                 t0: float = 0.0, t1: float = 1.0, axis=None):
+                 t0: float = 0.0, t1: float = 1.0, axis=None, backend: BackendLike = None):
         
+        # 求值时使用所选后端的欧拉角 / 四元数转换内核
+        kernels = get_backend(backend).kernels
+        self._to_quaternion = kernels['euler_to_quaternion']
+        self._to_euler = kernels['quaternion_to_euler']
+        self._to_quaternion_many = kernels['euler_to_quaternion_many']
+        self._to_euler_many = kernels['quaternion_to_euler_many']
+
         # 保存起始和结束欧拉角
         self.euler_x0 = euler_x0
         self.euler_y0 = euler_y0
@@ -521,8 +499,9 @@ class _EulerSphericalLinearInterpolator:
                     self._axis_vec = (0.0, 0.0, 1.0)  # 默认 Z 轴
                 self._start_angle, self._total_angle = self._extract_axis_rotation()
             else:
+                # evaluate 已将时间归一化到 [0, 1]，内部插值器不再使用 t0, t1
                 self._spherical_linear_interpolator = SphericalLinearInterpolation(
-                    *quat_start, *quat_end, t0, t1
+                    *quat_start, *quat_end, backend=backend
                 )
 
     def _detect_axis_angle_needed(self) -> bool:
@@ -598,17 +577,38 @@ class _EulerSphericalLinearInterpolator:
             
             # 根据旋转轴组合欧拉角
             if self._axis_vec[0] > 0.9:  # 绕 X 轴
-                quat = _euler_to_quaternion(current_angle, self.euler_y0, self.euler_z0)
+                quat = self._to_quaternion(current_angle, self.euler_y0, self.euler_z0)
             elif self._axis_vec[1] > 0.9:  # 绕 Y 轴
-                quat = _euler_to_quaternion(self.euler_x0, current_angle, self.euler_z0)
+                quat = self._to_quaternion(self.euler_x0, current_angle, self.euler_z0)
             else:  # 绕 Z 轴
-                quat = _euler_to_quaternion(self.euler_x0, self.euler_y0, current_angle)
+                quat = self._to_quaternion(self.euler_x0, self.euler_y0, current_angle)
             
-            return _quaternion_to_euler(*quat)
+            return self._to_euler(*quat)
         else:
             # SLERP 模式
             quat = self._spherical_linear_interpolator(t)
-            return _quaternion_to_euler(*quat)
+            return self._to_euler(*quat)
+
+    def evaluate_many(self, ts: np.ndarray) -> np.ndarray:
+        """对一组时间批量求值，返回形状 (len(ts), 3) 的欧拉角数组，与逐点调用 evaluate 的结果相同"""
+        t = np.asarray(ts, dtype=np.float64)
+        if self.t1 != self.t0:
+            t = np.clip((t - self.t0) / (self.t1 - self.t0), 0.0, 1.0)
+
+        if self._use_axis_angle:
+            euler = np.empty((len(t), 3), dtype=np.float64)
+            euler[:, 0] = self.euler_x0
+            euler[:, 1] = self.euler_y0
+            euler[:, 2] = self.euler_z0
+            if self._axis_vec[0] > 0.9:
+                axis = 0
+            elif self._axis_vec[1] > 0.9:
+                axis = 1
+            else:
+                axis = 2
+            euler[:, axis] = self._start_angle + self._total_angle * t
+            return self._to_euler_many(self._to_quaternion_many(euler))
+        return self._to_euler_many(self._spherical_linear_interpolator.many(t))
 
     @staticmethod
     def euler_to_quaternion(euler_x: float, euler_y: float, euler_z: float) -> tuple:
@@ -631,7 +631,7 @@ class _EulerSphericalLinearInterpolator:
 
 def EulerSphericalLinearInterpolation(euler_x0: float, euler_y0: float, euler_z0: float,
                                       euler_x1: float, euler_y1: float, euler_z1: float,
-                                      t0: float = 0.0, t1: float = 1.0, axis=None):
+                                      t0: float = 0.0, t1: float = 1.0, axis=None, backend: BackendLike = None):
     """
     欧拉角球面线性插值器工厂函数
     
@@ -645,6 +645,7 @@ def EulerSphericalLinearInterpolation(euler_x0: float, euler_y0: float, euler_z0
         t0, t1: 时间范围（可选），如果提供则自动进行时间归一化
         axis: 可选，指定绕哪个轴旋转。可以是 'x'/'y'/'z' 或三元组 (x, y, z)
               如果为 None，会自动检测是否需要轴角模式（某轴变化量 ≥ 360° 时）
+        backend: 后端名称或 Backend（见 backends.py），None 时使用 config.BACKEND
     
     返回:
         一个可调用对象，接受 t 参数并返回插值后的欧拉角 (x, y, z)（度）
@@ -665,10 +666,11 @@ def EulerSphericalLinearInterpolation(euler_x0: float, euler_y0: float, euler_z0
     interpolator = _EulerSphericalLinearInterpolator(
         euler_x0, euler_y0, euler_z0,
         euler_x1, euler_y1, euler_z1,
-        t0, t1, axis
+        t0, t1, axis, backend
     )
     
     def slerp(t):
         return interpolator.evaluate(t)
     
+    slerp.many = interpolator.evaluate_many
     return slerp
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""
+不依赖 numba 的求值后端
+
+numba 不可用（或 config.USE_JIT 为 False）时默认使用这里的内核（见 backends.py 的 numpy / python 后端）：
+单个时间点用 math 计算（Python float 上比 np.sin / np.arccos 快得多），
+一组时间点（*_many）用 NumPy 数组运算一次算完，包括对所有采样点同时进行的牛顿迭代。
+参数数组的布局与 numba_optimized 中的内核相同。
+"""
+import math
+from bisect import bisect_right
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# 有理 Bézier 牛顿法的迭代上限与收敛条件，与 numba_optimized.rational_bezier_interpolator 相同
+_NEWTON_ITERATIONS = 50
+_NEWTON_STEP = 1e-12
+
+
+# ==================== 工具函数（标量，math） ====================
+
+def _clamp(value: float, min_val: float, max_val: float) -> float:
+    """限制值在指定范围内"""
+    if value < min_val:
+        return min_val
+    elif value > max_val:
+        return max_val
+    return value
+
+
+def _axis_angle_to_quaternion(axis_x: float, axis_y: float, axis_z: float, angle_deg: float) -> tuple:
+    """轴角（度）转四元数 (x, y, z, w)"""
+    half = math.radians(angle_deg) * 0.5
+    s = math.sin(half)
+    c = math.cos(half)
+
+    length = math.sqrt(axis_x*axis_x + axis_y*axis_y + axis_z*axis_z)
+    if length > 1e-15:
+        axis_x /= length
+        axis_y /= length
+        axis_z /= length
+    return (axis_x * s, axis_y * s, axis_z * s, c)
+
+
+def _quaternion_to_axis_angle(x: float, y: float, z: float, w: float) -> tuple:
+    """四元数转轴角 (axis_x, axis_y, axis_z, angle_deg)"""
+    length = math.sqrt(x*x + y*y + z*z + w*w)
+    if length > 1e-15:
+        x /= length
+        y /= length
+        z /= length
+        w /= length
+    w = _clamp(w, -1.0, 1.0)
+
+    angle_rad = 2.0 * math.acos(w)
+    sin_half = math.sin(angle_rad / 2.0)
+    if abs(sin_half) < 1e-10:
+        # 零旋转，返回默认轴
+        return (1.0, 0.0, 0.0, 0.0)
+    return (x / sin_half, y / sin_half, z / sin_half, math.degrees(angle_rad))
+
+
+def _euler_to_quaternion(euler_x: float, euler_y: float, euler_z: float) -> tuple:
+    """欧拉角（度，Unity ZXY 顺序）转四元数 (x, y, z, w)"""
+    cx = math.cos(math.radians(euler_x) * 0.5)
+    sx = math.sin(math.radians(euler_x) * 0.5)
+    cy = math.cos(math.radians(euler_y) * 0.5)
+    sy = math.sin(math.radians(euler_y) * 0.5)
+    cz = math.cos(math.radians(euler_z) * 0.5)
+    sz = math.sin(math.radians(euler_z) * 0.5)
+
+    x = sx * cy * cz + cx * sy * sz
+    y = cx * sy * cz - sx * cy * sz
+    z = cx * cy * sz - sx * sy * cz
+    w = cx * cy * cz + sx * sy * sz
+    return (x, y, z, w)
+
+
+def _quaternion_to_euler(x: float, y: float, z: float, w: float) -> tuple:
+    """四元数转欧拉角（度）(euler_x, euler_y, euler_z)"""
+    length = math.sqrt(x*x + y*y + z*z + w*w)
+    if length > 1e-15:
+        x /= length
+        y /= length
+        z /= length
+        w /= length
+
+    euler_x = math.degrees(math.atan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)))
+    sinp = 2.0 * (w * y - z * x)
+    if abs(sinp) >= 1.0:
+        euler_y = math.degrees(math.copysign(math.pi / 2.0, sinp))
+    else:
+        euler_y = math.degrees(math.asin(sinp))
+    euler_z = math.degrees(math.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z)))
+    return (euler_x, euler_y, euler_z)
+
+
+def _normalize_angle(angle: float) -> float:
+    """将角度规范化到 [-180, 180] 范围"""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _detect_full_rotation(x0: float, y0: float, z0: float, w0: float,
+                          x1: float, y1: float, z1: float, w1: float) -> bool:
+    """检测两个四元数是否代表一个完整旋转（360°的整数倍）"""
+    dot = x0*x1 + y0*y1 + z0*z1 + w0*w1
+    return dot < -0.999 and x0*x0 + y0*y0 + z0*z0 < 0.001 * 0.001
+
+
+# ==================== 内核（标量） ====================
+
+def binary_search_segment_index(time_nodes: np.ndarray, t: float) -> int:
+    """与 numba 版本相同的曲线段索引；bisect 在单个时间点上比 np.searchsorted 的调用开销小得多"""
+    n = len(time_nodes)
+    if n < 2:
+        return 0
+    return min(max(bisect_right(time_nodes, t) - 1, 0), n - 2)
+
+
+def rational_bezier_evaluate(params: Sequence[float], t: float) -> float:
+    """有理贝塞尔插值（牛顿法求解），params 见 rational_bezier_params"""
+    x0, x1, y0, y1, x1_ctl, y1_ctl, x2_ctl, y2_ctl, w0, w1, w2, w3 = params
+
+    a = w3*(x1-t) - 3*w2*(x2_ctl-t) + 3*w1*(x1_ctl-t) - w0*(x0-t)
+    b = 3*w2*(x2_ctl-t) - 6*w1*(x1_ctl-t) + 3*w0*(x0-t)
+    c = 3*w1*(x1_ctl-t) - 3*w0*(x0-t)
+    d = w0*(x0-t)
+
+    # 带区间保护的牛顿法，见 numba 版本
+    f_hi = a + b + c + d
+    if d >= 0.0:
+        u = 0.0
+    elif f_hi <= 0.0:
+        u = 1.0
+    else:
+        lo, hi = 0.0, 1.0
+        u = d / (d - f_hi)
+        for _ in range(_NEWTON_ITERATIONS):
+            f = ((a * u + b) * u + c) * u + d
+            if f == 0.0:
+                break
+            if f < 0.0:
+                lo = u
+            else:
+                hi = u
+            f_prime = (3 * a * u + 2 * b) * u + c
+            u_new = u - f / f_prime if f_prime != 0.0 else 0.5 * (lo + hi)
+            if not lo < u_new < hi:
+                u_new = 0.5 * (lo + hi)
+            if abs(u_new - u) <= _NEWTON_STEP:
+                u = u_new
+                break
+            u = u_new
+
+    u1 = 1.0 - u
+    B0 = u1 * u1 * u1
+    B1 = 3.0 * u * u1 * u1
+    B2 = 3.0 * u * u * u1
+    B3 = u * u * u
+    denom = B0*w0 + B1*w1 + B2*w2 + B3*w3
+    if abs(denom) < 1e-15:
+        return y0
+    return (B0*w0*y0 + B1*w1*y1_ctl + B2*w2*y2_ctl + B3*w3*y1) / denom
+
+
+def slerp_evaluate(params: Sequence[float], t: float) -> tuple:
+    """四元数球面线性插值，params 为 [x0, y0, z0, w0, x1, y1, z1, w1, t0, t1]"""
+    x0, y0, z0, w0, x1, y1, z1, w1, t0, t1 = params
+    if t1 != t0:
+        t = _clamp((t - t0) / (t1 - t0), 0.0, 1.0)
+
+    dot = x0*x1 + y0*y1 + z0*z1 + w0*w1
+    if dot < 0.0:
+        x1, y1, z1, w1, dot = -x1, -y1, -z1, -w1, -dot
+    dot = _clamp(dot, -1.0, 1.0)
+
+    theta_0 = math.acos(dot)
+    sin_theta_0 = math.sin(theta_0)
+    if abs(sin_theta_0) < 1e-6:
+        x = x0 + t * (x1 - x0)
+        y = y0 + t * (y1 - y0)
+        z = z0 + t * (z1 - z0)
+        w = w0 + t * (w1 - w0)
+        length = math.sqrt(x*x + y*y + z*z + w*w)
+        if length > 1e-15:
+            x /= length
+            y /= length
+            z /= length
+            w /= length
+        return (x, y, z, w)
+
+    s0 = math.sin((1.0 - t) * theta_0) / sin_theta_0
+    s1 = math.sin(t * theta_0) / sin_theta_0
+    return (s0 * x0 + s1 * x1, s0 * y0 + s1 * y1, s0 * z0 + s1 * z1, s0 * w0 + s1 * w1)
+
+
+def axis_angle_evaluate(params: Sequence[float], t: float) -> tuple:
+    """绕固定轴的角度插值，params 为 [axis_x, axis_y, axis_z, angle_start, angle_total, t0, t1]"""
+    axis_x, axis_y, axis_z, angle_start, angle_total, t0, t1 = params
+    if t1 != t0:
+        t = _clamp((t - t0) / (t1 - t0), 0.0, 1.0)
+    return _axis_angle_to_quaternion(axis_x, axis_y, axis_z, angle_start + angle_total * t)
+
+
+# ==================== 内核（一组时间，NumPy） ====================
+
+def _normalized_times(ts: np.ndarray, t0: float, t1: float) -> np.ndarray:
+    ts = np.asarray(ts, dtype=np.float64)
+    if t1 != t0:
+        return np.clip((ts - t0) / (t1 - t0), 0.0, 1.0)
+    return ts
+
+
+def rational_bezier_evaluate_many(params: Sequence[float], ts: np.ndarray) -> np.ndarray:
+    """对一组时间批量求值；带区间保护的牛顿迭代对所有采样点同时进行，已收敛的点不再更新"""
+    x0, x1, y0, y1, x1_ctl, y1_ctl, x2_ctl, y2_ctl, w0, w1, w2, w3 = params
+    t = np.asarray(ts, dtype=np.float64)
+
+    a = w3*(x1-t) - 3*w2*(x2_ctl-t) + 3*w1*(x1_ctl-t) - w0*(x0-t)
+    b = 3*w2*(x2_ctl-t) - 6*w1*(x1_ctl-t) + 3*w0*(x0-t)
+    c = 3*w1*(x1_ctl-t) - 3*w0*(x0-t)
+    d = w0*(x0-t)
+
+    f_hi = a + b + c + d
+    inside = (d < 0.0) & (f_hi > 0.0)
+    u = np.where(d >= 0.0, 0.0, 1.0)
+    u[inside] = (d / np.where(inside, d - f_hi, 1.0))[inside]
+    lo = np.zeros(t.shape)
+    hi = np.ones(t.shape)
+    active = inside
+    for _ in range(_NEWTON_ITERATIONS):
+        if not active.any():
+            break
+        f = ((a * u + b) * u + c) * u + d
+        active &= f != 0.0
+        lo = np.where(active & (f < 0.0), u, lo)
+        hi = np.where(active & (f > 0.0), u, hi)
+        f_prime = (3 * a * u + 2 * b) * u + c
+        mid = 0.5 * (lo + hi)
+        u_new = np.where(f_prime != 0.0, u - f / np.where(f_prime != 0.0, f_prime, 1.0), mid)
+        u_new = np.where((lo < u_new) & (u_new < hi), u_new, mid)
+        u_new = np.where(active, u_new, u)
+        active &= np.abs(u_new - u) > _NEWTON_STEP
+        u = u_new
+
+    u1 = 1.0 - u
+    B0 = u1 * u1 * u1
+    B1 = 3.0 * u * u1 * u1
+    B2 = 3.0 * u * u * u1
+    B3 = u * u * u
+    denom = B0*w0 + B1*w1 + B2*w2 + B3*w3
+    degenerate = np.abs(denom) < 1e-15
+    y = (B0*w0*y0 + B1*w1*y1_ctl + B2*w2*y2_ctl + B3*w3*y1) / np.where(degenerate, 1.0, denom)
+    return np.where(degenerate, y0, y)
+
+
+def slerp_evaluate_many(params: Sequence[float], ts: np.ndarray) -> np.ndarray:
+    """对一组时间批量求 SLERP，返回形状 (len(ts), 4) 的数组"""
+    x0, y0, z0, w0, x1, y1, z1, w1, t0, t1 = params
+    t = _normalized_times(ts, t0, t1)[:, None]
+    q0 = np.array([x0, y0, z0, w0])
+    q1 = np.array([x1, y1, z1, w1])
+
+    dot = float(q0 @ q1)
+    if dot < 0.0:
+        q1, dot = -q1, -dot
+    dot = _clamp(dot, -1.0, 1.0)
+
+    theta_0 = math.acos(dot)
+    sin_theta_0 = math.sin(theta_0)
+    if abs(sin_theta_0) < 1e-6:
+        q = q0 + t * (q1 - q0)
+        length = np.sqrt(np.sum(q * q, axis=1, keepdims=True))
+        return np.where(length > 1e-15, q / np.where(length > 1e-15, length, 1.0), q)
+    s0 = np.sin((1.0 - t) * theta_0) / sin_theta_0
+    s1 = np.sin(t * theta_0) / sin_theta_0
+    return s0 * q0 + s1 * q1
+
+
+def axis_angle_to_quaternion_many(axis: Tuple[float, float, float], angle_deg: np.ndarray) -> np.ndarray:
+    """绕同一个轴的一组角度（度）转四元数，返回形状 (n, 4) 的数组"""
+    axis = np.asarray(axis, dtype=np.float64)
+    length = math.sqrt(float(axis @ axis))
+    if length > 1e-15:
+        axis = axis / length
+    half = np.radians(np.asarray(angle_deg, dtype=np.float64)) * 0.5
+    return np.column_stack((axis[0] * np.sin(half), axis[1] * np.sin(half), axis[2] * np.sin(half), np.cos(half)))
+
+
+def axis_angle_evaluate_many(params: Sequence[float], ts: np.ndarray) -> np.ndarray:
+    """对一组时间批量求轴角插值，返回形状 (len(ts), 4) 的数组"""
+    axis_x, axis_y, axis_z, angle_start, angle_total, t0, t1 = params
+    t = _normalized_times(ts, t0, t1)
+    return axis_angle_to_quaternion_many((axis_x, axis_y, axis_z), angle_start + angle_total * t)
+
+
+def euler_to_quaternion_many(euler: np.ndarray) -> np.ndarray:
+    """形状 (n, 3) 的欧拉角（度）转四元数，返回形状 (n, 4) 的数组"""
+    half = np.radians(np.asarray(euler, dtype=np.float64)) * 0.5
+    c = np.cos(half)
+    s = np.sin(half)
+    cx, cy, cz = c[:, 0], c[:, 1], c[:, 2]
+    sx, sy, sz = s[:, 0], s[:, 1], s[:, 2]
+    return np.column_stack((sx * cy * cz + cx * sy * sz,
+                            cx * sy * cz - sx * cy * sz,
+                            cx * cy * sz - sx * sy * cz,
+                            cx * cy * cz + sx * sy * sz))
+
+
+def quaternion_to_euler_many(q: np.ndarray) -> np.ndarray:
+    """形状 (n, 4) 的四元数转欧拉角（度），返回形状 (n, 3) 的数组"""
+    q = np.asarray(q, dtype=np.float64)
+    length = np.sqrt(np.sum(q * q, axis=1, keepdims=True))
+    q = np.where(length > 1e-15, q / np.where(length > 1e-15, length, 1.0), q)
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+
+    euler_x = np.degrees(np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)))
+    sinp = 2.0 * (w * y - z * x)
+    euler_y = np.degrees(np.where(np.abs(sinp) >= 1.0, np.copysign(np.pi / 2.0, sinp),
+                                  np.arcsin(np.clip(sinp, -1.0, 1.0))))
+    euler_z = np.degrees(np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z)))
+    return np.column_stack((euler_x, euler_y, euler_z))
+
+
+def segment_index_many(time_nodes: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """一组时间的曲线段索引，与逐点调用 binary_search_segment_index 相同"""
+    n = len(time_nodes)
+    if n < 2:
+        return np.zeros(len(ts), dtype=np.int64)
+    return np.clip(np.searchsorted(time_nodes, ts, side='right') - 1, 0, n - 2).astype(np.int64)
+
+
+def lookup_table_evaluate_many(breaks: np.ndarray, coeffs: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """查找表按一组时间求值，返回形状 (n, k) 的数组（见 numba_optimized.lookup_table）"""
+    ts = np.asarray(ts, dtype=np.float64)
+    index = np.clip(np.searchsorted(breaks, ts, side='right') - 1, 0, len(breaks) - 2)
+    a = breaks[index]
+    width = breaks[index + 1] - a
+    u = np.clip(np.divide(ts - a, width, out=np.zeros_like(ts), where=width > 0), 0.0, 1.0)[:, None]
+    c = coeffs[index]
+    out = c[:, -1].copy()
+    for j in range(c.shape[1] - 2, -1, -1):
+        out = out * u + c[:, j]
+    return out
@@ -1,9 +1,17 @@
 from .parsers import XCurves
 from .parsers import Events
 
-def parse_anim(anim_dict):
+def parse_anim(anim_dict, backend=None):
+    """backend: 插值器使用的后端（见 backends.py），None 时使用 config.BACKEND"""
     anim_dict = anim_dict["AnimationClip"]
 
-    stop_time, paths = XCurves.parse(anim_dict)
+    stop_time, paths = XCurves.parse(anim_dict, backend)
     events = Events.parse(anim_dict)
-    return stop_time, paths, events
\ No newline at end of file
+    return stop_time, paths, events
+
+def parse_wrap_modes(anim_dict):
+    """返回 (m_LoopTime, {path: {curve_type: (pre, post)}})"""
+    anim_dict = anim_dict["AnimationClip"]
+
+    loop_time = bool(anim_dict.get("m_AnimationClipSettings", {}).get("m_LoopTime", 0))
+    return loop_time, XCurves.parse_wrap_modes(anim_dict)
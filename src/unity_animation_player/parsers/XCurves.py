@@ -1,7 +1,10 @@
 from ..numba_optimized.rational_bezier_interpolator import RationalBezierInterpolation
 from ..numba_optimized.spherical_linear_interpolator import SphericalLinearInterpolation, EulerSphericalLinearInterpolation
+from ..wrap_modes import unity_wrap_mode
 import numpy as np
 
+M_XCURVESES = ("m_RotationCurves", "m_CompressedRotationCurves", "m_EulerCurves", "m_PositionCurves", "m_ScaleCurves", "m_FloatCurves")
+
 class MixedSegment:
     def __init__(self, x_start, x_end, interpolator):
         self.x = np.array([x_start, x_end], dtype=float)
@@ -10,6 +13,13 @@ class MixedSegment:
     
     def __call__(self, x):
         return self._interp(x)
+
+    def evaluate_many(self, xs):
+        """对一组时间批量求值；插值器提供 many 时一次调用完成（标量曲线返回 (n,)，旋转返回 (n, k)）"""
+        many = getattr(self._interp, 'many', None)
+        if many is not None:
+            return many(np.asarray(xs, dtype=float))
+        return np.array([self._interp(x) for x in xs], dtype=float)
     
     def covers(self, x):
         a, b = self.x_interval
@@ -18,7 +28,7 @@ class MixedSegment:
 def piecewise_hermite(x_points, y_points, 
                       in_slopes, out_slopes, 
                       in_weights, out_weights, 
-                      tangentMode, weightedMode):
+                      tangentMode, weightedMode, backend=None):
     x_points = np.array(x_points, dtype=float)
     y_points = np.array(y_points, dtype=float)
     n = len(x_points)
@@ -95,14 +105,15 @@ def piecewise_hermite(x_points, y_points,
                 weight0 = weight_out[k]
                 weight1 = weight_in[k+1]
 
-                interpolator = RationalBezierInterpolation(x0, x1, y0, y1, slope0, slope1, 1/3, weight0, weight1, 1/3)
+                interpolator = RationalBezierInterpolation(x0, x1, y0, y1, slope0, slope1, 1/3, weight0, weight1, 1/3,
+                                                           backend=backend)
 
             segments.append(MixedSegment(x0, x1, interpolator))
 
     return segments
 
 
-def piecewise_slerp(x_points, value_components, tangentMode, interpolation_type='quaternion'):
+def piecewise_slerp(x_points, value_components, tangentMode, interpolation_type='quaternion', backend=None):
     """
     处理旋转曲线的分段 SLERP 插值（通用函数）
     
@@ -113,6 +124,7 @@ def piecewise_slerp(x_points, value_components, tangentMode, interpolation_type=
             - 欧拉角: {'x': (...), 'y': (...), 'z': (...)}
         tangentMode: 切线模式数组
         interpolation_type: 插值类型，'quaternion' 或 'euler'
+        backend: 插值器使用的后端（见 backends.py），None 时使用 config.BACKEND
     
     返回:
         MixedSegment 列表
@@ -153,9 +165,9 @@ def piecewise_slerp(x_points, value_components, tangentMode, interpolation_type=
             
             # 根据类型创建对应的插值器（直接传入时间范围，自动处理归一化）
             if interpolation_type == 'quaternion':
-                slerp_func = SphericalLinearInterpolation(*start_values, *end_values, x0, x1)
+                slerp_func = SphericalLinearInterpolation(*start_values, *end_values, x0, x1, backend=backend)
             else:  # euler
-                slerp_func = EulerSphericalLinearInterpolation(*start_values, *end_values, x0, x1)
+                slerp_func = EulerSphericalLinearInterpolation(*start_values, *end_values, x0, x1, backend=backend)
             
             # 直接使用插值器，无需额外的闭包包装
             segments.append(MixedSegment(x0, x1, slerp_func))
@@ -163,7 +175,7 @@ def piecewise_slerp(x_points, value_components, tangentMode, interpolation_type=
     return segments
 
 
-def _parse_m_Curve(m_Curve_list, m_XCurves_name='m_PositionCurves'):
+def _parse_m_Curve(m_Curve_list, m_XCurves_name='m_PositionCurves', backend=None):
     """Parse an m_Curve block and perform interpolation processing"""
     parameter_keys = list(m_Curve_list[0].keys())
     parameter_keys.remove("serializedVersion")
@@ -187,7 +199,8 @@ def _parse_m_Curve(m_Curve_list, m_XCurves_name='m_PositionCurves'):
             parameter_dict["time"],
             parameter_dict["value"],
             parameter_dict["tangentMode"],
-            interpolation_type
+            interpolation_type,
+            backend
         )
     elif isinstance(parameter_dict["value"], dict):
         # 向量类型（如 Position, Scale）的分量插值
@@ -203,7 +216,7 @@ def _parse_m_Curve(m_Curve_list, m_XCurves_name='m_PositionCurves'):
                 parameter_dict["tangentMode"],
                 parameter_dict["weightedMode"]
             )
-            interpolation_list[comp] = piecewise_hermite(*args)
+            interpolation_list[comp] = piecewise_hermite(*args, backend=backend)
     else:
         # 标量类型插值
         args = (
@@ -216,15 +229,14 @@ def _parse_m_Curve(m_Curve_list, m_XCurves_name='m_PositionCurves'):
             parameter_dict["tangentMode"],
             parameter_dict["weightedMode"]
         )
-        interpolation_list = piecewise_hermite(*args)
+        interpolation_list = piecewise_hermite(*args, backend=backend)
 
     return interpolation_list, max_time, time_nodes
 
 
-def _parse_curve(m_XCurves, m_XCurves_name):
-    output = {}
+def _curve_paths(m_XCurves):
+    """依次产出 (path, m_XCurve)，空 path 命名为 general, general(1), ..."""
     general_times = 0
-    max_times = []
     for m_XCurve in m_XCurves:
         path = m_XCurve["path"]
         if not path:
@@ -232,24 +244,46 @@ def _parse_curve(m_XCurves, m_XCurves_name):
             general_times += 1
         else:
             path = str(path)
-        interpolation_list, max_time, time_nodes = _parse_m_Curve(m_XCurve["curve"]["m_Curve"], m_XCurves_name)
+        yield path, m_XCurve
+
+
+def _parse_curve(m_XCurves, m_XCurves_name, backend=None):
+    output = {}
+    max_times = []
+    for path, m_XCurve in _curve_paths(m_XCurves):
+        interpolation_list, max_time, time_nodes = _parse_m_Curve(m_XCurve["curve"]["m_Curve"], m_XCurves_name, backend)
         output[path] = (interpolation_list, time_nodes)
         max_times.append(max_time)
     max_time_ = max(max_times) if max_times else 0
     return output, max_time_
 
-def parse(anim_dict):
+def parse(anim_dict, backend=None):
     stop_time = anim_dict["m_AnimationClipSettings"]["m_StopTime"]
-    m_XCurveses = ("m_RotationCurves", "m_CompressedRotationCurves", "m_EulerCurves", "m_PositionCurves", "m_ScaleCurves", "m_FloatCurves")
     paths = {}
-    for m_XCurves in m_XCurveses:
+    for m_XCurves in M_XCURVESES:
         m_XCurves_list = anim_dict[m_XCurves]
         if m_XCurves_list:
-            m_XCurves_dict, max_time = _parse_curve(m_XCurves_list, m_XCurves)
+            m_XCurves_dict, max_time = _parse_curve(m_XCurves_list, m_XCurves, backend)
             for path_key, m_Curve_interpolation_time_nodes in m_XCurves_dict.items():
                 if path_key not in paths:
                     paths[path_key] = {}
                 paths[path_key][m_XCurves[2:-6]] = m_Curve_interpolation_time_nodes
             if stop_time == 1 and type(stop_time) == int:
                 stop_time = max_time
-    return stop_time, paths
\ No newline at end of file
+    return stop_time, paths
+
+
+def parse_wrap_modes(anim_dict):
+    """
+    读取每条曲线的 m_PreInfinity / m_PostInfinity
+
+    返回 {path: {curve_type: (pre, post)}}，键与 parse() 的结果一致，取值见 wrap_modes.py
+    """
+    wraps = {}
+    for m_XCurves in M_XCURVESES:
+        for path, m_XCurve in _curve_paths(anim_dict.get(m_XCurves) or ()):
+            curve = m_XCurve["curve"]
+            pre = unity_wrap_mode(curve.get("m_PreInfinity", 2))
+            post = unity_wrap_mode(curve.get("m_PostInfinity", 2))
+            wraps.setdefault(path, {})[m_XCurves[2:-6]] = (pre, post)
+    return wraps
@@ -0,0 +1,30 @@
+from typing import Dict, Optional, Tuple
+
+from .animation_clip import AnimationClip
+from .animation_events import AnimationEvents, HandlerRegistry
+from .baking import BakedTable
+from .sampling_plan import SamplingPlan
+from .wrap_modes import resolve_wrap_mode
+
+
+class PlaybackState:
+    """
+    单个播放器的可变播放状态
+
+    只保存当前时间、事件游标（共享只读的事件表）、注册的回调、stop_time 覆盖值、播放方式以及正在使用的烘焙表，
+    曲线等共享数据全部留在 AnimationClip 中，因此创建开销很小。
+    time 为上一次 play_frame 的时间，None 表示尚未播放（循环播放时用于确定事件区间）。
+    batch 为批量推进时（见 SharedTicker）同一 tick 内共享的 {(plan, t): 通道值} 字典，平时为 None。
+    """
+
+    __slots__ = ('time', 'stop_time', 'wrap_mode', 'events', 'registered_events', 'baked', 'batch')
+
+    def __init__(self, clip: AnimationClip, stop_time: Optional[float] = None, wrap_mode: Optional[str] = None):
+        self.time: Optional[float] = None
+        self.stop_time = clip.stop_time if stop_time is None else stop_time
+        self.wrap_mode = clip.wrap_mode if wrap_mode is None else resolve_wrap_mode(wrap_mode, clip.loop_time)
+        self.registered_events = HandlerRegistry()
+        self.events = AnimationEvents(timeline=clip.event_timeline, registered=self.registered_events,
+                                      source=clip.source)
+        self.baked: Optional[BakedTable] = None
+        self.batch: Optional[Dict[Tuple[SamplingPlan, float], Tuple[float, ...]]] = None
@@ -0,0 +1,161 @@
+"""
+按阶段统计耗时的性能计数器
+
+    import unity_animation_player as uap
+    uap.set_profiling(True)
+    ...  # 加载、播放
+    print(uap.stats()['stages'])
+
+记录的阶段（每个阶段都按片段的 source 分别累计）:
+    cache_hit / cache_miss    load_yaml 命中 / 未命中 JSON 缓存（含计算 SHA256 与读写缓存）
+    yaml_load                 未命中时 PyYAML 解析 .anim 的耗时（包含在 cache_miss 中）
+    clip_cache_hit / clip_cache_miss
+                              load_clip 命中 / 未命中进程内的片段缓存
+    parse                     AnimationClip.from_anim_dict 构建插值器
+    lut_build                 AnimationClip.with_lut 构建查找表
+    segment_search            每条曲线的二分查找
+    interpolate.<kind>        按曲线类型（Euler / Rotation / Position / Scale / Float）的插值计算
+    event_poll                按时间区间查询经过的事件
+    event_dispatch            调用已注册的回调（或提交给 dispatcher），items 为经过的事件数
+
+关闭时（默认）热路径上每帧只多一次模块属性判断；打开后改走带计时的分支。
+可以用环境变量 UNITY_ANIMATION_PLAYER_PROFILE=1 在导入时打开。
+"""
+import threading
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional
+
+from . import config, tracing
+
+# 热路径上通过 profiling.ENABLED 判断，修改请使用 set_profiling
+ENABLED = bool(config.PROFILE)
+
+_UNKNOWN = '<unknown>'
+
+# {source: {stage: [calls, items, total_ns, max_ns]}}
+_records: Dict[str, Dict[str, List[int]]] = {}
+_lock = threading.Lock()
+
+clock = perf_counter_ns
+
+
+def set_profiling(enabled: bool = True) -> None:
+    """打开或关闭计数器；已累计的数据保留，需要时调用 reset_stats"""
+    global ENABLED
+    ENABLED = bool(enabled)
+    config.PROFILE = ENABLED
+
+
+def record(stage: str, elapsed_ns: int, source: Optional[str] = None, items: int = 1) -> None:
+    """累计一次 stage 的耗时（纳秒）；items 为本次处理的对象数（如事件数、曲线数）"""
+    with _lock:
+        stages = _records.get(source or _UNKNOWN)
+        if stages is None:
+            stages = _records[source or _UNKNOWN] = {}
+        entry = stages.get(stage)
+        if entry is None:
+            stages[stage] = [1, items, elapsed_ns, elapsed_ns]
+        else:
+            entry[0] += 1
+            entry[1] += items
+            entry[2] += elapsed_ns
+            if elapsed_ns > entry[3]:
+                entry[3] = elapsed_ns
+
+
+class timed:
+    """
+    计时上下文，用于加载、解析等非逐帧阶段；未打开计数器也未记录时间线时不计时
+
+    记录时间线时（见 tracing.py）同时写入一个 cat 为 'load' 的区间
+
+        with profiling.timed('parse', source):
+            ...
+    """
+
+    __slots__ = ('stage', 'source', 'items', '_start')
+
+    def __init__(self, stage: str, source: Optional[str] = None, items: int = 1):
+        self.stage = stage
+        self.source = source
+        self.items = items
+        self._start = 0
+
+    def __enter__(self) -> 'timed':
+        if ENABLED or tracing.ENABLED:
+            self._start = clock()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if not self._start:
+            return
+        end = clock()
+        if ENABLED:
+            record(self.stage, end - self._start, self.source, self.items)
+        if tracing.ENABLED:
+            tracing.complete(self.stage, 'load', self._start, end, {'source': self.source})
+
+
+def _summary(entry: List[int]) -> Dict[str, Any]:
+    calls, items, total_ns, max_ns = entry
+    return {
+        'calls': calls,
+        'items': items,
+        'seconds': total_ns / 1e9,
+        'mean_seconds': total_ns / calls / 1e9,
+        'max_seconds': max_ns / 1e9,
+    }
+
+
+def _merge(stages_list) -> Dict[str, List[int]]:
+    merged: Dict[str, List[int]] = {}
+    for stages in stages_list:
+        for stage, (calls, items, total_ns, max_ns) in stages.items():
+            entry = merged.setdefault(stage, [0, 0, 0, 0])
+            entry[0] += calls
+            entry[1] += items
+            entry[2] += total_ns
+            entry[3] = max(entry[3], max_ns)
+    return merged
+
+
+def _source_of(clip: Any) -> str:
+    source = getattr(clip, 'source', clip)
+    return source or _UNKNOWN
+
+
+def stats(clip: Any = None, reset: bool = False) -> Dict[str, Any]:
+    """
+    返回已累计的计数器
+
+    clip: 只返回该片段的数据（AnimationClip 或其 source 路径），默认返回全部
+    reset: 读取后清空（只清空返回的部分）
+    返回: {'enabled': bool,
+           'stages': {stage: {'calls', 'items', 'seconds', 'mean_seconds', 'max_seconds'}},  # 所有片段合计
+           'clips': {source: {stage: {...}}}}
+    """
+    with _lock:
+        if clip is None:
+            selected = {source: {stage: list(entry) for stage, entry in stages.items()}
+                        for source, stages in _records.items()}
+        else:
+            source = _source_of(clip)
+            selected = {source: {stage: list(entry) for stage, entry in _records.get(source, {}).items()}}
+        if reset:
+            for source in selected:
+                _records.pop(source, None)
+    return {
+        'enabled': ENABLED,
+        'stages': {stage: _summary(entry) for stage, entry in sorted(_merge(selected.values()).items())},
+        'clips': {source: {stage: _summary(entry) for stage, entry in sorted(stages.items())}
+                  for source, stages in selected.items() if stages},
+    }
+
+
+def reset_stats(clip: Any = None) -> None:
+    """清空计数器；给出 clip 时只清空该片段"""
+    with _lock:
+        if clip is None:
+            _records.clear()
+        else:
+            _records.pop(_source_of(clip), None)
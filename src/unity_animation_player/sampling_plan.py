@@ -0,0 +1,398 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import profiling
+from .numba_optimized.binary_search import binary_search_segment_index, segment_index_many
+from .wrap_modes import CLAMP, wrap_time, wrap_times
+
+_EULER_INDEX = {'x': 0, 'y': 1, 'z': 2}
+_QUATERNION_INDEX = {'x': 0, 'y': 1, 'z': 2, 'w': 3}
+
+
+def evaluate_curve(curve: Tuple[Sequence[Any], np.ndarray], t: float) -> Any:
+    """按时间 t 计算一条 (segments, time_nodes) 曲线的值（标量或元组）"""
+    segments, time_nodes = curve
+    if not segments:
+        return 0.0
+    return segments[binary_search_segment_index(time_nodes, t)](t)
+
+
+def _evaluate_curve_timed(curve: Tuple[Sequence[Any], np.ndarray], t: float) -> Tuple[Any, int, int]:
+    """与 evaluate_curve 相同，额外返回二分查找与插值各自的耗时（纳秒）"""
+    segments, time_nodes = curve
+    if not segments:
+        return 0.0, 0, 0
+    clock = profiling.clock
+    start = clock()
+    index = binary_search_segment_index(time_nodes, t)
+    found = clock()
+    value = segments[index](t)
+    return value, found - start, clock() - found
+
+
+def segment_runs(time_nodes: np.ndarray, ts: np.ndarray) -> List[Tuple[int, Any]]:
+    """
+    把一组时间按所在的曲线段分组，返回 [(段下标, 行)]，行为下标数组，所有时间都在同一段时为 slice(None)
+
+    同一组 time_nodes 的多条曲线（如 position 的 x / y / z）可以共用结果（见 SamplingPlan.evaluate_many）
+    """
+    index = segment_index_many(time_nodes, ts)
+    first = int(index[0]) if len(index) else 0
+    if (index == first).all():
+        return [(first, slice(None))]
+    # 按段排序后切片，不为每个段单独构造掩码
+    order = np.argsort(index, kind='stable')
+    index = index[order]
+    bounds = [0] + (np.flatnonzero(np.diff(index)) + 1).tolist() + [len(ts)]
+    return [(int(index[lo]), order[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def evaluate_curve_many(curve: Tuple[Sequence[Any], np.ndarray], ts: np.ndarray,
+                        runs: Optional[List[Tuple[int, Any]]] = None) -> np.ndarray:
+    """
+    按一组时间计算一条曲线的值，每个曲线段只调用一次（见 MixedSegment.evaluate_many）
+
+    与逐点调用 evaluate_curve 的结果相同；返回形状 (n,)（标量曲线）或 (n, k)（旋转、欧拉角）
+    runs: 已经算好的 segment_runs(time_nodes, ts)
+    """
+    segments, time_nodes = curve
+    ts = np.asarray(ts, dtype=np.float64).reshape(-1)
+    if not segments:
+        return np.zeros(len(ts))
+    if runs is None:
+        runs = segment_runs(time_nodes, ts)
+    out = None
+    for i, rows in runs:
+        segment = segments[i]
+        many = getattr(segment, 'evaluate_many', None)
+        if many is not None:
+            values = many(ts[rows])
+        else:
+            values = np.array([segment(t) for t in ts[rows].tolist()], dtype=np.float64)
+        if len(runs) == 1:
+            return np.asarray(values, dtype=np.float64)
+        if out is None:
+            out = np.empty((len(ts),) + np.shape(values)[1:], dtype=np.float64)
+        out[rows] = values
+    return out
+
+
+def curve_wrap(curve: Tuple[Sequence[Any], np.ndarray],
+               modes: Tuple[str, str] = (CLAMP, CLAMP)) -> Tuple[float, float, str, str]:
+    """曲线的 (首个关键帧时间, 最后关键帧时间, pre, post)，供 wrap_time 使用"""
+    time_nodes = curve[1]
+    if len(time_nodes) == 0:
+        return (-np.inf, np.inf, CLAMP, CLAMP)
+    return (float(time_nodes[0]), float(time_nodes[-1]), modes[0], modes[1])
+
+
+def _segment_is_constant(segment: Any, tolerance: float, n_points: int = 9) -> bool:
+    """在段内均匀取 n_points 个点，判断曲线段是否为常量（如常量切线段、首尾值与切线相同的 Bézier 段）"""
+    a, b = segment.x_interval
+    ref = np.asarray(segment(a), dtype=np.float64)
+    for j in range(1, n_points):
+        value = np.asarray(segment(a + (b - a) * j / (n_points - 1)), dtype=np.float64)
+        if np.max(np.abs(value - ref)) > tolerance:
+            return False
+    return True
+
+
+def active_intervals(curves: Sequence[Tuple[Tuple[Sequence[Any], np.ndarray], Tuple[float, float, str, str]]],
+                     tolerance: float = 1e-9) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算一组曲线的值会变化的时间区间
+
+    curves: [((segments, time_nodes), (start, end, pre, post)), ...]
+    返回: 合并后的 (starts, ends)；非常量段给出 [a, b]，段与段之间的跳变给出长度为 0 的 [k, k]，
+          pre / post 不是 clamp 的曲线在关键帧区间外视为一直变化
+    """
+    intervals: List[Tuple[float, float]] = []
+    seen = set()
+    for (segments, time_nodes), (start, end, pre, post) in curves:
+        if id(segments) in seen or not segments:
+            continue
+        seen.add(id(segments))
+        for i, segment in enumerate(segments):
+            if not _segment_is_constant(segment, tolerance):
+                intervals.append(segment.x_interval)
+            if i > 0:
+                k = segment.x_interval[0]
+                if np.max(np.abs(np.subtract(segments[i - 1](k), segment(k)))) > tolerance:
+                    intervals.append((k, k))
+        if pre != CLAMP:
+            intervals.append((-np.inf, start))
+        if post != CLAMP:
+            intervals.append((end, np.inf))
+
+    intervals.sort()
+    merged: List[List[float]] = []
+    for a, b in intervals:
+        if merged and a <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
+    starts = np.array([a for a, _ in merged], dtype=np.float64)
+    ends = np.array([b for _, b in merged], dtype=np.float64)
+    return starts, ends
+
+
+def next_active_time(intervals: Tuple[np.ndarray, np.ndarray], t: float) -> float:
+    """t 处于变化区间内时返回 t，否则返回下一个变化区间的起点（没有则为 inf）"""
+    starts, ends = intervals
+    index = np.searchsorted(ends, t, side='left')
+    if index == len(ends):
+        return np.inf
+    return max(t, float(starts[index]))
+
+
+class PlanField:
+    """
+    输出字典中的一个键（euler / rotation / position / scale / float）
+
+    vector 为 True 时曲线一次返回多个分量（旋转、欧拉角），由 indices 选出需要的分量；
+    否则每个输出值对应一条独立的标量曲线，乘以 factors（已包含 ratio 与 reverse 的符号）。
+    wraps 与 curves 一一对应，记录关键帧区间外的时间映射方式（m_PreInfinity / m_PostInfinity）。
+    """
+
+    __slots__ = ('key', 'kind', 'curves', 'indices', 'factors', 'tuple_output', 'width', 'wraps')
+
+    def __init__(self, key: str, kind: str, curves: Tuple, indices: Tuple[Optional[int], ...],
+                 factors: Tuple[float, ...], tuple_output: bool, modes: Tuple[str, str] = (CLAMP, CLAMP)):
+        self.key = key
+        self.kind = kind
+        self.curves = curves
+        self.indices = indices
+        self.factors = factors
+        self.tuple_output = tuple_output
+        self.width = len(indices)
+        self.wraps = tuple(curve_wrap(curve, modes) for curve in curves)
+
+    @property
+    def vector(self) -> bool:
+        return self.indices[0] is not None
+
+
+def _per_axis(value: Any, i: int) -> Any:
+    return value[i] if isinstance(value, tuple) else value
+
+
+class SamplingPlan:
+    """
+    把 play_frame 的 kwargs 解析为固定布局的通道列表
+
+    同一个片段、同一组 kwargs 只需解析一次；evaluate(t) 返回按 layout 展平的浮点数元组，
+    assemble(values) 再把它还原为 play_frame 的输出字典。
+    curve_wraps: {path: {curve_type: (pre, post)}}，缺省时关键帧区间外保持端点值（clamp）
+    source: 所属片段的来源路径，用于按片段统计耗时（见 profiling.py）
+    """
+
+    __slots__ = ('key', 'path', 'source', 'fields', 'layout', 'width', '_active')
+
+    def __init__(self, anim: Mapping[str, Any], typed_kwargs: Mapping[str, Any], key: Any = None,
+                 curve_wraps: Optional[Mapping[str, Mapping[str, Tuple[str, str]]]] = None,
+                 source: Optional[str] = None):
+        self.key = key
+        self.source = source
+        self.path = typed_kwargs['path']
+        ani = anim[self.path]
+        wraps = (curve_wraps or {}).get(self.path, {})
+
+        fields: List[PlanField] = []
+        for kind, out_key, unit_key, index_map in (('Euler', 'euler', 'euler_unit', _EULER_INDEX),
+                                                   ('Rotation', 'rotation', 'rotation_unit', _QUATERNION_INDEX)):
+            if kind not in ani:
+                continue
+            curve = ani[kind]
+            unit = typed_kwargs[unit_key]
+            if isinstance(unit, tuple):
+                indices, tuple_output = tuple(index_map[u] for u in unit), True
+            elif unit in index_map:
+                indices, tuple_output = (index_map[unit],), False
+            else:
+                # 未知分量名时返回全部分量
+                indices, tuple_output = tuple(range(len(index_map))), True
+            fields.append(PlanField(out_key, kind, (curve,) * len(indices), indices,
+                                    (1.0,) * len(indices), tuple_output, wraps.get(kind, (CLAMP, CLAMP))))
+
+        for kind, out_key in (('Position', 'position'), ('Scale', 'scale')):
+            if kind not in ani:
+                continue
+            components, time_nodes = ani[kind]
+            unit = typed_kwargs[f'{out_key}_unit']
+            reverse = typed_kwargs[f'{out_key}_reverse']
+            ratio = typed_kwargs[f'{out_key}_ratio']
+            units = unit if isinstance(unit, tuple) else (unit,)
+            curves, factors = [], []
+            for i, u in enumerate(units):
+                ratio_val = _per_axis(ratio, i)
+                curves.append((components[u], time_nodes))
+                factors.append(-ratio_val if _per_axis(reverse, i) else ratio_val)
+            fields.append(PlanField(out_key, kind, tuple(curves), (None,) * len(units),
+                                    tuple(factors), isinstance(unit, tuple), wraps.get(kind, (CLAMP, CLAMP))))
+
+        if 'Float' in ani:
+            curve = ani['Float']
+            if isinstance(curve[0], (list, tuple)):
+                fields.append(PlanField('float', 'Float', (curve,), (None,), (1.0,), False,
+                                        wraps.get('Float', (CLAMP, CLAMP))))
+
+        self.fields = tuple(fields)
+        self.layout = tuple((field.key, field.width) for field in self.fields)
+        self.width = sum(field.width for field in self.fields)
+        self._active: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def channel_names(self) -> Tuple[str, ...]:
+        """展平后每个通道的名字，如 ('position[0]', 'position[1]', 'scale[0]')"""
+        return tuple(f"{key}[{i}]" for key, width in self.layout for i in range(width))
+
+    def discontinuities(self, tolerance: float = 1e-9) -> np.ndarray:
+        """所有通道在关键帧处的跳变时间（例如常量切线段的结束处），已排序"""
+        times = set()
+        seen = set()
+        for field in self.fields:
+            for segments, time_nodes in field.curves:
+                if id(segments) in seen:
+                    continue
+                seen.add(id(segments))
+                for i in range(1, len(segments)):
+                    k = float(time_nodes[i])
+                    jump = np.subtract(segments[i - 1](k), segments[i](k))
+                    if np.max(np.abs(jump)) > tolerance:
+                        times.add(k)
+        return np.array(sorted(times), dtype=np.float64)
+
+    def active_intervals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """所有通道的值会变化的时间区间 (starts, ends)，首次调用时计算"""
+        if self._active is None:
+            self._active = active_intervals([(curve, wrap) for field in self.fields
+                                             for curve, wrap in zip(field.curves, field.wraps)])
+        return self._active
+
+    def next_change_time(self, t: float) -> float:
+        """
+        不早于 t 的下一个变化时间：t 处于变化区间内时返回 t，处于保持段时返回保持段的结束时间，
+        之后不再变化时返回 inf
+        """
+        return next_active_time(self.active_intervals(), t)
+
+    def evaluate(self, t: float) -> Tuple[float, ...]:
+        """计算时间 t 处所有通道的值（展平后的元组），关键帧区间外按每条曲线的 wrap mode 映射"""
+        if profiling.ENABLED:
+            return self._evaluate_profiled(t)
+        values: List[float] = []
+        append = values.append
+        for field in self.fields:
+            if field.vector:
+                start, end, pre, post = field.wraps[0]
+                local = t if start <= t <= end else wrap_time(t, start, end, pre, post)
+                result = evaluate_curve(field.curves[0], local)
+                if isinstance(result, tuple):
+                    for index in field.indices:
+                        append(float(result[index]))
+                else:
+                    for _ in field.indices:
+                        append(float(result))
+            else:
+                for curve, factor, (start, end, pre, post) in zip(field.curves, field.factors, field.wraps):
+                    local = t if start <= t <= end else wrap_time(t, start, end, pre, post)
+                    append(float(evaluate_curve(curve, local)) * factor)
+        return tuple(values)
+
+    def evaluate_many(self, ts: np.ndarray) -> np.ndarray:
+        """
+        一次求出所有通道在一组时间上的值，形状 (len(ts), width)，列顺序与 layout 一致
+
+        每条曲线只调用一次 evaluate_curve_many（段内用 *_many 内核，numba 下不持有 GIL）；
+        与逐点调用 evaluate 的结果在浮点舍入范围内相同。
+        """
+        ts = np.asarray(ts, dtype=np.float64).reshape(-1)
+        lo, hi = (float(ts.min()), float(ts.max())) if len(ts) else (0.0, 0.0)
+        # 同一个 time_nodes 与 wrap 的曲线共用映射后的时间与分段结果
+        shared: Dict[Tuple[int, Tuple], Tuple[np.ndarray, List[Tuple[int, Any]]]] = {}
+
+        def local_times(curve, wrap):
+            key = (id(curve[1]), wrap)
+            entry = shared.get(key)
+            if entry is None:
+                start, end = wrap[0], wrap[1]
+                local = ts if start <= lo and hi <= end else wrap_times(ts, *wrap)
+                entry = shared[key] = local, (segment_runs(curve[1], local) if curve[0] else [])
+            return entry
+
+        columns: List[np.ndarray] = []
+        for field in self.fields:
+            if field.vector:
+                values = evaluate_curve_many(field.curves[0], *local_times(field.curves[0], field.wraps[0]))
+                columns += [values if values.ndim == 1 else values[:, index] for index in field.indices]
+            else:
+                for curve, factor, wrap in zip(field.curves, field.factors, field.wraps):
+                    columns.append(evaluate_curve_many(curve, *local_times(curve, wrap)) * factor)
+        return np.column_stack(columns) if columns else np.empty((len(ts), 0))
+
+    def _evaluate_profiled(self, t: float) -> Tuple[float, ...]:
+        """与 evaluate 相同，并按曲线类型记录二分查找（segment_search）与插值（interpolate.<kind>）的耗时"""
+        values: List[float] = []
+        append = values.append
+        search_ns = 0
+        curves = 0
+        for field in self.fields:
+            interpolate_ns = 0
+            if field.vector:
+                start, end, pre, post = field.wraps[0]
+                local = t if start <= t <= end else wrap_time(t, start, end, pre, post)
+                result, searched, interpolated = _evaluate_curve_timed(field.curves[0], local)
+                search_ns += searched
+                interpolate_ns += interpolated
+                curves += 1
+                if isinstance(result, tuple):
+                    for index in field.indices:
+                        append(float(result[index]))
+                else:
+                    for _ in field.indices:
+                        append(float(result))
+                profiling.record(f'interpolate.{field.kind}', interpolate_ns, self.source)
+            else:
+                for curve, factor, (start, end, pre, post) in zip(field.curves, field.factors, field.wraps):
+                    local = t if start <= t <= end else wrap_time(t, start, end, pre, post)
+                    result, searched, interpolated = _evaluate_curve_timed(curve, local)
+                    search_ns += searched
+                    interpolate_ns += interpolated
+                    append(float(result) * factor)
+                curves += len(field.curves)
+                profiling.record(f'interpolate.{field.kind}', interpolate_ns, self.source, len(field.curves))
+        profiling.record('segment_search', search_ns, self.source, curves)
+        return tuple(values)
+
+    def assemble(self, values: Sequence[float]) -> Dict[str, Any]:
+        """把展平的通道值还原为 play_frame 的输出字典"""
+        dic: Dict[str, Any] = {}
+        offset = 0
+        for field in self.fields:
+            end = offset + field.width
+            if field.tuple_output:
+                dic[field.key] = tuple(float(v) for v in values[offset:end])
+            else:
+                dic[field.key] = float(values[offset])
+            offset = end
+        return dic
+
+
+# 只影响时间映射或事件方向、不改变通道布局与值的 kwargs，不计入 plan_key
+_TIME_KWARGS = frozenset(('time_reverse', 'event_time_reverse'))
+
+
+def plan_key(typed_kwargs: Mapping[str, Any]) -> Optional[Tuple]:
+    """
+    kwargs 的可哈希键；包含不可哈希的值（如 list）时返回 None
+
+    time_reverse / event_time_reverse 由播放器在求值前处理，不计入键，因此切换播放方向后
+    仍使用同一个 SamplingPlan（以及它的烘焙表与帧缓存）。
+    """
+    key = tuple(item for item in typed_kwargs.items() if item[0] not in _TIME_KWARGS)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
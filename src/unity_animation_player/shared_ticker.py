@@ -0,0 +1,98 @@
+import math
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+from qtpy.QtCore import Qt, QTimer
+
+from . import tracing
+from .config import FPS
+
+
+class SharedTicker:
+    """
+    进程内共享的动画时钟
+
+    所有正在播放的 SignalAnimationPlayer 注册到同一个 QTimer 上，每次 timeout 在一个回调里依次推进，
+    因此 100 个播放器只唤醒事件循环一次，节拍不会相互漂移，发出的信号也集中在同一轮事件处理中。
+    同一次 tick 内，片段、参数与时间都相同的播放器只计算一次曲线（见 PlaybackState.batch）。
+    所有播放器都处于保持段（见 AnimationPlayer.next_change_time）时，定时器改为在最早的变化时刻唤醒，
+    之后永远不再变化时停止定时器。
+    """
+
+    _instance: Optional['SharedTicker'] = None
+    lock = nullcontext()  # 在 GUI 线程中推进，无需加锁（WorkerTicker 为真正的锁）
+
+    def __init__(self, fps: float = FPS):
+        self.interval = 1 / fps
+        self.ticks = 0
+        self._players: Dict[Any, None] = {}  # 有序集合，按注册顺序推进
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+    @classmethod
+    def instance(cls) -> 'SharedTicker':
+        """返回全局共享的 ticker（首次调用时创建，需要已有 QApplication）"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register(self, player) -> None:
+        self._players[player] = None
+        self.wake()
+
+    def wake(self) -> None:
+        """恢复正常帧率（新的播放器加入、播放器跳转时调用）"""
+        interval_ms = round(self.interval * 1000)
+        if self._players and (not self.timer.isActive() or self.timer.interval() != interval_ms):
+            self.timer.start(interval_ms)
+
+    def unregister(self, player) -> None:
+        self._players.pop(player, None)
+        if not self._players:
+            self.timer.stop()
+
+    def is_registered(self, player) -> bool:
+        return player in self._players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def _tick(self) -> None:
+        if tracing.ENABLED:
+            with tracing.span('shared_tick', 'tick', players=len(self._players)):
+                return self._tick_players()
+        self._tick_players()
+
+    def _tick_players(self) -> None:
+        self.ticks += 1
+        now_ns = time.perf_counter_ns()  # 所有播放器使用同一个时间戳，同时开始的播放器时间完全一致
+        batch: Dict[Any, Any] = {}
+        for player in tuple(self._players):
+            if player._wake_ns is not None and player._wake_ns > now_ns:
+                continue  # 保持段中，值不会变化
+            state = player.state
+            state.batch = batch
+            try:
+                player._pyside_play_frame(now_ns)
+            finally:
+                state.batch = None
+        self._rearm(now_ns)
+
+    def _rearm(self, now_ns: int) -> None:
+        """根据各播放器的唤醒时间调整定时器间隔"""
+        if not self._players:
+            return
+        wakes = [player._wake_ns for player in self._players]
+        if any(wake is None for wake in wakes):
+            self.wake()
+            return
+        earliest = min(wakes)
+        if earliest == math.inf:
+            self.timer.stop()
+            return
+        self.timer.start(max(1, math.ceil((earliest - now_ns) / 1e6)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {'players': len(self._players), 'ticks': self.ticks, 'interval': self.interval}
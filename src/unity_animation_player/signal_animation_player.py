@@ -1,41 +1,207 @@
-from typing import Any, Dict, Tuple, Union
+import math
+import time
+from array import array
+from contextlib import nullcontext
+from typing import Any, Dict, Literal, Optional, Tuple, Union
 from qtpy.QtCore import QTimer, Signal
 from .animation_player import AnimationPlayer
+from .shared_ticker import SharedTicker
+from .worker_ticker import WorkerTicker
+from .wrap_modes import ONCE
 
 from .kwargs import type_kwargs
 
+from . import config, tracing
 from .config import FPS
 
 class SignalAnimationPlayer(AnimationPlayer):
     def __init__(self, signal: Signal, file_path: str, stop_time: float = None,
+                 emit_epsilon: Optional[float] = None, payload: Literal['dict', 'tuple', 'array'] = 'dict',
                  **kwargs: Union[str, bool, Tuple, float]):
-        """All available kwargs are listed in kwargs.py"""
-        
+        """
+        All available kwargs are listed in kwargs.py
+
+        emit_epsilon: 给定时只在某个通道的变化超过该值（或有事件触发）时才发出信号，None 表示每帧都发出
+        payload: 信号内容，'dict' 为 play_frame 的字典；'tuple' / 'array' 为按 payload_layout 排列的
+                 展平通道值（tuple 或 array('d')），不包含 events 与 playable
+        """
+        if payload not in ('dict', 'tuple', 'array'):
+            raise ValueError(f"payload must be 'dict', 'tuple' or 'array', got {payload!r}")
+        wrap_mode = kwargs.pop('wrap_mode', None)
         self.parameters = type_kwargs(**kwargs)
 
-        super().__init__(file_path, stop_time)
+        super().__init__(file_path, stop_time, wrap_mode)
 
         self.signal = signal
         self.mode = 1  # 0: stop, >0: forward_play, <0: backward_play
         self.time_reverse = False
         self.t = 0
         self.delta_t = 1/FPS
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._pyside_play_frame)
+        # 播放时间由单调时钟推导：t = _anchor_t + (now - _anchor_ns) * mode，首个 tick 时确定锚点
+        self._anchor_t = 0
+        self._anchor_ns: Optional[int] = None
+        self._frame_index = 0
+        self.late_ticks = 0  # 晚于预期、跨过了至少一帧的 tick 数
+        self.skipped_frames = 0  # 因此未渲染的帧数（这些区间内的事件仍会触发一次）
+        self.emit_epsilon = emit_epsilon
+        self.payload = payload
+        self._last_values: Optional[Tuple[float, ...]] = None
+        self.emitted = 0  # 发出的信号数
+        # 处于保持段时下一次需要播放的 perf_counter_ns 时间（inf 表示不再变化），None 表示每帧都要播放
+        self._wake_ns: Optional[float] = None
+        self.suppressed = 0  # 因变化不超过 emit_epsilon 而省略的帧数
+        # 使用共享时钟（或后台求值线程）时不创建自己的 QTimer，play/stop 时自动注册/注销
+        if config.WORKER_THREAD:
+            self.ticker = WorkerTicker.instance()
+        elif config.SHARED_TICKER:
+            self.ticker = SharedTicker.instance()
+        else:
+            self.ticker = None
+        self.timer = None
+        self._lock = nullcontext()  # 后台求值时与工作线程互斥
+        if self.ticker is None:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self._pyside_play_frame)
+        else:
+            self._lock = self.ticker.lock
+
+    def _advance_clock(self, now_ns: Optional[int] = None) -> None:
+        """按单调时钟更新 self.t，并统计迟到的 tick 与跳过的帧"""
+        now_ns = time.perf_counter_ns() if now_ns is None else now_ns
+        if self._anchor_ns is None:
+            self._anchor_ns = now_ns
+            self._frame_index = 0
+            return
+        elapsed = (now_ns - self._anchor_ns) / 1e9
+        frame_index = int(elapsed / self.delta_t + 0.5)
+        advanced = frame_index - self._frame_index
+        slept = self._wake_ns is not None
+        self._wake_ns = None
+        if advanced > 1 and not slept:
+            self.late_ticks += 1
+            self.skipped_frames += advanced - 1
+        self._frame_index = max(self._frame_index, frame_index)
+        self.t = self._anchor_t + elapsed * self.mode
+
+        # once 模式下越过终点前先播放终点帧，保证最后一段区间内的事件与最终状态不会被跳过
+        previous = self.state.time
+        if self.wrap_mode == ONCE and previous is not None and self.mode != 0:
+            end = self.stop_time if self.mode > 0 else 0
+            if (self.t - end) * self.mode > 0 and previous != end:
+                self.t = end
+
+    def _pyside_play_frame(self, now_ns: Optional[int] = None):
+        """now_ns: 本次 tick 的 perf_counter_ns 时间戳（共享时钟为所有播放器传入同一个值）"""
+        start = tracing.clock() if tracing.ENABLED else 0
+        payload, finished = self._next_frame(now_ns)
+        if payload is not None:
+            self.signal.emit(payload)
+        if finished:
+            self.stop()
+        if start:
+            tracing.complete('tick', 'tick', start, tracing.clock(),
+                             {'t': self.t, 'source': self.clip.source, 'emitted': payload is not None})
+
+    def _next_frame(self, now_ns: Optional[int] = None, advanced: bool = False) -> Tuple[Any, bool]:
+        """
+        推进一帧，返回 (信号内容, 是否播放结束)；本帧省略时信号内容为 None
 
-    def _pyside_play_frame(self):
-        result, self.playable = self.play_frame(self.t, **self.parameters)
-        result ['playable'] = self.playable
+        不发出信号也不停止播放，因此可以在工作线程中调用（见 WorkerTicker）
+        advanced: 调用方已经调用过 _advance_clock(now_ns)（WorkerTicker 先推进所有时钟再批量求值）
+        """
+        if not advanced:
+            self._advance_clock(now_ns)
+        plan, values, events = self._play(self.t, self.parameters)
+        self.playable = plan is not None
 
         if self.playable:
-            self.signal.emit(result)
-        else:
-            self.signal.emit(self.return_default(path=self.parameters['path'])[0])
+            self._schedule_wake()
+            if not (self._changed(values) or events):
+                self.suppressed += 1
+                return None, False
+            self._last_values = values
+            self.emitted += 1
+            if self.payload == 'dict':
+                result = plan.assemble(values)
+                result['events'] = events
+                result['playable'] = True
+                return result, False
+            return self._compact(values), False
+
+        self.emitted += 1
+        if self.payload == 'dict':
+            return self.return_default(path=self.parameters['path'])[0], True
+        return self._compact(self._default_values()), True
+
+    def _sample_request(self) -> Optional[Tuple[Any, float]]:
+        """
+        当前帧需要求值的 (SamplingPlan, 采样时间)，供 WorkerTicker 合并批量求值
+
+        不可播放、plan 不可共享、已烘焙或启用帧缓存（已经按时间共享）时返回 None
+        """
+        sample_time = self._sample_time(self.t, self.parameters)
+        if sample_time is None or self.clip.frame_memo.enabled:
+            return None
+        plan = self.clip.plan(self.parameters)
+        baked = self.state.baked
+        if plan.key is None or (baked is not None and baked.plan is plan):
+            return None
+        return plan, sample_time
+
+    def _schedule_wake(self) -> None:
+        """
+        当前帧已经处于保持段、且保持到下一帧之后时，记录下一次变化的时间并让定时器在那之前休眠
+
+        按当前帧 self.t 判断而不是下一帧：下一帧才进入保持段时，保持段起点的值还没有发出，
+        必须先正常播放下一帧，否则会直接从变化区间内的值睡到保持段结束。
+        """
+        if self.mode > 0 and self._anchor_ns is not None:
+            next_t = self.t + self.delta_t * self.mode
+            change = self.next_change_time(self.t, **self.parameters)
+            if change > next_t:
+                # 倒放时保守地逐帧播放
+                self._wake_ns = (math.inf if change == math.inf
+                                 else self._anchor_ns + (change - self._anchor_t) / self.mode * 1e9)
+        if self.timer is None:
+            return
+        if self._wake_ns is None:
+            interval_ms = round(self.delta_t * 1000)
+            if self.timer.interval() != interval_ms:
+                self.timer.start(interval_ms)
+        elif self._wake_ns == math.inf:
             self.timer.stop()
+        else:
+            self.timer.start(max(1, math.ceil((self._wake_ns - time.perf_counter_ns()) / 1e6)))
+
+    def _changed(self, values: Tuple[float, ...]) -> bool:
+        """与上一次发出的帧相比，是否有通道变化超过 emit_epsilon"""
+        last = self._last_values
+        if self.emit_epsilon is None or last is None or len(last) != len(values):
+            return True
+        epsilon = self.emit_epsilon
+        for a, b in zip(values, last):
+            if abs(a - b) > epsilon:
+                return True
+        return False
+
+    def _compact(self, values: Tuple[float, ...]):
+        return array('d', values) if self.payload == 'array' else tuple(values)
+
+    def _default_values(self) -> Tuple[float, ...]:
+        """与 return_default 相同的默认值（scale 为 1，其余为 0），按 payload_layout 排列"""
+        return tuple(1.0 if key == 'scale' else 0.0
+                     for key, width in self.clip.plan(self.parameters).layout for _ in range(width))
 
-        self.t += self.delta_t * self.mode
+    @property
+    def payload_layout(self) -> Tuple[str, ...]:
+        """紧凑信号中每个值对应的通道名，如 ('position[0]', 'position[1]', 'scale[0]')"""
+        return self.clip.plan(self.parameters).channel_names
 
     def play(self, t: float = None, mode: Union[int, float] = None):
+        with self._lock:
+            self._play_locked(t, mode)
+
+    def _play_locked(self, t: float = None, mode: Union[int, float] = None):
         if mode is not None:
             self.set_mode(mode)
 
@@ -45,16 +211,55 @@ class SignalAnimationPlayer(AnimationPlayer):
             self.set_time(0)
         else:
             self.set_time(self.stop_time)
+        self.state.time = None
+        self.late_ticks = 0
+        self.skipped_frames = 0
+        self._last_values = None
 
-        self.timer.start(self.delta_t * 1000)
+        if self.ticker is not None:
+            self.ticker.register(self)
+        else:
+            self.timer.start(round(self.delta_t * 1000))
 
     def stop(self):
-        self.timer.stop()
+        with self._lock:
+            self._stop_locked()
+
+    def _stop_locked(self):
+        if self.ticker is not None:
+            self.ticker.unregister(self)
+        else:
+            self.timer.stop()
+
+    @property
+    def is_playing(self) -> bool:
+        if self.ticker is not None:
+            return self.ticker.is_registered(self)
+        return self.timer.isActive()
+
+    def _reanchor(self) -> None:
+        """以当前时间重新确定时钟锚点（下一个 tick 从 self.t 开始计时）"""
+        self._anchor_t = self.t
+        self._anchor_ns = None
+        if self._wake_ns is not None:
+            self._wake_ns = None
+            if self.is_playing:
+                self._resume_timer()
+
+    def _resume_timer(self) -> None:
+        if self.ticker is not None:
+            self.ticker.wake()
+        else:
+            self.timer.start(round(self.delta_t * 1000))
 
     def set_time(self, t: float):
-        self.t = t
+        with self._lock:
+            self.t = t
+            self._reanchor()
 
     def set_mode(self, mode: Union[int, float]):
-        self.mode = mode
-        self.parameters['event_time_reverse'] = mode < 0
+        with self._lock:
+            self.mode = mode
+            self.parameters['event_time_reverse'] = mode < 0
+            self._reanchor()
 
@@ -0,0 +1,131 @@
+"""
+导出 Chrome trace-event 格式的时间线（可在 chrome://tracing 或 https://ui.perfetto.dev 中打开）
+
+    import unity_animation_player as uap
+    uap.start_trace('animation_trace.json')
+    ...  # 加载、播放
+    uap.stop_trace()  # 写入文件
+
+记录的区间（cat / name）:
+    load / load_clip, load_yaml   片段加载与 YAML / JSON 缓存读取
+    load / parse, lut_build       构建插值器与查找表
+    jit / jit_warmup              numba 预编译
+    frame / play_frame            每次 AnimationPlayer.play_frame
+    tick / tick                   每次 SignalAnimationPlayer 的 tick（求值 + 发出信号）
+    tick / shared_tick, worker_step, worker_deliver
+                                  SharedTicker / WorkerTicker 的一轮推进
+    event / <functionName>        每次事件回调的执行（同步调用或在 dispatcher 的线程中）
+
+每个区间带有线程 id，线程名作为元数据写入。关闭时（默认）热路径上只多一次模块属性判断。
+环境变量 UNITY_ANIMATION_PLAYER_TRACE=<文件路径> 在导入 unity_animation_player 包时开始记录
+（包的 __init__ 此时会立即导入本模块），并在进程退出时写入该文件。
+"""
+import atexit
+import json
+import os
+import threading
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional
+
+from . import config
+
+# 热路径上通过 tracing.ENABLED 判断，修改请使用 start_trace / stop_trace
+ENABLED = False
+
+_events: List[Dict[str, Any]] = []
+_thread_names: Dict[int, str] = {}
+_path: Optional[str] = None
+_origin_ns = 0
+_max_events = 0
+dropped = 0
+
+clock = perf_counter_ns
+
+
+def start_trace(path: str = 'animation_trace.json', max_events: int = 1_000_000) -> None:
+    """
+    开始记录（已在记录时丢弃之前的区间重新开始）
+
+    path: stop_trace 时写入的文件
+    max_events: 最多保留的区间数，超出后新的区间被丢弃（见 trace_status 的 dropped）
+    """
+    global ENABLED, _path, _origin_ns, _max_events, dropped
+    _events.clear()
+    _thread_names.clear()
+    _path = path
+    _origin_ns = clock()
+    _max_events = max_events
+    dropped = 0
+    ENABLED = True
+
+
+def stop_trace() -> Optional[str]:
+    """停止记录并写入文件，返回文件路径；未在记录时返回 None"""
+    global ENABLED
+    if not ENABLED:
+        return None
+    ENABLED = False
+    events = list(_events)
+    pid = os.getpid()
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                 'args': {'name': 'unity_animation_player'}}]
+    metadata += [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in _thread_names.items()]
+    directory = os.path.dirname(os.path.abspath(_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                   'otherData': {'dropped_events': dropped, 'backend': config.BACKEND}}, f)
+    _events.clear()
+    return _path
+
+
+def trace_status() -> Dict[str, Any]:
+    return {'enabled': ENABLED, 'path': _path, 'events': len(_events), 'dropped': dropped}
+
+
+def complete(name: str, cat: str, start_ns: int, end_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+    """记录一个已结束的区间（perf_counter_ns 时间戳）"""
+    global dropped
+    if len(_events) >= _max_events:
+        dropped += 1
+        return
+    tid = threading.get_native_id()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    event = {'name': name, 'cat': cat, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+             'ts': (start_ns - _origin_ns) / 1e3, 'dur': (end_ns - start_ns) / 1e3}
+    if args:
+        event['args'] = args
+    _events.append(event)  # list.append 在 GIL 下是原子的，多个线程可以同时记录
+
+
+class span:
+    """
+    记录一个区间的上下文，未在记录时不计时
+
+        with tracing.span('load_clip', 'load', path=path):
+            ...
+    """
+
+    __slots__ = ('name', 'cat', 'args', '_start')
+
+    def __init__(self, name: str, cat: str, **args: Any):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self._start = 0
+
+    def __enter__(self) -> 'span':
+        if ENABLED:
+            self._start = clock()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if ENABLED and self._start:
+            complete(self.name, self.cat, self._start, clock(), self.args)
+
+
+if config.TRACE:
+    start_trace(config.TRACE)
+    atexit.register(stop_trace)
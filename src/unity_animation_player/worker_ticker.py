@@ -0,0 +1,205 @@
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+from qtpy.QtCore import QObject, Qt, Signal
+
+from . import config, tracing
+from .config import FPS
+
+
+class _Bridge(QObject):
+    """在创建 WorkerTicker 的（GUI）线程中接收工作线程的投递通知"""
+
+    ready = Signal()
+
+
+class WorkerTicker:
+    """
+    在后台线程中求值的共享动画时钟
+
+    接口与 SharedTicker 相同：所有注册的 SignalAnimationPlayer 在一个工作线程中按固定帧率推进
+    （第 n 个 tick 的截止时间为 start + n / fps，不会漂移），求值与事件查询都不占用 GUI 线程。
+    算好的信号内容放入发件箱，通过一个排队连接（QueuedConnection）交给 GUI 线程统一发出：
+    GUI 线程来不及处理时，同一个播放器只保留最新一帧（之前帧的 events 合并到最新帧中）。
+
+    注意：register_event 注册的回调在工作线程中调用，需要操作界面时请通过信号转交 GUI 线程。
+    播放器的 play / stop / set_time / set_mode 持有 lock，与工作线程的求值互斥；
+    发件箱由单独的短锁保护，GUI 线程取走信号内容时不会等待正在进行的求值。
+    """
+
+    _instance: Optional['WorkerTicker'] = None
+
+    def __init__(self, fps: float = FPS):
+        self.interval = 1 / fps
+        self.ticks = 0
+        self.late_ticks = 0
+        self.skipped_frames = 0
+        self.delivered = 0  # GUI 线程发出的信号数
+        self.coalesced = 0  # 被更新的帧覆盖、没有单独发出的帧数
+        self.batched = 0  # 由 SamplingPlan.evaluate_many 批量求出的帧数
+        self.lock = threading.RLock()
+        self._cond = threading.Condition(self.lock)
+        self._players: Dict[Any, None] = {}  # 有序集合，按注册顺序推进
+        # 发件箱只在放入 / 取出时短暂加锁，不与持有 lock 的整个求值过程互斥
+        self._outbox_lock = threading.Lock()
+        self._outbox: Dict[Any, Any] = {}  # {播放器: 待发出的信号内容}
+        self._posted = False  # 是否已经通知 GUI 线程、尚未处理（由 _outbox_lock 保护）
+        self._woken = False
+        self._thread: Optional[threading.Thread] = None
+        self._bridge = _Bridge()
+        self._bridge.ready.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    @classmethod
+    def instance(cls) -> 'WorkerTicker':
+        """返回全局共享的 ticker（首次调用时创建，应在 GUI 线程中调用）"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register(self, player) -> None:
+        with self._cond:
+            self._players[player] = None
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='AnimationWorker', daemon=True)
+                self._thread.start()
+            else:
+                self.wake()
+
+    def wake(self) -> None:
+        """立即唤醒工作线程（新的播放器加入、播放器跳转时调用）"""
+        with self._cond:
+            self._woken = True
+            self._cond.notify()
+
+    def unregister(self, player) -> None:
+        with self._cond:
+            self._players.pop(player, None)
+            self._cond.notify()
+
+    def is_registered(self, player) -> bool:
+        return player in self._players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def _run(self) -> None:
+        interval_ns = round(self.interval * 1e9)
+        start = time.perf_counter_ns()
+        tick = 0
+        with self._cond:
+            while self._players:
+                self.ticks += 1
+                self._step(time.perf_counter_ns())
+                if not self._players:
+                    break
+
+                # 下一个截止时间按 tick 序号计算；所有播放器都在保持段时休眠到最早的唤醒时间
+                target = tick + 1
+                wakes = [player._wake_ns for player in self._players]
+                if all(wake is not None for wake in wakes):
+                    earliest = min(wakes)
+                    target = math.inf if earliest == math.inf else max(target, math.ceil((earliest - start) / interval_ns))
+                self._woken = False
+                if target == math.inf:
+                    self._cond.wait()
+                else:
+                    self._cond.wait(max(start + target * interval_ns - time.perf_counter_ns(), 0) / 1e9)
+                now_tick = (time.perf_counter_ns() - start) // interval_ns
+                if self._woken or target == math.inf:
+                    tick = max(now_tick, tick + 1)  # 提前唤醒：从当前时刻继续
+                elif now_tick > target:
+                    self.late_ticks += 1
+                    self.skipped_frames += now_tick - target
+                    tick = now_tick
+                else:
+                    tick = target
+            self._thread = None
+
+    def _step(self, now_ns: int) -> None:
+        """
+        推进一个 tick（持有 lock）：所有播放器共享同一个 batch 缓存
+
+        先推进所有到期播放器的时钟，同一个 SamplingPlan 在本 tick 中有至少 config.WORKER_BATCH_MIN
+        个不同采样时间时，用 SamplingPlan.evaluate_many 一次求出并预先填入 batch（*_many 内核不持有 GIL），
+        其余的仍在 _next_frame 中逐个求值。
+        """
+        start = tracing.clock() if tracing.ENABLED else 0
+        batch: Dict[Any, Any] = {}
+        due = [player for player in tuple(self._players)
+               if player._wake_ns is None or player._wake_ns <= now_ns]  # 保持段中的播放器值不会变化
+        for player in due:
+            player._advance_clock(now_ns)
+        if len(due) >= config.WORKER_BATCH_MIN:
+            self._prefill(batch, due)
+        for player in due:
+            state = player.state
+            state.batch = batch
+            try:
+                payload, finished = player._next_frame(now_ns, advanced=True)
+            finally:
+                state.batch = None
+            if payload is not None:
+                self._post(player, payload)
+            if finished:
+                player.stop()
+        if start:
+            tracing.complete('worker_step', 'tick', start, tracing.clock(), {'players': len(self._players)})
+
+    def _prefill(self, batch: Dict[Any, Any], players) -> None:
+        """按 SamplingPlan 合并本 tick 的采样时间，足够多时批量求值并写入 batch"""
+        requests: Dict[Any, Dict[float, None]] = {}
+        for player in players:
+            request = player._sample_request()
+            if request is not None:
+                requests.setdefault(request[0], {})[request[1]] = None
+        for plan, times in requests.items():
+            if len(times) < config.WORKER_BATCH_MIN:
+                continue
+            ts = list(times)
+            rows = plan.evaluate_many(np.array(ts, dtype=np.float64)).tolist()
+            for t, row in zip(ts, rows):
+                batch[(plan, t)] = tuple(row)
+            self.batched += len(ts)
+
+    def _post(self, player, payload) -> None:
+        with self._outbox_lock:
+            previous = self._outbox.get(player)
+            if previous is not None:
+                self.coalesced += 1
+                if isinstance(payload, dict) and isinstance(previous, dict) and previous.get('events'):
+                    payload['events'] = previous['events'] + payload.get('events', [])
+            self._outbox[player] = payload
+            notify = not self._posted
+            self._posted = True
+        if notify:
+            self._bridge.ready.emit()
+
+    def _deliver(self) -> None:
+        """在 GUI 线程中发出发件箱中的最新帧（只持有 _outbox_lock，工作线程求值期间也不会阻塞）"""
+        start = tracing.clock() if tracing.ENABLED else 0
+        with self._outbox_lock:
+            outbox, self._outbox = self._outbox, {}
+            self._posted = False
+            self.delivered += len(outbox)
+        for player, payload in outbox.items():
+            player.signal.emit(payload)
+        if start:
+            tracing.complete('worker_deliver', 'tick', start, tracing.clock(), {'frames': len(outbox)})
+
+    def stats(self) -> Dict[str, Any]:
+        # 计数器只由工作线程（或在 _outbox_lock 内）递增，读取时无需等待正在进行的求值
+        with self._outbox_lock:
+            delivered, coalesced = self.delivered, self.coalesced
+        return {
+            'players': len(self._players),
+            'ticks': self.ticks,
+            'interval': self.interval,
+            'late_ticks': self.late_ticks,
+            'skipped_frames': self.skipped_frames,
+            'delivered': delivered,
+            'coalesced': coalesced,
+            'batched': self.batched,
+        }
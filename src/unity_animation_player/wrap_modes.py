@@ -0,0 +1,125 @@
+import math
+from typing import List, Literal, Tuple
+
+import numpy as np
+
+WrapMode = Literal['once', 'clamp', 'loop', 'ping_pong', 'auto']
+
+ONCE = 'once'            # 超出 [0, stop_time] 后不再播放（原有行为）
+CLAMP = 'clamp'          # 保持端点值
+LOOP = 'loop'            # 循环
+PING_PONG = 'ping_pong'  # 往返
+AUTO = 'auto'            # 由片段的 m_LoopTime 决定：为 1 时 loop，否则 once（只能作为参数，不会被保存）
+
+WRAP_MODES = (ONCE, CLAMP, LOOP, PING_PONG)
+
+# AnimationCurve 序列化的 m_PreInfinity / m_PostInfinity 取值（Unity 内部 WrapMode）
+_UNITY_INFINITY = {0: PING_PONG, 1: LOOP, 2: CLAMP}
+
+
+def unity_wrap_mode(value: int) -> str:
+    """把 m_PreInfinity / m_PostInfinity 的整数值转换为 wrap mode，未知值按 clamp 处理"""
+    return _UNITY_INFINITY.get(value, CLAMP)
+
+
+def check_wrap_mode(wrap_mode: str) -> str:
+    if wrap_mode not in WRAP_MODES:
+        raise ValueError(f"wrap_mode must be one of {WRAP_MODES}, got {wrap_mode!r}")
+    return wrap_mode
+
+
+def resolve_wrap_mode(wrap_mode: str, loop_time: bool) -> str:
+    """把 'auto' 按 m_LoopTime 解析为 loop / once，其他取值同 check_wrap_mode"""
+    if wrap_mode == AUTO:
+        return LOOP if loop_time else ONCE
+    return check_wrap_mode(wrap_mode)
+
+
+def wrap_time(t: float, start: float, end: float, pre: str, post: str) -> float:
+    """
+    把时间 t 映射到曲线的关键帧区间 [start, end]，O(1)
+
+    t 在区间内时原样返回；t < start 时按 pre 处理，t > end 时按 post 处理。
+    """
+    if start <= t <= end:
+        return t
+    length = end - start
+    if length <= 0.0:
+        return start
+    mode = pre if t < start else post
+    if mode == LOOP:
+        return start + (t - start) % length
+    if mode == PING_PONG:
+        phase = (t - start) % (2.0 * length)
+        return start + (phase if phase <= length else 2.0 * length - phase)
+    return start if t < start else end
+
+
+def wrap_times(ts: np.ndarray, start: float, end: float, pre: str, post: str) -> np.ndarray:
+    """wrap_time 的数组版本：逐个元素与 wrap_time 的结果相同"""
+    ts = np.asarray(ts, dtype=np.float64)
+    length = end - start
+    if length <= 0.0:
+        return np.full(ts.shape, start)
+    out = ts.copy()
+    for side, mode, edge in ((ts < start, pre, start), (ts > end, post, end)):
+        if not side.any():
+            continue
+        t = ts[side]
+        if mode == LOOP:
+            out[side] = start + np.mod(t - start, length)
+        elif mode == PING_PONG:
+            phase = np.mod(t - start, 2.0 * length)
+            out[side] = start + np.where(phase <= length, phase, 2.0 * length - phase)
+        else:
+            out[side] = edge
+    return out
+
+
+def clip_cycle(t: float, duration: float, wrap_mode: str) -> Tuple[int, float]:
+    """
+    片段级循环：返回 (周期序号, 周期内的本地时间)
+
+    loop 与 ping_pong 的周期长度均为 duration，ping_pong 的奇数周期倒放；clamp 的周期恒为 0。
+    """
+    if wrap_mode == CLAMP or duration <= 0.0:
+        return 0, min(max(t, 0.0), max(duration, 0.0))
+    cycle = math.floor(t / duration)
+    local = t - cycle * duration
+    if wrap_mode == PING_PONG and cycle % 2:
+        local = duration - local
+    return cycle, local
+
+
+def cycle_spans(t_prev: float, t_now: float, duration: float,
+                wrap_mode: str) -> List[Tuple[float, float, bool]]:
+    """
+    把绝对时间区间 (t_prev, t_now] 按周期切分并映射为本地时间区间
+
+    返回 [(local_from, local_to, include_start), ...]，按播放顺序排列；
+    loop 的新周期从另一端重新开始，起点需要包含在内，因此 include_start 为 True；
+    ping_pong 的周期边界是折返点，上一周期的区间已经包含它，因此不再重复包含。
+    """
+    if wrap_mode == CLAMP or duration <= 0.0:
+        _, a = clip_cycle(t_prev, duration, wrap_mode)
+        _, b = clip_cycle(t_now, duration, wrap_mode)
+        return [(a, b, False)]
+
+    forward = t_now >= t_prev
+    c_prev = math.floor(t_prev / duration)
+    c_now = math.floor(t_now / duration)
+    step = 1 if forward else -1
+    spans = []
+    for c in range(c_prev, c_now + step, step):
+        c_start = c * duration
+        c_end = c_start + duration
+        if forward:
+            a, b = max(t_prev, c_start), min(t_now, c_end)
+        else:
+            a, b = min(t_prev, c_end), max(t_now, c_start)
+        include_start = c != c_prev and wrap_mode != PING_PONG
+        a, b = a - c_start, b - c_start
+        if wrap_mode == PING_PONG and c % 2:
+            a, b = duration - a, duration - b
+        spans.append((a, b, include_start))
+    return spans
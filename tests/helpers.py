@@ -0,0 +1,89 @@
+"""测试共用的片段与比较工具"""
+import glob
+import os
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+
+from unity_animation_player import AnimationClip, AnimationPlayer
+from unity_animation_player.cache_yaml import load_yaml
+from unity_animation_player.kwargs import type_kwargs
+from unity_animation_player.sampling_plan import SamplingPlan
+
+CLIP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'AnimationClip')
+EXAMPLE_CLIPS = sorted(glob.glob(os.path.join(CLIP_DIR, '*.anim')))
+
+
+def clip_path(name: str) -> str:
+    return os.path.join(CLIP_DIR, name)
+
+
+def load_example(name: str, backend: str = None) -> AnimationClip:
+    path = clip_path(name)
+    return AnimationClip.from_anim_dict(load_yaml(path), source=path, backend=backend)
+
+
+def full_kwargs(clip: AnimationClip, path: str, **overrides: Any) -> Dict[str, Any]:
+    """输出 path 上全部通道：欧拉角 xyz、四元数 xyzw、位置 / 缩放的所有分量"""
+    kinds = clip.anim[path]
+    kwargs: Dict[str, Any] = {'path': path, 'euler_unit': ('x', 'y', 'z'), 'rotation_unit': ('x', 'y', 'z', 'w')}
+    for kind, key in (('Position', 'position_unit'), ('Scale', 'scale_unit')):
+        if kind in kinds:
+            kwargs[key] = tuple(u for u in 'xyzw' if u in kinds[kind][0])
+    kwargs.update(overrides)
+    return type_kwargs(**kwargs)
+
+
+def angular_columns(plan: SamplingPlan) -> List[int]:
+    columns, offset = [], 0
+    for field in plan.fields:
+        if field.kind == 'Euler':
+            columns.extend(range(offset, offset + field.width))
+        offset += field.width
+    return columns
+
+
+def channel_errors(plan: SamplingPlan, values: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """每个采样、每个通道的绝对误差，欧拉角按角距离（相差 360 度视为相同）"""
+    errors = np.asarray(values, dtype=np.float64) - np.asarray(reference, dtype=np.float64)
+    columns = angular_columns(plan)
+    if columns:
+        errors[:, columns] = (errors[:, columns] + 180.0) % 360.0 - 180.0
+    return np.abs(errors)
+
+
+def evaluate(plan: SamplingPlan, ts) -> np.ndarray:
+    return np.array([plan.evaluate(float(t)) for t in ts], dtype=np.float64).reshape(len(ts), plan.width)
+
+
+def raw_event(t: float, name: str, **parameters: Any) -> Dict[str, Any]:
+    """m_Events 中的一个原始事件"""
+    event = {'time': t, 'functionName': name, 'data': '', 'objectReferenceParameter': None,
+             'floatParameter': 0.0, 'intParameter': 0, 'messageOptions': 0}
+    event.update(parameters)
+    return event
+
+
+def event_clip(events=None, stop_time: float = 1.0) -> AnimationClip:
+    """借用 UIAni_Popup_System 的曲线、指定时长与事件的片段，默认在 0 / 0.5 / 1 各有一个事件"""
+    if events is None:
+        events = [raw_event(0.0, 'start'), raw_event(0.5, 'middle'), raw_event(1.0, 'end')]
+    return AnimationClip(stop_time, dict(load_example('UIAni_Popup_System.anim').anim), events)
+
+
+class PathPlayer(AnimationPlayer):
+    """play_frame 默认输出片段的第一个 path"""
+
+    def play_frame(self, nowtime, **kwargs):
+        kwargs.setdefault('path', self.clip.paths[0])
+        return super().play_frame(nowtime, **kwargs)
+
+
+def event_names(result) -> List[str]:
+    """play_frame 结果中触发的事件名"""
+    return [name for name, _ in result[0].get('events', ())]
+
+
+def clip_paths(clips: Mapping[str, AnimationClip]):
+    """(片段名, path) 参数列表"""
+    return [(name, path) for name, clip in clips.items() for path in clip.paths]
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from unity_animation_player.animation_events import AnimationEvents, EventTimeline, HandlerRegistry
+
+from tests.helpers import PathPlayer, event_clip, event_names, raw_event
+
+PARAMETERS = {'data': '', 'objectReferenceParameter': None, 'floatParameter': 0.0, 'intParameter': 0,
+              'messageOptions': 0}
+
+def test_play_frame_returns_events_as_new_lists():
+    clip = event_clip()
+    first, second = PathPlayer(clip), PathPlayer(clip)
+    events = first.play_frame(0.6)[0]['events']
+    assert isinstance(events, list) and all(isinstance(event, list) for event in events)
+    assert events[0] == ['start', PARAMETERS]
+    # 修改返回的事件不影响共享的事件表
+    events[0][1]['data'] = 'changed'
+    events[0][0] = 'renamed'
+    assert second.play_frame(0.6)[0]['events'][0][0] == 'start'
+    assert second.events.get_events(1.0) == [['start', PARAMETERS], ['middle', PARAMETERS], ['end', PARAMETERS]]
+
+
+def test_editing_registered_events_rebinds_before_next_dispatch():
+    player = PathPlayer(event_clip())
+    calls = []
+    assert isinstance(player.registered_events, HandlerRegistry)
+    player.registered_events['middle'] = (calls.append, ('data',))
+    player.play_frame(0.6)
+    assert calls == ['']
+
+    del player.registered_events['middle']
+    player.play_frame(0.0)
+    player.play_frame(0.6)
+    assert calls == ['']
+
+    player.registered_events.update(end=(lambda value: calls.append(value), ('intParameter',)))
+    player.play_frame(1.0)
+    assert calls == ['', 0]
+
+
+def test_register_event_and_add_event_share_the_table():
+    player = PathPlayer(event_clip())
+    calls = []
+    player.register_event('late', calls.append, ('floatParameter',))
+    player.add_event(0.75, raw_event(0.75, 'late', floatParameter=2.5))
+    assert event_names(player.play_frame(0.8)) == ['start', 'middle', 'late']
+    assert calls == [2.5]
+    with pytest.raises(KeyError):
+        player.register_event('start', calls.append, ('missing',))
+
+
+def test_plain_dict_is_copied_into_a_registry():
+    registered = {'start': (print, ())}
+    events = AnimationEvents(timeline=EventTimeline.from_raw_events([raw_event(0.0, 'start')]), registered=registered)
+    assert isinstance(events.registered, HandlerRegistry) and events.registered == registered
+
+
+@pytest.mark.parametrize('t_from, t_to, include_start, expected', [
+    (0.0, 0.5, False, [1]),            # (0, 0.5]
+    (0.0, 0.5, True, [0, 1]),          # [0, 0.5]
+    (0.5, 0.5, False, []),
+    (0.5, 0.5, True, [1]),
+    (1.0, 0.0, False, [1, 0]),         # [0, 1) 降序
+    (1.0, 0.0, True, [2, 1, 0]),
+    (-np.inf, np.inf, False, [0, 1, 2]),
+])
+def test_index_range_boundaries(t_from, t_to, include_start, expected):
+    timeline = event_clip().event_timeline
+    assert list(timeline.index_range(t_from, t_to, include_start)) == expected
+
+
+def test_event_on_a_frame_time_fires_once():
+    player = PathPlayer(event_clip())
+    assert event_names(player.play_frame(0.0)) == ['start']
+    assert event_names(player.play_frame(0.5)) == ['middle']
+    assert event_names(player.play_frame(0.5)) == []
+    assert event_names(player.play_frame(1.0)) == ['end']
+    # 往回拖动：区间同样不含出发点、含到达点
+    assert event_names(player.play_frame(0.5)) == ['middle']
+    assert event_names(player.play_frame(0.0)) == ['start']
+
+
+def test_event_time_reverse_starts_from_the_end():
+    player = PathPlayer(event_clip())
+    assert event_names(player.play_frame(1.0, event_time_reverse=True)) == ['end']
+    assert event_names(player.play_frame(0.25, event_time_reverse=True)) == ['middle']
+
+
+def test_leaving_the_clip_resets_the_cursor():
+    player = PathPlayer(event_clip())
+    assert event_names(player.play_frame(1.0)) == ['start', 'middle', 'end']
+    assert player.play_frame(1.5) == ({}, False)
+    assert event_names(player.play_frame(0.6)) == ['start', 'middle']
+
+
+def test_get_events_consumes_each_event_once_from_both_ends():
+    events = AnimationEvents([raw_event(t, str(t)) for t in (0.0, 0.5, 1.0)])
+    assert [name for name, _ in events.get_events(0.5)] == ['0.0', '0.5']
+    assert [name for name, _ in events.get_events(0.5, time_reverse=True)] == ['1.0']
+    assert events.get_events(1.0) == [] and events.get_events(0.0, time_reverse=True) == []
+    events.reset_events()
+    assert len(events.get_events(1.0)) == 3
+
+
+def test_events_for_times_assigns_each_event_to_its_sample():
+    timeline = event_clip().event_timeline
+    sample_index, event_index = timeline.events_for_times([0.0, 0.4, 0.5, 0.9, 1.0])
+    assert sample_index.tolist() == [0, 2, 4] and event_index.tolist() == [0, 1, 2]
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from unity_animation_player import AnimationPlayer
+from unity_animation_player.async_scheduler import AsyncAnimationScheduler
+from unity_animation_player.kwargs import type_kwargs
+
+from tests.helpers import event_clip, event_names
+
+
+@pytest.mark.parametrize('t, speed, times, names', [
+    (0.0, 3.0, [0.0, 3 / 7, 6 / 7, 1.0], [['start'], [], ['middle'], ['end']]),
+    (1.0, -3.0, [1.0, 4 / 7, 1 / 7, 0.0], [['end'], [], ['middle'], ['start']]),
+])
+def test_once_plays_the_end_frame_when_ticks_do_not_divide_the_clip(t, speed, times, names):
+    # 7 fps、3 倍速：tick 之间相隔 3/7 秒，越过终点的 tick 在 9/7（倒放为 -2/7），修复前直接结束
+    player = AnimationPlayer(event_clip())
+    path = player.clip.paths[0]
+    plan = player.clip.plan(type_kwargs(path=path))
+    frames = []
+
+    async def main():
+        scheduler = AsyncAnimationScheduler(fps=7)
+        done = scheduler.add(player, frames.append, t=t, speed=speed, path=path, event_time_reverse=speed < 0)
+        await asyncio.wait_for(done, 5.0)
+        assert len(scheduler) == 0
+
+    asyncio.run(main())
+    assert [frame['time'] for frame in frames] == pytest.approx(times)
+    assert [event_names((frame,)) for frame in frames] == names
+    end = plan.assemble(plan.evaluate(times[-1]))
+    assert {key: frames[-1][key] for key in end} == end
@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pytest
+
+from tests.helpers import EXAMPLE_CLIPS, channel_errors, evaluate, full_kwargs, load_example
+
+
+@pytest.fixture(scope='module')
+def shake():
+    return load_example('UIAni_SC_Char_Shake_3.anim')
+
+
+@pytest.mark.parametrize('dtype, tolerance', [(np.float64, 1e-9), (np.float32, 1e-4)])
+def test_euler_blend_takes_shorter_arc_across_180(shake, dtype, tolerance):
+    # euler[2] 在第 23、24 帧之间从 179.x 跨到 -179.x；直接线性混合曾在 t≈0.3917 得到约 -0.7
+    plan = shake.plan(full_kwargs(shake, 'general'))
+    table = shake.bake(plan, 60, shake.stop_time, dtype)
+    value = table.sample(0.3917)[2]
+    assert abs(abs(value) - 180.0) < 0.1
+    assert -180.0 <= value <= 180.0
+
+    ts = np.linspace(0.0, shake.stop_time, 2001)
+    baked = np.array([table.sample(float(t)) for t in ts])
+    assert channel_errors(plan, baked, evaluate(plan, ts))[:, :3].max() < tolerance
+
+
+@pytest.mark.parametrize('clip_file', EXAMPLE_CLIPS, ids=os.path.basename)
+def test_baked_frames_equal_exact_values(clip_file):
+    clip = load_example(os.path.basename(clip_file))
+    for path in clip.paths:
+        plan = clip.plan(full_kwargs(clip, path))
+        table = clip.bake(plan, 60, clip.stop_time)
+        np.testing.assert_array_equal(np.array([table.frame(i) for i in range(table.n_frames)]),
+                                      evaluate(plan, table.times))
+
+
+def test_nearest_frame_does_not_blend(shake):
+    plan = shake.plan(full_kwargs(shake, 'general'))
+    table = shake.bake(plan, 60, shake.stop_time, blend=False)
+    for t in (0.3917, 0.1, 0.2583, 0.61):
+        assert table.sample(t) == table.frame(round(t * 60))
+
+
+def test_plan_key_ignores_time_direction_flags(shake):
+    plan = shake.plan(full_kwargs(shake, 'general'))
+    assert shake.plan(full_kwargs(shake, 'general', event_time_reverse=True)) is plan
+    assert shake.plan(full_kwargs(shake, 'general', time_reverse=True)) is plan
+    assert shake.plan(full_kwargs(shake, 'general', position_ratio=2.0)) is not plan
+
+
+def test_baked_table_survives_reversing_event_direction():
+    # SignalAnimationPlayer.set_mode(-1) 会写入 event_time_reverse，之后仍应查烘焙表
+    from unity_animation_player import AnimationPlayer
+
+    player = AnimationPlayer(load_example('UIAni_SC_Char_Shake_3.anim'))
+    kwargs = dict(euler_unit=('x', 'y', 'z'), position_unit=('x', 'y'))
+    table = player.bake(**kwargs)
+    t = 0.3917
+    exact = player.clip.plan(full_kwargs(player.clip, 'general', **kwargs)).evaluate(t)
+    assert table.sample(t) != exact  # 在帧之间，烘焙值与精确值不同
+    for event_time_reverse in (False, True):
+        player.state.time = None
+        result, valid = player.play_frame(t, event_time_reverse=event_time_reverse, **kwargs)
+        assert valid
+        assert result['euler'] + result['position'] == table.sample(t)
+
+
+def test_bake_cache_separates_lut_and_exact_clips(tmp_path, monkeypatch):
+    # 查找表片段与精确片段的 plan.key 相同；修复前先烘焙查找表片段后，精确片段会读到查找表的值（误差约 3e-3）
+    from unity_animation_player import cache_yaml
+    from unity_animation_player.animation_clip import AnimationClip
+    from unity_animation_player.cache_yaml import load_yaml
+
+    from tests.helpers import clip_path
+
+    monkeypatch.setattr(cache_yaml, 'temp_folder_path', str(tmp_path))
+    path = clip_path('UIAni_Popup_System.anim')
+    exact = AnimationClip.from_anim_dict(load_yaml(path), source=path, backend='numpy')
+    for clip in (exact.with_lut(0.5), exact):
+        plan = clip.plan(full_kwargs(clip, clip.paths[0]))
+        table = clip.bake(plan, 60, cache=True)
+        np.testing.assert_array_equal(table.values, evaluate(plan, table.times))
+    assert len(list(tmp_path.rglob('*.npz'))) == 2
+
+    # 新进程中的片段（没有内存缓存）从磁盘读到的也是自己的表
+    fresh = AnimationClip.from_anim_dict(load_yaml(path), source=path, backend='numpy')
+    plan = fresh.plan(full_kwargs(fresh, fresh.paths[0]))
+    table = fresh.bake(plan, 60, cache=True)
+    np.testing.assert_array_equal(table.values, evaluate(plan, table.times))
+    variants = {clip._bake_variant() for clip in (exact, exact.with_lut(0.5), exact.with_lut(0.25),
+                                                   exact.with_lut(0.5, order=2), exact.with_wrap_modes(
+                                                       curve_wraps={exact.paths[0]: {'Float': ('loop', 'loop')}}))}
+    assert len(variants) == 5
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+import pytest
+
+from unity_animation_player.event_dispatch import AsyncioDispatcher, ThreadPoolDispatcher, make_dispatcher
+
+from tests.helpers import PathPlayer, event_clip, event_names
+
+
+def _in_thread(function, timeout=5.0):
+    """在另一个线程中运行 function，超时视为挂起"""
+    result = {}
+
+    def run():
+        try:
+            result['value'] = function()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'call did not return'
+    return result
+
+
+def test_closed_loop_releases_the_slot():
+    loop = asyncio.new_event_loop()
+    loop.close()
+    dispatcher = AsyncioDispatcher(loop=loop, maxsize=1, overflow='block')
+    for _ in range(3):
+        # 修复前第一次提交泄漏名额，第二次在 maxsize=1 时永远阻塞
+        result = _in_thread(lambda: dispatcher.submit('key', print, ()))
+        assert isinstance(result.get('error'), RuntimeError)
+    assert dispatcher.flush(timeout=1.0)
+    stats = dispatcher.stats()
+    assert stats['pending'] == 0 and stats['submitted'] == 0 and stats['dropped'] == 0
+
+
+def test_asyncio_dispatcher_runs_callbacks_on_the_loop_in_order():
+    async def main():
+        dispatcher = AsyncioDispatcher()
+        calls = []
+        loop_thread = threading.get_ident()
+        for i in range(5):
+            assert dispatcher.submit('key', lambda i=i: calls.append((i, threading.get_ident())), ())
+        await asyncio.sleep(0)
+        assert dispatcher.flush(timeout=1.0)
+        return calls, loop_thread
+
+    calls, loop_thread = asyncio.run(main())
+    assert [i for i, _ in calls] == list(range(5))
+    assert all(ident == loop_thread for _, ident in calls)
+
+
+def test_asyncio_dispatcher_drops_instead_of_blocking_its_own_loop():
+    async def main():
+        dispatcher = AsyncioDispatcher(maxsize=1, overflow='block')
+        assert dispatcher.submit('key', print, ())
+        assert not dispatcher.submit('key', print, ())
+        await asyncio.sleep(0)
+        return dispatcher.stats()
+
+    stats = asyncio.run(main())
+    assert stats['dropped'] == 1 and stats['completed'] == 1 and stats['pending'] == 0
+
+
+def test_thread_pool_keeps_per_key_order_and_counts_errors():
+    dispatcher = ThreadPoolDispatcher(max_workers=4)
+    calls = {key: [] for key in 'abc'}
+    for i in range(50):
+        for key in calls:
+            dispatcher.submit(key, calls[key].append, (i,))
+    dispatcher.submit('a', lambda: 1 / 0, ())
+    assert dispatcher.flush(timeout=5.0)
+    assert all(values == list(range(50)) for values in calls.values())
+    stats = dispatcher.stats()
+    assert stats['errors'] == 1 and stats['completed'] == stats['submitted'] == 151
+    dispatcher.close()
+    with pytest.raises(RuntimeError):
+        dispatcher.submit('a', print, ())
+
+
+def test_drop_overflow_discards_new_callbacks():
+    gate = threading.Event()
+    dispatcher = ThreadPoolDispatcher(max_workers=1, maxsize=2, overflow='drop')
+    assert dispatcher.submit('a', gate.wait, ())
+    assert dispatcher.submit('a', print, ())
+    assert not dispatcher.submit('a', print, ())
+    gate.set()
+    assert dispatcher.flush(timeout=5.0)
+    assert dispatcher.stats()['dropped'] == 1
+    dispatcher.close()
+
+
+def test_player_events_are_returned_before_dispatched_handlers_run():
+    player = PathPlayer(event_clip())
+    player.dispatcher = make_dispatcher('thread', max_workers=1)
+    gate, calls = threading.Event(), []
+    player.register_event('middle', lambda: (gate.wait(), calls.append('middle')), ())
+    assert event_names(player.play_frame(0.6)) == ['start', 'middle']
+    assert calls == []
+    gate.set()
+    assert player.dispatcher.flush(timeout=5.0) and calls == ['middle']
+    player.dispatcher.close()
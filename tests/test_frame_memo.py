@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+from unity_animation_player import AnimationPlayer
+from unity_animation_player.kwargs import type_kwargs
+from unity_animation_player.wrap_modes import LOOP, PING_PONG, clip_cycle
+
+from tests.helpers import EXAMPLE_CLIPS, full_kwargs, load_example
+
+QUANTUM = 1e-4
+
+
+@pytest.mark.parametrize('clip_file', EXAMPLE_CLIPS, ids=os.path.basename)
+def test_memo_evaluates_exactly_at_the_quantised_time(clip_file):
+    clip = load_example(os.path.basename(clip_file))
+    ts = np.linspace(0.0, clip.stop_time, 53).tolist()
+    memo = clip.enable_frame_memo(maxsize=len(ts) * len(clip.paths), quantum=QUANTUM)
+    for path in clip.paths:
+        plan = clip.plan(full_kwargs(clip, path))
+        for t in ts:
+            assert memo.lookup(plan, t) == plan.evaluate(round(t / QUANTUM) * QUANTUM)
+    # 每个 (plan, 量化时间) 只计算一次
+    misses = memo.info()['misses']
+    for path in clip.paths:
+        plan = clip.plan(full_kwargs(clip, path))
+        memo.lookup(plan, ts[-1])
+    assert memo.info()['misses'] == misses
+
+
+@pytest.mark.parametrize('wrap_mode', [LOOP, PING_PONG])
+@pytest.mark.parametrize('time_reverse', [False, True])
+def test_shared_memo_players_sample_the_quantised_local_time(wrap_mode, time_reverse):
+    clip = load_example('UIAni_Popup_System.anim')
+    memo = clip.enable_frame_memo(quantum=QUANTUM)
+    first, second = AnimationPlayer(clip, wrap_mode=wrap_mode), AnimationPlayer(clip, wrap_mode=wrap_mode)
+    path = clip.paths[0]
+    plan = clip.plan(type_kwargs(path=path))
+    stop_time = clip.stop_time
+    # 越过片段结尾的时间先按 wrap mode 映射到周期内，再量化
+    for t in np.linspace(0.0, 2.5 * stop_time, 61).tolist():
+        _, local = clip_cycle(t, stop_time, wrap_mode)
+        local = stop_time - local if time_reverse else local
+        expected = plan.assemble(plan.evaluate(round(local / QUANTUM) * QUANTUM))
+        for player in (first, second):
+            result, playable = player.play_frame(t, path=path, time_reverse=time_reverse)
+            assert playable and {key: result[key] for key in expected} == expected
+    assert memo.info()['hits'] >= 61
+
+
+def test_memo_is_a_bounded_lru():
+    clip = load_example('circle.anim')
+    memo = clip.enable_frame_memo(maxsize=2, quantum=QUANTUM)
+    plan = clip.plan(full_kwargs(clip, clip.paths[0]))
+    for t in (0.1, 0.2, 0.1, 0.3, 0.2):
+        memo.lookup(plan, t)
+    # 0.1 命中一次；0.3 挤出最久未用的 0.2，之后 0.2 重新计算
+    assert memo.info()['hits'] == 1 and memo.info()['misses'] == 4 and memo.info()['size'] == 2
+    clip.disable_frame_memo()
+    assert not memo.enabled and memo.info()['size'] == 0
+    with pytest.raises(ValueError):
+        clip.enable_frame_memo(quantum=0.0)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from unity_animation_player import AnimationPlayer
+from unity_animation_player.async_scheduler import AsyncAnimationScheduler, _Entry
+from unity_animation_player.kwargs import type_kwargs
+from unity_animation_player.wrap_modes import CLAMP, ONCE
+
+from tests.helpers import EXAMPLE_CLIPS, clip_path, load_example
+
+FRAMES = 90
+T0 = 0.004  # 起点不在关键帧网格上，帧与保持段的起点错开
+
+
+def _signal_ticks(name, path, wrap_mode, t0):
+    """以固定间隔手动推进 SignalAnimationPlayer（休眠期间的 tick 不调用），返回 [(播放器时间, 当前显示的帧)]"""
+    from qtpy.QtCore import Signal
+    from unity_animation_player import SignalAnimationPlayer
+
+    player = SignalAnimationPlayer(Signal(dict), clip_path(name), path=path, wrap_mode=wrap_mode)
+    player.t = player._anchor_t = t0
+    interval_ns = round(player.delta_t * 1e9)
+    shown, ticks = None, []
+    for i in range(FRAMES):
+        now_ns = i * interval_ns
+        if player._wake_ns is None or player._wake_ns <= now_ns:
+            payload, finished = player._next_frame(now_ns)
+            if finished:
+                break
+            shown = payload if payload is not None else shown
+        ticks.append((t0 + now_ns / 1e9, shown))
+    return player, ticks
+
+
+def _scheduler_ticks(name, path, wrap_mode, t0):
+    """逐个 tick 调用 AsyncAnimationScheduler._step（保持段中的 tick 由 _step 自己跳过）"""
+    player = AnimationPlayer(load_example(name), wrap_mode=wrap_mode)
+    scheduler = AsyncAnimationScheduler()
+    frames = []
+
+    async def run():
+        done = asyncio.get_running_loop().create_future()
+        scheduler._entries[player] = _Entry(player, type_kwargs(path=path), t0, 1.0, frames.append, None, done)
+        ticks = []
+        for tick in range(FRAMES):
+            await scheduler._step(tick)
+            if not scheduler._entries:
+                break
+            ticks.append((t0 + tick * scheduler.interval, frames[-1]))
+        return ticks
+
+    return player, asyncio.run(run())
+
+
+def _assert_shown_values_are_exact(player, ticks, path):
+    plan = player.clip.plan(type_kwargs(path=path))
+    for t, shown in ticks:
+        sample_time = player._sample_time(t, type_kwargs(path=path))
+        if sample_time is None:
+            sample_time = min(max(t, 0.0), player.stop_time)  # once 模式越过终点的 tick 播放的是终点帧
+        expected = plan.assemble(plan.evaluate(sample_time))
+        for key, value in expected.items():
+            np.testing.assert_allclose(shown[key], value, rtol=0, atol=1e-9, err_msg=f'{key} at t={t}')
+
+
+@pytest.mark.parametrize('ticks', [_signal_ticks, _scheduler_ticks], ids=['signal', 'scheduler'])
+@pytest.mark.parametrize('clip_file', EXAMPLE_CLIPS, ids=os.path.basename)
+def test_sleeping_through_holds_never_hides_a_value(clip_file, ticks):
+    # 每个 tick（包括休眠中被跳过的）上当前显示的值都应等于该时刻的精确值
+    name = os.path.basename(clip_file)
+    for path in load_example(name).paths:
+        player, shown = ticks(name, path, CLAMP, T0)
+        _assert_shown_values_are_exact(player, shown, path)
+
+
+@pytest.mark.parametrize('ticks', [_signal_ticks, _scheduler_ticks], ids=['signal', 'scheduler'])
+def test_clamp_delivers_the_end_value_before_sleeping_forever(ticks):
+    # 修复前最后一次发出 t≈0.154 的 0.95012，之后 _wake_ns = inf，0.95 永远不会发出
+    player, shown = ticks('UIAni_Button_Scale.anim', 'general', CLAMP, T0)
+    plan = player.clip.plan(type_kwargs(path='general'))
+    assert shown[-1][1]['scale'] == plan.assemble(plan.evaluate(player.stop_time))['scale'] == (0.95, 0.95)
+
+
+@pytest.mark.parametrize('ticks', [_signal_ticks, _scheduler_ticks], ids=['signal', 'scheduler'])
+def test_hold_value_is_shown_when_the_hold_starts(ticks):
+    # 修复前从 t=0.12 发出 0.8928 后直接睡到 0.333，保持值 0.9176 在整个保持段内都没有显示
+    path = 'Center/BlackBg/BlackBgClickArea'
+    player, shown = ticks('UIAni_Popup_System.anim', path, ONCE, 0.12)
+    assert shown[1][1]['float'] == pytest.approx(0.9176471)
+    _assert_shown_values_are_exact(player, shown, path)
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from unity_animation_player import import_budget
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+SCALE = 10.0  # 只防止数量级的退化，CI 机器上的计时噪声不应导致失败
+
+
+@pytest.fixture(autouse=True)
+def _subprocess_path(monkeypatch):
+    # 子进程不继承 pytest 的 pythonpath 设置
+    paths = [SRC] + [p for p in os.environ.get('PYTHONPATH', '').split(os.pathsep) if p]
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join(paths))
+
+
+def test_bare_import_loads_neither_numpy_nor_numba():
+    loaded = import_budget._loaded('import unity_animation_player')
+    assert 'unity_animation_player' in loaded
+    assert not {'numpy', 'numba'} & set(loaded)
+
+
+@pytest.mark.parametrize('statement, budget_ms, forbidden', import_budget.IMPORT_BUDGETS,
+                         ids=[statement for statement, _, _ in import_budget.IMPORT_BUDGETS])
+def test_import_budget(statement, budget_ms, forbidden):
+    assert not set(forbidden) & set(import_budget._loaded(statement))
+    elapsed_ms = min(import_budget.measure(statement)[0] for _ in range(2))
+    assert elapsed_ms <= budget_ms * SCALE
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from unity_animation_player import config
+from unity_animation_player.lookup_table import LookupTableSegment
+from unity_animation_player.numba_optimized.lookup_table import lookup_table_evaluate
+from unity_animation_player.numpy_backend import lookup_table_evaluate_many as numpy_evaluate_many
+from unity_animation_player.sampling_plan import evaluate_curve_many
+
+from tests.helpers import channel_errors, evaluate, full_kwargs, load_example
+
+CLIPS = ['T.anim', 'UIAni_Popup_System.anim', 'UIAni_SC_Char_Shake_3.anim', 'UIAni_StageListItemUnlock.anim']
+_loaded = {}
+
+
+def _clips(name):
+    if name not in _loaded:
+        exact = load_example(name)
+        _loaded[name] = exact, exact.with_lut(config.LUT_TOLERANCE, config.LUT_ORDER)
+    return _loaded[name]
+
+
+def _lut_segments(clip):
+    for kinds in clip.anim.values():
+        for segments, _ in kinds.values():
+            for curve in (segments.values() if hasattr(segments, 'values') else (segments,)):
+                yield from curve
+
+
+def _paths():
+    return [(name, path) for name in CLIPS for path in load_example(name).paths]
+
+
+@pytest.mark.parametrize('name, path', _paths())
+def test_lut_stays_within_tolerance_of_exact(name, path):
+    exact, lut = _clips(name)
+    kwargs = full_kwargs(exact, path)
+    exact_plan, lut_plan = exact.plan(kwargs), lut.plan(kwargs)
+    ts = np.linspace(0.0, exact.stop_time, 241)
+    # 误差只在检查点上测量，检查点之间允许 1% 余量（同 benchmarks.accuracy）；
+    # 曲线段内的跳变（欧拉角 ±180° 翻转）无法近似，lut_errors 如实记录
+    bound = max(max(lut.lut_errors.values()), config.LUT_TOLERANCE) * 1.01
+    errors = channel_errors(exact_plan, evaluate(lut_plan, ts), evaluate(exact_plan, ts))
+    assert errors.max() <= bound
+
+
+@pytest.mark.parametrize('name', CLIPS)
+def test_evaluate_many_equals_pointwise(name):
+    _, lut = _clips(name)
+    for segment in _lut_segments(lut):
+        assert isinstance(segment, LookupTableSegment)
+        a, b = segment.x_interval
+        ts = np.concatenate((np.linspace(a - 0.1, b + 0.1, 37), segment.breaks))
+        many = segment.evaluate_many(ts)
+        pointwise = np.array([segment(t) for t in ts.tolist()], dtype=np.float64)
+        np.testing.assert_array_equal(many, pointwise)
+        np.testing.assert_allclose(numpy_evaluate_many(segment.breaks, segment.coeffs, ts).reshape(many.shape),
+                                   many, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('name', CLIPS)
+def test_fast_kernels_match_array_kernel(name):
+    _, lut = _clips(name)
+    for segment in _lut_segments(lut):
+        a, b = segment.x_interval
+        for t in np.linspace(a, b, 9).tolist():
+            value = segment(t)
+            expected = lookup_table_evaluate(segment.breaks, segment.coeffs, t)
+            if segment.vector:
+                assert isinstance(value, tuple) and value == tuple(expected.tolist())
+            else:
+                assert isinstance(value, float) and value == expected[0]
+
+
+def test_evaluate_curve_many_uses_lookup_tables():
+    exact, lut = _clips('UIAni_SC_Char_Shake_3.anim')
+    path = exact.paths[0]
+    for kind, (segments, time_nodes) in lut.anim[path].items():
+        if hasattr(segments, 'values'):
+            continue
+        ts = np.linspace(-0.1, exact.stop_time + 0.1, 97)
+        many = evaluate_curve_many((segments, time_nodes), ts)
+        reference = evaluate_curve_many(exact.anim[path][kind], ts)
+        assert np.max(np.abs(many - reference)) <= max(max(lut.lut_errors.values()), config.LUT_TOLERANCE) * 1.01
+
+
+def test_public_tables_are_read_only():
+    _, lut = _clips('T.anim')
+    segment = next(_lut_segments(lut))
+    with pytest.raises(ValueError):
+        segment.breaks[0] = 1.0
+    with pytest.raises(ValueError):
+        segment.coeffs[0, 0, 0] = 1.0
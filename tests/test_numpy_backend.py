@@ -0,0 +1,25 @@
+import os
+
+import numpy as np
+import pytest
+
+from unity_animation_player.backends import get_backend
+
+from tests.helpers import EXAMPLE_CLIPS, channel_errors, evaluate, full_kwargs, load_example
+
+pytestmark = pytest.mark.skipif(not get_backend('numba').available, reason='numba 不可用，没有精确参照')
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'python'])
+@pytest.mark.parametrize('clip_file', EXAMPLE_CLIPS, ids=os.path.basename)
+def test_backend_matches_numba(clip_file, backend):
+    name = os.path.basename(clip_file)
+    exact, clip = load_example(name, backend='numba'), load_example(name, backend=backend)
+    # 区间外的时间按曲线的 wrap mode 映射，关键帧时间本身走端点分支
+    ts = np.concatenate((np.linspace(-0.5, clip.stop_time + 0.5, 97), [0.0, clip.stop_time]))
+    for path in clip.paths:
+        reference_plan, plan = exact.plan(full_kwargs(exact, path)), clip.plan(full_kwargs(clip, path))
+        reference = evaluate(reference_plan, ts)
+        limits = 1e-9 * (1.0 + np.abs(reference).max(axis=0, initial=0.0))
+        assert (channel_errors(plan, evaluate(plan, ts), reference) <= limits).all()
+        assert (channel_errors(plan, plan.evaluate_many(ts), reference) <= limits).all()
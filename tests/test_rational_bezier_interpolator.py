@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from unity_animation_player.backends import backend_names, get_backend
+from unity_animation_player.numba_optimized.rational_bezier_interpolator import (RationalBezierInterpolation,
+                                                                                 rational_bezier_params)
+
+BACKENDS = [name for name in backend_names() if name != 'lut' and get_backend(name).available]
+
+# (x0, x1, y0, y1, k0, k1, w0, w1, w2, w3)：权重为 0 的切线使 x(u) 在端点处出现重根，
+# 修复前固定 10 次、从 u = 0.5 出发的牛顿法在 t = x0 处只线性收敛，误差可达 1e-6
+CURVES = [
+    (0.0, 1.0, 0.0, 1.0, 0.0, 0.0, 1.0, 0.0, 1.0, 1.0),
+    (0.0, 1.0, 0.0, 1.0, 3.0, -2.0, 1.0, 1.0, 0.0, 1.0),
+    (0.25, 0.75, 2.0, -1.0, 5.0, 5.0, 1.0, 0.0, 0.0, 1.0),
+    (0.0, 2.0, 0.0, 10.0, 0.0, 20.0, 1.0, 1 / 3, 1 / 3, 1.0),
+    # T.anim 中的一段（w1 = 0）
+    (1.2833333, 1.3666667, 21.964676, 21.964674, 0.0, -372.4343, 1 / 3, 0.0, 0.6169893, 1 / 3),
+]
+
+
+def _bisection(params, t):
+    """按定义二分求解 x(u) = t 到 float64 精度，再求 y(u)"""
+    x0, x1, y0, y1, x1_ctl, y1_ctl, x2_ctl, y2_ctl, w0, w1, w2, w3 = params.tolist()
+
+    def basis(u):
+        u1 = 1.0 - u
+        return u1 * u1 * u1 * w0, 3.0 * u * u1 * u1 * w1, 3.0 * u * u * u1 * w2, u * u * u * w3
+
+    def weighted_x(u):
+        b = basis(u)
+        return b[0] * (x0 - t) + b[1] * (x1_ctl - t) + b[2] * (x2_ctl - t) + b[3] * (x1 - t)
+
+    lo, hi = 0.0, 1.0
+    while lo < 0.5 * (lo + hi) < hi:
+        mid = 0.5 * (lo + hi)
+        lo, hi = (mid, hi) if weighted_x(mid) < 0.0 else (lo, mid)
+    b = basis(lo)
+    return (b[0] * y0 + b[1] * y1_ctl + b[2] * y2_ctl + b[3] * y1) / sum(b)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('curve', CURVES)
+def test_zero_weight_tangents_converge(backend, curve):
+    params = rational_bezier_params(*curve)
+    interp = RationalBezierInterpolation(*curve, backend=backend)
+    ts = np.linspace(curve[0], curve[1], 201)
+    expected = np.array([_bisection(params, t) for t in ts.tolist()])
+    scale = max(abs(curve[2]), abs(curve[3]), 1.0)
+    np.testing.assert_allclose([interp(t) for t in ts.tolist()], expected, rtol=0, atol=1e-9 * scale)
+    np.testing.assert_allclose(interp.many(ts), expected, rtol=0, atol=1e-9 * scale)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_endpoints_and_outside_times_clamp(backend):
+    curve = CURVES[2]
+    interp = RationalBezierInterpolation(*curve, backend=backend)
+    assert interp(curve[0]) == pytest.approx(curve[2], abs=1e-12)
+    assert interp(curve[1]) == pytest.approx(curve[3], abs=1e-12)
+    assert interp(curve[0] - 1.0) == pytest.approx(curve[2], abs=1e-12)
+    assert interp(curve[1] + 1.0) == pytest.approx(curve[3], abs=1e-12)
+    np.testing.assert_allclose(interp.many(np.array([curve[0] - 1.0, curve[1] + 1.0])), curve[2:4], atol=1e-12)
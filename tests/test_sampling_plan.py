@@ -0,0 +1,66 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from unity_animation_player import config
+from unity_animation_player.wrap_modes import CLAMP, LOOP, PING_PONG, wrap_time, wrap_times
+
+from tests.helpers import EXAMPLE_CLIPS, channel_errors, clip_path, evaluate, full_kwargs, load_example
+
+
+@pytest.mark.parametrize('clip_file', EXAMPLE_CLIPS, ids=os.path.basename)
+def test_evaluate_many_matches_evaluate(clip_file):
+    clip = load_example(os.path.basename(clip_file))
+    # 包含区间外的时间（按曲线的 wrap mode 映射）与关键帧时间本身
+    ts = np.concatenate((np.linspace(-0.5, clip.stop_time + 0.5, 97), [0.0, clip.stop_time]))
+    for path in clip.paths:
+        plan = clip.plan(full_kwargs(clip, path))
+        many = plan.evaluate_many(ts)
+        assert many.shape == (len(ts), plan.width)
+        assert channel_errors(plan, many, evaluate(plan, ts)).max(initial=0.0) <= 1e-9
+        # 单个时间走单段快速路径
+        assert channel_errors(plan, plan.evaluate_many(ts[5:6]), evaluate(plan, ts[5:6])).max(initial=0.0) <= 1e-9
+
+
+@pytest.mark.parametrize('pre, post', [(LOOP, PING_PONG), (PING_PONG, LOOP), (CLAMP, CLAMP), (LOOP, LOOP)])
+def test_wrap_times_matches_wrap_time(pre, post):
+    ts = np.linspace(-3.7, 4.9, 173)
+    expected = [wrap_time(t, 0.25, 1.5, pre, post) for t in ts.tolist()]
+    np.testing.assert_allclose(wrap_times(ts, 0.25, 1.5, pre, post), expected, rtol=0, atol=1e-12)
+    assert wrap_times(ts, 1.0, 1.0, pre, post).tolist() == [1.0] * len(ts)
+
+
+def _worker_players(n):
+    from qtpy.QtCore import Signal
+    from unity_animation_player import SignalAnimationPlayer
+    from unity_animation_player.worker_ticker import WorkerTicker
+
+    ticker = WorkerTicker()
+    clip = load_example('UIAni_Popup_System.anim')
+    players = []
+    now_ns = time.perf_counter_ns()
+    for i in range(n):
+        player = SignalAnimationPlayer(Signal(dict), clip_path('UIAni_Popup_System.anim'), path=clip.paths[0])
+        player.ticker = ticker
+        player._anchor_ns = now_ns - i * 10_000_000  # 相互错开 10 ms，采样时间各不相同
+        player._anchor_t = 0.0
+        players.append(player)
+        ticker._players[player] = None
+    return ticker, players, now_ns
+
+
+@pytest.mark.parametrize('batch_min', [4, 10_000])
+def test_worker_tick_batches_shared_plans(monkeypatch, batch_min):
+    monkeypatch.setattr(config, 'WORKER_BATCH_MIN', batch_min)
+    ticker, players, now_ns = _worker_players(12)
+    ticker._step(now_ns)
+    assert ticker.batched == (12 if batch_min <= 12 else 0)
+    for player in players:
+        payload = ticker._outbox[player]
+        plan = player.clip.plan(player.parameters)
+        expected = plan.assemble(plan.evaluate(player.t))
+        assert expected.keys() <= payload.keys()
+        for key, value in expected.items():
+            np.testing.assert_allclose(payload[key], value, rtol=0, atol=1e-9)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from unity_animation_player.backends import backend_names, get_backend
+from unity_animation_player.numba_optimized.spherical_linear_interpolator import (
+    EulerSphericalLinearInterpolation, SphericalLinearInterpolation)
+
+BACKENDS = [name for name in backend_names() if name != 'lut' and get_backend(name).available]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_euler_segment_outside_unit_range_normalises_time_once(backend):
+    # 段 [2, 4] 绕 z 轴 0 -> 90 度；时间曾被归一化两次，整段都返回起点 (0, 0, 0)
+    euler = EulerSphericalLinearInterpolation(0, 0, 0, 0, 0, 90, 2.0, 4.0, backend=backend)
+    assert euler(2.0) == pytest.approx((0.0, 0.0, 0.0), abs=1e-9)
+    assert euler(2.5) == pytest.approx((0.0, 0.0, 22.5), abs=1e-9)
+    assert euler(3.0) == pytest.approx((0.0, 0.0, 45.0), abs=1e-9)
+    assert euler(4.0) == pytest.approx((0.0, 0.0, 90.0), abs=1e-9)
+    np.testing.assert_allclose(euler.many(np.array([2.0, 3.0, 4.0])),
+                               [[0, 0, 0], [0, 0, 45], [0, 0, 90]], atol=1e-9)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_euler_segment_multi_axis_reaches_both_ends(backend):
+    # 多轴旋转走四元数 SLERP 分支；修复前 t=3、t=4 都返回起点 (18.649..., 12.392..., 30.274...)
+    euler = EulerSphericalLinearInterpolation(10, 20, 30, 40, 50, 60, 2.0, 4.0, backend=backend)
+    start, middle, end = euler(2.0), euler(3.0), euler(4.0)
+    assert start == pytest.approx(euler(1.0))  # 段外夹到端点
+    assert end == pytest.approx(euler(5.0))
+    assert end != pytest.approx(start)
+    assert middle != pytest.approx(start) and middle != pytest.approx(end)
+    reference = EulerSphericalLinearInterpolation(10, 20, 30, 40, 50, 60, backend=backend)
+    assert middle == pytest.approx(reference(0.5), abs=1e-9)
+    assert end == pytest.approx(reference(1.0), abs=1e-9)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_quaternion_segment_uses_its_time_range(backend):
+    slerp = SphericalLinearInterpolation(0, 0, 0, 1, 0, 0, np.sqrt(0.5), np.sqrt(0.5), 2.0, 4.0, backend=backend)
+    unit = SphericalLinearInterpolation(0, 0, 0, 1, 0, 0, np.sqrt(0.5), np.sqrt(0.5), backend=backend)
+    assert slerp(3.0) == pytest.approx(unit(0.5), abs=1e-12)
+    assert slerp(4.0) == pytest.approx(unit(1.0), abs=1e-12)
@@ -0,0 +1,18 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def test_trace_env_var_starts_recording_on_package_import(tmp_path):
+    trace = tmp_path / 'trace.json'
+    env = dict(os.environ, UNITY_ANIMATION_PLAYER_TRACE=str(trace),
+               PYTHONPATH=os.pathsep.join([SRC] + [p for p in os.environ.get('PYTHONPATH', '').split(os.pathsep) if p]))
+    # 只导入包、不访问任何公开名称
+    code = ("import sys, unity_animation_player\n"
+            "print(sys.modules['unity_animation_player.tracing'].ENABLED, 'numpy' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ['True', 'False']
+    assert 'traceEvents' in json.loads(trace.read_text())
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from tests.helpers import clip_path, load_example
+
+
+class _Recorder:
+    """代替 Qt 信号，记录发出的内容"""
+
+    def __init__(self):
+        self.payloads = []
+
+    def emit(self, payload):
+        self.payloads.append(payload)
+
+
+def test_deliver_does_not_wait_for_an_in_flight_step():
+    from qtpy.QtCore import Signal
+    from unity_animation_player import SignalAnimationPlayer
+    from unity_animation_player.worker_ticker import WorkerTicker
+
+    ticker = WorkerTicker()
+    clip = load_example('UIAni_Popup_System.anim')
+    players = [SignalAnimationPlayer(Signal(dict), clip_path('UIAni_Popup_System.anim'), path=clip.paths[0])
+               for _ in range(2)]
+    now_ns = time.perf_counter_ns()
+    for player in players:
+        player.ticker = ticker
+        player._lock = ticker.lock
+        player.signal = _Recorder()
+        player._anchor_ns, player._anchor_t = now_ns, 0.0
+        ticker._players[player] = None
+
+    # 第一个播放器的帧先进入发件箱，第二个播放器的求值卡在工作线程中（持有 ticker.lock）
+    entered, gate = threading.Event(), threading.Event()
+    slow = players[1]
+    next_frame = slow._next_frame
+
+    def blocked_next_frame(*args, **kwargs):
+        entered.set()
+        gate.wait(5.0)
+        return next_frame(*args, **kwargs)
+
+    slow._next_frame = blocked_next_frame
+
+    def step():
+        with ticker._cond:
+            ticker._step(now_ns + 10_000_000)
+
+    worker = threading.Thread(target=step, daemon=True)
+    worker.start()
+    try:
+        assert entered.wait(5.0)
+        delivered = threading.Event()
+        gui = threading.Thread(target=lambda: (ticker._deliver(), delivered.set()), daemon=True)
+        gui.start()
+        # 修复前 _deliver 要等整个 _step 结束才能拿到 lock
+        assert delivered.wait(1.0), '_deliver waited for the worker step'
+        assert len(players[0].signal.payloads) == 1 and not slow.signal.payloads
+        assert ticker.stats()['delivered'] == 1
+    finally:
+        gate.set()
+        worker.join(5.0)
+    ticker._deliver()
+    assert len(slow.signal.payloads) == 1
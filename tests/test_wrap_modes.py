@@ -0,0 +1,94 @@
+import pytest
+
+from unity_animation_player import AnimationPlayer
+from unity_animation_player.wrap_modes import (AUTO, CLAMP, LOOP, ONCE, PING_PONG, clip_cycle, cycle_spans,
+                                               resolve_wrap_mode, wrap_time)
+
+from tests.helpers import PathPlayer, event_clip, event_names, load_example
+
+
+def test_from_anim_dict_plays_once_even_when_loop_time_is_set():
+    # circle.anim 保存了 m_LoopTime: 1；默认仍然只播放一次，一次性的弹窗示例依赖这一点
+    clip = load_example('circle.anim')
+    assert clip.loop_time and clip.wrap_mode == ONCE
+    player = AnimationPlayer(clip)
+    assert player.play_frame(clip.stop_time + 0.1, path=clip.paths[0]) == ({}, False)
+
+
+def test_auto_follows_loop_time():
+    looping = load_example('circle.anim')
+    assert AnimationPlayer(looping, wrap_mode=AUTO).wrap_mode == LOOP
+    assert looping.with_wrap_modes(wrap_mode=AUTO).wrap_mode == LOOP
+    once = load_example('UIAni_Popup_System.anim')
+    assert not once.loop_time
+    assert AnimationPlayer(once, wrap_mode=AUTO).wrap_mode == ONCE
+
+    player = AnimationPlayer(looping)
+    player.wrap_mode = AUTO
+    assert player.wrap_mode == LOOP
+    result, playable = player.play_frame(looping.stop_time * 2.5, path=looping.paths[0])
+    assert playable and result
+
+
+def test_invalid_wrap_mode_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_wrap_mode('repeat', True)
+    with pytest.raises(ValueError):
+        PathPlayer(event_clip(), wrap_mode='repeat')
+
+
+@pytest.mark.parametrize('t, expected', [(-0.25, 0.75), (0.0, 0.0), (1.0, 1.0), (1.25, 0.25), (3.0, 0.0)])
+def test_wrap_time_loop(t, expected):
+    assert wrap_time(t, 0.0, 1.0, LOOP, LOOP) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('t, expected', [(-0.25, 0.25), (1.25, 0.75), (2.0, 0.0), (2.5, 0.5)])
+def test_wrap_time_ping_pong(t, expected):
+    assert wrap_time(t, 0.0, 1.0, PING_PONG, PING_PONG) == pytest.approx(expected)
+
+
+def test_clip_cycle_at_boundaries():
+    assert clip_cycle(1.0, 1.0, LOOP) == (1, 0.0)
+    assert clip_cycle(1.0, 1.0, PING_PONG) == (1, 1.0)
+    assert clip_cycle(2.0, 1.0, PING_PONG) == (2, 0.0)
+    assert clip_cycle(-0.5, 1.0, CLAMP) == (0, 0.0)
+    assert clip_cycle(1.5, 0.0, LOOP) == (0, 0.0)
+
+
+def test_cycle_spans_split_at_each_boundary():
+    assert cycle_spans(0.75, 2.25, 1.0, LOOP) == [
+        (0.75, 1.0, False), (0.0, 1.0, True), (0.0, pytest.approx(0.25), True)]
+    assert cycle_spans(0.75, 1.25, 1.0, PING_PONG) == [(0.75, 1.0, False), (1.0, 0.75, False)]
+
+
+def test_loop_fires_boundary_events_once_per_cycle():
+    player = PathPlayer(event_clip(), wrap_mode=LOOP)
+    assert event_names(player.play_frame(0.0)) == ['start']
+    assert event_names(player.play_frame(0.9)) == ['middle']
+    # 跨过周期边界：上一周期结尾的 end 与新周期起点的 start 各触发一次
+    assert event_names(player.play_frame(1.1)) == ['end', 'start']
+    assert event_names(player.play_frame(1.2)) == []
+    assert event_names(player.play_frame(3.6)) == ['middle', 'end', 'start', 'middle', 'end', 'start', 'middle']
+
+
+def test_ping_pong_fires_turnaround_events_once():
+    player = PathPlayer(event_clip(), wrap_mode=PING_PONG)
+    player.play_frame(0.6)
+    # 折返点上的事件只触发一次（它既是上一周期的终点，也是下一周期的起点）
+    assert event_names(player.play_frame(1.6)) == ['end', 'middle']
+    assert event_names(player.play_frame(2.2)) == ['start']
+    assert event_names(player.play_frame(2.3)) == []
+
+
+def test_clamp_holds_and_fires_nothing_past_the_end():
+    player = PathPlayer(event_clip(), wrap_mode=CLAMP)
+    assert event_names(player.play_frame(2.0)) == ['start', 'middle', 'end']
+    assert event_names(player.play_frame(5.0)) == []
+    assert player.play_frame(-1.0)[1]
+
+
+def test_once_is_not_playable_outside_the_clip():
+    player = PathPlayer(event_clip(), wrap_mode=ONCE)
+    assert event_names(player.play_frame(1.0)) == ['start', 'middle', 'end']
+    assert player.play_frame(1.0 + 1e-9) == ({}, False)
+    assert player.play_frame(-1e-9) == ({}, False)